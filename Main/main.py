@@ -1,5 +1,5 @@
 import os
-import csv
+from functools import lru_cache
 from Bio import SeqIO
 from Bio.Align import PairwiseAligner
 import matplotlib.pyplot as plt
@@ -7,6 +7,9 @@ from Bio import AlignIO, Phylo
 from Bio.Phylo.TreeConstruction import DistanceCalculator, DistanceTreeConstructor
 from Bio.Align.Applications import MuscleCommandline
 
+from dogbreed.breed_registry import BreedRegistry
+from dogbreed.mapping_journal import MappingJournal, apply_updates
+
 
 MIN_SCORE_THRESHOLD = 15000 # Minimum score threshold for alignment
 
@@ -23,18 +26,26 @@ def load_breed_mapping(file_path): # Load the breed mapping CSV file
     """
     Load a breed mapping CSV file and return a dictionary mapping accession IDs to breed names.
     """
-    mapping = {} # Initialize an empty dictionary to hold the mapping
-    with open(file_path, newline='') as csvfile: # Open the CSV file
-        reader = csv.reader(csvfile) # Create a CSV reader
-        next(reader)  # Skip header
-        for row in reader:
-            accession_id = row[0] # Get the accession ID
-            breed_name = row[1] # Get the breed name
-            mapping[accession_id] = breed_name # Map accession ID to breed name
+    if not os.path.exists(file_path): # Missing mapping is an error, as before
+        raise FileNotFoundError(file_path)
+    mapping = MappingJournal(file_path).read_merged() # CSV plus updates still in the journal
     return mapping # Return the completed mapping
 
 # Update breed mapping
 
+@lru_cache(maxsize=None)
+def _local_lookup(lookup_path): # Load local_breed_lookup.csv once into an indexed registry
+    """
+    Load local_breed_lookup.csv into an in-memory registry (indexed lookups, loaded once).
+    """
+    registry = BreedRegistry() # In-memory SQLite registry
+    try:
+        registry.import_csv(lookup_path) # Accepts the breed_name column
+    except FileNotFoundError:  # Handle file not found error
+        print("❌ local_breed_lookup.csv not found — using 'Unknown Breed'")
+    return registry
+
+
 def update_breed_mapping(file_path, accession_id, breed_name="Unknown Breed"): # Update the breed mapping
     """
 Update the breed mapping CSV file with a new accession ID and breed name.
@@ -42,23 +53,10 @@ Update the breed mapping CSV file with a new accession ID and breed name.
     lookup_path = os.path.join(os.path.dirname(__file__), "local_breed_lookup.csv")
 
     # Try to update from local_breed_lookup.csv
-    try:
-        with open(lookup_path, "r") as lookup_file: # Open the local breed lookup file
-            reader = csv.reader(lookup_file) # Create a CSV reader
-            next(reader, None)  # Skip header
-            for row in reader: # Iterate over each row in the CSV
-                if not row or len(row) < 2: # Skip empty or malformed rows
-                    continue
-                if row[0] == accession_id: # If the accession ID matches
-                    breed_name = row[1] # Get the breed name
-                    break
-    except FileNotFoundError:  # Handle file not found error
-        print("❌ local_breed_lookup.csv not found — using 'Unknown Breed'")
+    breed_name = _local_lookup(lookup_path).get(accession_id, breed_name)
 
-    # Update breed_mapping.csv
-    with open(file_path, "a", newline="") as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([accession_id, breed_name])
+    # Update breed_mapping.csv (upsert: existing IDs are overwritten, never duplicated)
+    apply_updates(file_path, {accession_id: breed_name})
     print(f"✅ breed_mapping.csv updated: {accession_id} → {breed_name}")
 
 
@@ -6,8 +6,13 @@ from pathlib import Path
 import csv
 
 from Bio import SeqIO
+from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 
+from dogbreed.mapping_journal import MappingJournal, apply_updates
+from dogbreed.sequence_collection import SequenceCollection, SequenceRecordView
+from dogbreed.ungapped import UngappedPanel, ungapped_identity
+
 
 # ---------------------------
 # FASTA / CSV LOADING
@@ -17,6 +22,7 @@ def load_fasta(fasta_path: str | Path) -> List[SeqRecord]:
     """
     Read a FASTA file and return a list of SeqRecord objects.
     Returns [] for empty/missing files instead of crashing.
+    For large reference panels see `load_fasta_collection`.
     """
     p = Path(fasta_path)
     if not p.exists() or p.stat().st_size == 0:
@@ -35,6 +41,25 @@ def load_fasta(fasta_path: str | Path) -> List[SeqRecord]:
         return []
 
 
+def load_fasta_collection(fasta_path: str | Path) -> SequenceCollection:
+    """
+    Read a FASTA file into a compact SequenceCollection (uppercase, one shared buffer).
+    Indexing/iterating yields record views with `.id` and `.seq` only (no `.description`),
+    which is what `find_best_match` needs; use `load_fasta` for full SeqRecords.
+    Returns an empty collection for empty/missing files instead of crashing.
+    """
+    p = Path(fasta_path)
+    if not p.exists() or p.stat().st_size == 0:
+        return SequenceCollection.from_records([])
+
+    try:
+        # force uppercase sequences once, at load time
+        return SequenceCollection.from_fasta(p, upper=True)
+    except Exception:
+        # Malformed FASTA: be defensive per tests
+        return SequenceCollection.from_records([])
+
+
 def load_breed_mapping(csv_path: str | Path) -> List[dict]:
     """
     Load a breed mapping CSV with columns: accession_id, breed
@@ -45,6 +70,10 @@ def load_breed_mapping(csv_path: str | Path) -> List[dict]:
     if not p.exists():
         return []
 
+    if MappingJournal(p).pending():
+        # Updates not compacted into the CSV yet: use the merged view
+        return [{"accession_id": acc, "breed": breed} for acc, breed in MappingJournal(p).read_merged().items()]
+
     with p.open(newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         rows = []
@@ -63,8 +92,8 @@ def load_breed_mapping(csv_path: str | Path) -> List[dict]:
 # MATCHING
 # ---------------------------
 
-def _to_seqstr(x: SeqRecord | str) -> str:
-    """Normalise a SeqRecord or string to an uppercase sequence string with no gaps."""
+def _to_seqstr(x: SeqRecord | SequenceRecordView | str) -> str:
+    """Normalise a SeqRecord, record view or string to an uppercase sequence string with no gaps."""
     if isinstance(x, SeqRecord):
         s = str(x.seq)
     else:
@@ -80,43 +109,40 @@ def _identity_score(a: str, b: str) -> float:
     """
     if not a or not b:
         return 0.0
-    n = min(len(a), len(b))
-    if n == 0:
-        return 0.0
-    return sum(1 for i in range(n) if a[i] == b[i]) / n
+    return ungapped_identity(a, b, denominator="min")
 
 
-def find_best_match(query: SeqRecord | str, sequences: Iterable[SeqRecord | str]) -> List[Tuple[SeqRecord, float]]:
+def find_best_match(
+    query: SeqRecord | SequenceRecordView | str,
+    sequences: Iterable[SeqRecord | SequenceRecordView | str],
+) -> List[Tuple[SeqRecord | SequenceRecordView, float]]:
     """
     Rank sequences by similarity to `query`.
-    Returns a list of (SeqRecord, score) sorted descending by score.
+    Returns a list of (record, score) sorted descending by score.
 
-    - Accepts query as SeqRecord or str
-    - Accepts sequences as SeqRecords or strings
+    - Accepts query as SeqRecord, record view or str
+    - Accepts sequences as SeqRecords, record views (e.g. a SequenceCollection) or strings
     - If a sequence equals the query, it will be ranked first
     """
     q = _to_seqstr(query)
 
-    # Convert all inputs to SeqRecord to satisfy tests that access `.seq`
-    norm_records: List[SeqRecord] = []
+    recs, seqs = [], []
     for s in sequences:
-        if isinstance(s, SeqRecord):
-            rec = s
+        if isinstance(s, (SeqRecord, SequenceRecordView)):
+            rec = s  # already exposes .seq; no copy
         else:
             # Wrap raw string into a SeqRecord so tests can do rec.seq
-            rec = SeqRecord(SeqIO.Seq(str(s)), id="", description="")
-        # Ensure uppercase, no gaps
-        rec.seq = _to_seqstr(rec)
-        norm_records.append(rec)
+            rec = SeqRecord(Seq(_to_seqstr(s)), id="", description="")
+        recs.append(rec)
+        seqs.append(_to_seqstr(rec))
 
-    scored = []
-    for rec in norm_records:
-        score = _identity_score(q, str(rec.seq))
-        scored.append((rec, score))
+    # One vectorised pass over the whole panel instead of a per-base loop per record
+    scores = UngappedPanel.from_sequences(seqs).identities(q, denominator="min") if q else [0.0] * len(seqs)
+    scored = [(rec, float(score), len(seq)) for rec, score, seq in zip(recs, scores, seqs)]
 
     # sort by score (desc), then by length similarity (desc) to stabilise ties
-    scored.sort(key=lambda t: (t[1], -abs(len(str(t[0].seq)) - len(q))), reverse=True)
-    return scored
+    scored.sort(key=lambda t: (t[1], -abs(t[2] - len(q))), reverse=True)
+    return [(rec, score) for rec, score, _ in scored]
 
 
 # ---------------------------
@@ -128,33 +154,6 @@ def update_breed_mapping(csv_path: str | Path, accession_id: str, breed: str) ->
     Update or append a row in the mapping CSV.
     - Creates the file with header if it doesn't exist
     - Deduplicates on accession_id, keeping the LAST provided value
+    - Written through to the CSV under the journal lock, so concurrent updates are not lost
     """
-    p = Path(csv_path)
-    rows: List[dict] = []
-
-    if p.exists() and p.stat().st_size > 0:
-        with p.open(newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append({"accession_id": row.get("accession_id", ""), "breed": row.get("breed", "")})
-
-    # overwrite or add
-    updated = False
-    for r in rows:
-        if r["accession_id"] == accession_id:
-            r["breed"] = breed
-            updated = True
-            break
-    if not updated:
-        rows.append({"accession_id": accession_id, "breed": breed})
-
-    # write back with header, dedup by last occurrence (keep last)
-    dedup = {}
-    for r in rows:
-        dedup[r["accession_id"]] = r["breed"]
-    out_rows = [{"accession_id": k, "breed": v} for k, v in dedup.items()]
-
-    with p.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["accession_id", "breed"])
-        writer.writeheader()
-        writer.writerows(out_rows)
+    apply_updates(Path(csv_path), {accession_id: breed}, write_through=True)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+# SRC/dogbreed/approx_identity.py
+import math
+from typing import FrozenSet, List, Optional, Tuple
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+from dogbreed.sequence_utils import kmer_set
+
+# (id, estimate, low, high), all in percent
+Estimate = Tuple[str, float, float, float]
+# (id, estimate, low, high, exact percent_identity or None, method)
+Refined = Tuple[str, float, float, float, Optional[float], str]
+
+# How a row's identity was obtained
+EXACT = "exact"
+ESTIMATED = "estimated"
+
+
+def wilson_interval(successes: int, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a binomial proportion."""
+    if n <= 0:
+        return 0.0, 1.0
+    p = successes / n
+    denom = 1.0 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def containment_identity(
+    query_kmers: FrozenSet[str],
+    ref_kmers: FrozenSet[str],
+    k: int,
+    z: float = 1.96,
+) -> Tuple[float, float, float]:
+    """
+    Identity estimated from k-mer containment C = |Q ∩ R| / |Q|.
+
+    A k-mer survives only if all k bases match, so C ≈ p^k and p ≈ C^(1/k). The
+    interval is the Wilson interval of C mapped through the same transform.
+    Overlapping k-mers are not independent, so the sample size is taken as the
+    number of non-overlapping k-mers (len / k) to keep the interval honest.
+    """
+    n = len(query_kmers)
+    if n == 0:
+        return 0.0, 0.0, 100.0
+    shared = len(query_kmers & ref_kmers)
+    c = shared / n
+    n_eff = max(1, n // k)
+    lo, hi = wilson_interval(round(c * n_eff), n_eff, z)
+    return c ** (1 / k) * 100.0, lo ** (1 / k) * 100.0, hi ** (1 / k) * 100.0
+
+
+def approximate_compare(query_seq: str, records: RecordsLike, k: int = 16, z: float = 1.96) -> List[Estimate]:
+    """Rank references by estimated identity: [(id, estimate, low, high)], best first."""
+    q = kmer_set(_norm(query_seq), k)
+    rows = [(rid, *containment_identity(q, kmer_set(_norm(seq), k), k, z)) for rid, seq in _iter_records(records)]
+    rows.sort(key=lambda x: x[1], reverse=True)
+    return rows
+
+
+def compare_with_tolerance(
+    query_seq: str,
+    records: RecordsLike,
+    tolerance: float = 0.0,
+    k: int = 16,
+    z: float = 1.96,
+) -> List[Refined]:
+    """
+    Estimate every reference, then align exactly only where the ranking is unsure.
+
+    Candidates whose upper bound reaches within `tolerance` percentage points of
+    the leader's lower bound overlap with it and are aligned exactly; when only
+    the leader remains, no alignment runs at all.
+
+    Rows are (id, estimate, low, high, exact, method), ranked by the estimate: the
+    exact `percent_identity` (global alignment, a different scale) is reported
+    alongside it for aligned rows and is None elsewhere; method is `EXACT` or `ESTIMATED`.
+    """
+    refs = dict(_iter_records(records))
+    estimates = approximate_compare(query_seq, refs.items(), k=k, z=z)
+    if not estimates:
+        return []
+
+    floor = estimates[0][2] - tolerance
+    contenders = [rid for rid, _, _, hi in estimates if hi >= floor]
+    exact = {}
+    if len(contenders) > 1:
+        exact = {rid: round(percent_identity(query_seq, refs[rid]), 2) for rid in contenders}
+
+    return [(rid, est, lo, hi, exact.get(rid), EXACT if rid in exact else ESTIMATED)
+            for rid, est, lo, hi in estimates]
@@ -0,0 +1,171 @@
+from __future__ import annotations
+# SRC/dogbreed/async_pipeline.py
+import asyncio
+import csv
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from Bio import SeqIO
+
+from dogbreed.compare_sequences import RecordsLike, _norm, percent_identity
+from dogbreed.io_utils import atomic_write
+from dogbreed.shared_refs import SharedReferenceStore, StoreHandle, set_worker_state, worker_state
+
+PathLike = Union[str, Path]
+Hits = List[Tuple[str, float]]
+
+_DONE = object()  # end-of-stream marker passed down the queues
+
+_JSON_LINES = (".jsonl", ".ndjson")
+
+
+def _init_worker(handle: StoreHandle, top_k: int) -> None:
+    set_worker_state(store=SharedReferenceStore.attach(handle), top_k=top_k)
+
+
+def _align_query(query_id: str, query: str) -> Tuple[str, Hits]:
+    state = worker_state()
+    store: SharedReferenceStore = state["store"]
+    scores = [(store.ids[i], round(percent_identity(query, store.sequence(i)), 2)) for i in range(len(store))]
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return query_id, scores[:state["top_k"]]
+
+
+def _next_batch(records: Iterator, n: int) -> List[Tuple[str, str]]:
+    batch = []
+    for rec in records:
+        batch.append((rec.id, str(rec.seq)))
+        if len(batch) == n:
+            break
+    return batch
+
+
+def _output_format(out_path: Path) -> str:
+    suffix = out_path.suffix.lower()
+    if suffix in _JSON_LINES:
+        return "jsonl"
+    return "json" if suffix == ".json" else "csv"
+
+
+def _format(fmt: str, query_id: str, hits: Hits) -> str:
+    if fmt in ("jsonl", "json"):
+        line = json.dumps({"query": query_id, "hits": [{"id": r, "percent_identity": p} for r, p in hits]})
+        return line + "\n" if fmt == "jsonl" else line
+    buf = io.StringIO()
+    csv.writer(buf).writerows((query_id, rank, r, p) for rank, (r, p) in enumerate(hits, start=1))
+    return buf.getvalue()
+
+
+class BatchPipeline:
+    """
+    parse → normalize → align → write, connected by bounded asyncio queues.
+
+    - parsing and file writes run in threads (`asyncio.to_thread`), so disk I/O
+      overlaps with alignment
+    - alignment runs in a process pool; references are shared through
+      `SharedReferenceStore` and at most 2 × workers queries are in flight
+    - every queue has `queue_size` slots, so a full downstream stage pauses the
+      upstream ones and memory stays flat whatever the input size
+    - results are written in completion order, by suffix: `.jsonl`/`.ndjson` as
+      JSON Lines, `.json` as one JSON array (readable with `json.load`), else CSV
+    """
+
+    def __init__(self, references: RecordsLike, top_k: int = 5, processes: Optional[int] = None,
+                 queue_size: int = 64, parse_batch: int = 32):
+        self.references = references
+        self.top_k = top_k
+        self.workers = processes or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self.parse_batch = parse_batch
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats() -> Dict[str, int]:
+        return {"parsed": 0, "aligned": 0, "written": 0, "skipped": 0}
+
+    async def _parse(self, queries: PathLike, out: asyncio.Queue) -> None:
+        records = SeqIO.parse(str(queries), "fasta")
+        while True:
+            batch = await asyncio.to_thread(_next_batch, records, self.parse_batch)
+            for item in batch:
+                await out.put(item)
+                self.stats["parsed"] += 1
+            if len(batch) < self.parse_batch:
+                break
+        await out.put(_DONE)
+
+    async def _normalize(self, inp: asyncio.Queue, out: asyncio.Queue, n_consumers: int) -> None:
+        while (item := await inp.get()) is not _DONE:
+            query_id, seq = item
+            try:
+                await out.put((query_id, _norm(seq)))
+            except ValueError:
+                self.stats["skipped"] += 1
+        for _ in range(n_consumers):
+            await out.put(_DONE)
+
+    async def _align(self, pool: ProcessPoolExecutor, inp: asyncio.Queue, out: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while (item := await inp.get()) is not _DONE:
+            result = await loop.run_in_executor(pool, _align_query, *item)
+            self.stats["aligned"] += 1
+            await out.put(result)
+        await out.put(_DONE)
+
+    async def _write(self, inp: asyncio.Queue, out_path: Path, n_producers: int) -> None:
+        fmt = _output_format(out_path)
+        with atomic_write(out_path, newline="") as f:
+            if fmt == "csv":
+                await asyncio.to_thread(f.write, "query_id,rank,reference_id,percent_identity\r\n")
+            elif fmt == "json":
+                await asyncio.to_thread(f.write, "[")
+            remaining = n_producers
+            first = True
+            while remaining:
+                item = await inp.get()
+                if item is _DONE:
+                    remaining -= 1
+                    continue
+                text = _format(fmt, *item)
+                if fmt == "json" and not first:
+                    text = ",\n" + text
+                first = False
+                await asyncio.to_thread(f.write, text)
+                self.stats["written"] += 1
+            if fmt == "json":
+                await asyncio.to_thread(f.write, "]\n")
+
+    async def run_async(self, queries: PathLike, out_path: PathLike) -> Dict[str, int]:
+        out_path = Path(out_path)
+        self.stats = self._new_stats()  # per run: a pipeline can be reused
+        n_align = 2 * self.workers
+        parsed, normalized, aligned = (asyncio.Queue(self.queue_size) for _ in range(3))
+
+        with SharedReferenceStore(self.references) as store:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(store.handle, self.top_k)) as pool:
+                tasks = [
+                    asyncio.create_task(self._parse(queries, parsed)),
+                    asyncio.create_task(self._normalize(parsed, normalized, n_align)),
+                    *(asyncio.create_task(self._align(pool, normalized, aligned)) for _ in range(n_align)),
+                    asyncio.create_task(self._write(aligned, out_path, n_align)),
+                ]
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    for task in tasks:
+                        task.cancel()
+                    raise
+        return dict(self.stats)
+
+    def run(self, queries: PathLike, out_path: PathLike) -> Dict[str, int]:
+        return asyncio.run(self.run_async(queries, out_path))
+
+
+def run_batch(queries: PathLike, references: RecordsLike, out_path: PathLike, **kwargs) -> Dict[str, int]:
+    """Compare every query in a FASTA against the references; see `BatchPipeline` for options."""
+    return BatchPipeline(references, **kwargs).run(queries, out_path)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+# SRC/dogbreed/breed_registry.py
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from dogbreed.mapping_csv import UpdatesLike, csv_signature, iter_updates, read_mapping_rows, write_mapping_csv
+from dogbreed.mapping_journal import apply_updates
+
+PathLike = Union[str, Path]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS breeds (
+    accession_id TEXT PRIMARY KEY,  -- B-tree index: O(log n) lookup
+    breed        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class BreedRegistry:
+    """
+    accession_id → breed registry backed by an indexed SQLite table.
+
+    - lookups hit the primary-key index instead of rescanning a CSV
+    - `upsert_many` applies a whole batch in one transaction
+    - file-backed registries use WAL mode so readers never block the writer
+    - `import_csv` / `export_csv` keep breed_mapping.csv as the interchange format
+    """
+
+    def __init__(self, db_path: PathLike = ":memory:", csv_path: Optional[PathLike] = None):
+        self.db_path = str(db_path)
+        self.csv_path = Path(csv_path) if csv_path is not None else None
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_csv(cls, csv_path: PathLike) -> "BreedRegistry":
+        """
+        Open the sidecar registry for a mapping CSV (breed_mapping.csv → breed_mapping.sqlite).
+        The CSV is re-imported whenever it changed outside the registry.
+        """
+        csv_path = Path(csv_path)
+        registry = cls(csv_path.with_suffix(".sqlite"), csv_path=csv_path)
+        registry.sync_from_csv()
+        return registry
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+
+    def get(self, accession_id: str, default: Optional[str] = None) -> Optional[str]:
+        """Return the breed for an accession ID (indexed lookup)."""
+        row = self._conn.execute(
+            "SELECT breed FROM breeds WHERE accession_id = ?", (accession_id,)
+        ).fetchone()
+        return row[0] if row else default
+
+    def __contains__(self, accession_id: object) -> bool:
+        return self.get(str(accession_id)) is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM breeds").fetchone()[0]
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        """Yield (accession_id, breed) pairs in first-insertion order."""
+        yield from self._conn.execute("SELECT accession_id, breed FROM breeds ORDER BY rowid")
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self.items())
+
+    # ---------------------------
+    # Updates
+    # ---------------------------
+
+    def upsert_many(self, updates: UpdatesLike) -> int:
+        """
+        Insert or overwrite accession_id → breed pairs in a single transaction.
+        Returns the number of pairs applied.
+        """
+        rows = list(iter_updates(updates))
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO breeds (accession_id, breed) VALUES (?, ?) "
+                "ON CONFLICT(accession_id) DO UPDATE SET breed = excluded.breed",
+                rows,
+            )
+        return len(rows)
+
+    def upsert(self, accession_id: str, breed: str) -> None:
+        self.upsert_many([(accession_id, breed)])
+
+    def remove(self, accession_id: str) -> bool:
+        with self._conn:
+            cur = self._conn.execute("DELETE FROM breeds WHERE accession_id = ?", (accession_id,))
+        return cur.rowcount > 0
+
+    # ---------------------------
+    # CSV interchange
+    # ---------------------------
+
+    def import_csv(self, csv_path: PathLike, replace: bool = False) -> int:
+        """Load a mapping CSV (later rows win). Returns the number of rows read."""
+        rows = list(read_mapping_rows(csv_path))
+        with self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM breeds")
+            self._conn.executemany(
+                "INSERT INTO breeds (accession_id, breed) VALUES (?, ?) "
+                "ON CONFLICT(accession_id) DO UPDATE SET breed = excluded.breed",
+                rows,
+            )
+        return len(rows)
+
+    def export_csv(self, csv_path: Optional[PathLike] = None) -> Path:
+        """
+        Write the registry as an `accession_id,breed` CSV.
+        The file is replaced atomically so readers never see a half-written mapping.
+        """
+        target = Path(csv_path) if csv_path is not None else self.csv_path
+        if target is None:
+            raise ValueError("No CSV path given and registry is not bound to one")
+        write_mapping_csv(target, self.items())
+
+        if self.csv_path is not None and target.resolve() == self.csv_path.resolve():
+            self._set_meta("csv_signature", csv_signature(target) or "")
+        return target
+
+    def sync_from_csv(self) -> bool:
+        """Re-import the bound CSV if it changed since the last sync. Returns True if reloaded."""
+        if self.csv_path is None:
+            return False
+        signature = csv_signature(self.csv_path)
+        recorded = self._get_meta("csv_signature")
+        if signature is None:
+            # CSV deleted: it is the source of truth, so start from an empty registry
+            if recorded:
+                with self._conn:
+                    self._conn.execute("DELETE FROM breeds")
+                self._set_meta("csv_signature", "")
+                return True
+            return False
+        if signature == recorded:
+            return False
+        self.import_csv(self.csv_path, replace=True)
+        self._set_meta("csv_signature", signature)
+        return True
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "BreedRegistry":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def update_mapping_csv(csv_path: PathLike, updates: UpdatesLike) -> None:
+    """
+    Apply a batch of accession_id → breed updates to a mapping CSV.
+    Existing IDs are overwritten, new IDs are appended, duplicates never accumulate.
+    Unlike `mapping_journal.apply_updates`, the CSV is rewritten before returning;
+    `BreedRegistry.for_csv` picks the new content up on its next sync.
+    """
+    apply_updates(csv_path, updates, write_through=True)
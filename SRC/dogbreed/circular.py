@@ -0,0 +1,184 @@
+from __future__ import annotations
+# SRC/dogbreed/circular.py
+import hashlib
+import sqlite3
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, compare_sequences
+
+PathLike = Union[str, Path]
+
+ROTATIONS_SUFFIX = ".rotations.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rotations (
+    anchor_sha256 TEXT NOT NULL,     -- canonical origin (reference) the offset is relative to
+    seq_sha256    TEXT NOT NULL,     -- sequence content, so renamed accessions still hit
+    k             INTEGER NOT NULL,
+    offset        INTEGER NOT NULL,
+    PRIMARY KEY (anchor_sha256, seq_sha256, k)
+);
+"""
+
+# In-process offsets used when no RotationCache is given: (anchor, sequence, k) → offset
+_OFFSETS: Dict[Tuple[str, str, int], int] = {}
+_MAX_OFFSETS = 65536
+
+
+def _sha256(seq: str) -> str:
+    return hashlib.sha256(seq.encode("ascii")).hexdigest()
+
+
+def _circular_kmers(seq: str, k: int) -> Iterator[Tuple[int, str]]:
+    """(position, k-mer) for every start on a circular sequence, wrapping across the origin."""
+    wrapped = seq + seq[:k - 1]
+    for i in range(len(seq)):
+        yield i, wrapped[i:i + k]
+
+
+class RotationAnchor:
+    """
+    Canonical origin for circular sequences (e.g. one reference mitogenome).
+
+    Keeps the position of every k-mer that occurs once in the anchor; repeated
+    k-mers are dropped because they vote for several offsets.
+    """
+
+    def __init__(self, anchor_seq: str, k: int = 15):
+        self.seq = _norm(anchor_seq)
+        self.k = k
+        self.sha256 = _sha256(self.seq)
+        positions: Dict[str, int] = {}
+        repeated = set()
+        for i, kmer in _circular_kmers(self.seq, k):
+            if kmer in positions:
+                repeated.add(kmer)
+            positions[kmer] = i
+        for kmer in repeated:
+            del positions[kmer]
+        self._positions = positions
+
+    def find_offset(self, seq: str) -> int:
+        """
+        Position in `seq` that corresponds to the anchor's origin.
+
+        Every shared k-mer votes for (its position in seq - its position in the anchor)
+        mod len(seq); the most common diagonal wins. One pass over `seq`, no DP.
+        Returns 0 when nothing is shared (the sequence is left as is).
+        """
+        n = len(seq)
+        votes: Counter = Counter()
+        for i, kmer in _circular_kmers(seq, self.k):
+            j = self._positions.get(kmer)
+            if j is not None:
+                votes[(i - j) % n] += 1
+        return votes.most_common(1)[0][0] if votes else 0
+
+
+class RotationCache:
+    """
+    Rotation offsets keyed by anchor (reference) hash, sequence hash and k, in their
+    own SQLite file, e.g. the `<fasta>.rotations.sqlite` sidecar of a reference FASTA.
+    """
+
+    def __init__(self, db_path: PathLike = ":memory:"):
+        self.db_path = str(db_path)
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    @classmethod
+    def for_fasta(cls, fasta_path: PathLike) -> "RotationCache":
+        fasta_path = Path(fasta_path)
+        return cls(fasta_path.with_name(fasta_path.name + ROTATIONS_SUFFIX))
+
+    def get(self, anchor_sha256: str, seq_sha256: str, k: int) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT offset FROM rotations WHERE anchor_sha256 = ? AND seq_sha256 = ? AND k = ?",
+            (anchor_sha256, seq_sha256, k),
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(self, anchor_sha256: str, seq_sha256: str, k: int, offset: int) -> None:
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO rotations (anchor_sha256, seq_sha256, k, offset) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(anchor_sha256, seq_sha256, k) DO UPDATE SET offset = excluded.offset",
+                (anchor_sha256, seq_sha256, k, offset),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "RotationCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def rotate(seq: str, offset: int) -> str:
+    return seq[offset:] + seq[:offset]
+
+
+def canonicalize(seq: str, anchor: RotationAnchor, cache: Optional[RotationCache] = None) -> Tuple[str, int]:
+    """
+    Rotate a circular sequence to the anchor's origin. Returns (rotated, offset).
+    Offsets are cached by anchor and sequence content: in `cache` if given,
+    otherwise in a bounded in-process table.
+    """
+    s = _norm(seq)
+    key = (anchor.sha256, _sha256(s), anchor.k)
+    offset = cache.get(*key) if cache is not None else _OFFSETS.get(key)
+    if offset is None:
+        offset = anchor.find_offset(s)
+        if cache is not None:
+            cache.put(*key, offset)
+        else:
+            if len(_OFFSETS) >= _MAX_OFFSETS:
+                _OFFSETS.pop(next(iter(_OFFSETS)))  # oldest first
+            _OFFSETS[key] = offset
+    return rotate(s, offset), offset
+
+
+def canonicalize_records(
+    records: RecordsLike,
+    anchor: RotationAnchor,
+    cache: Optional[RotationCache] = None,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (id, rotated sequence) for every record."""
+    for rec_id, seq in _iter_records(records):
+        yield rec_id, canonicalize(seq, anchor, cache)[0]
+
+
+def compare_circular(
+    query_seq: str,
+    records: RecordsLike,
+    anchor_seq: Optional[str] = None,
+    cache: Optional[RotationCache] = None,
+    k: int = 15,
+) -> List[Tuple[str, float]]:
+    """
+    `compare_sequences` for circular genomes: the query and every reference are
+    rotated to a common origin (the first reference unless `anchor_seq` is given)
+    so global alignment no longer pays for huge end gaps.
+
+    Without `cache`, offsets for a reference FASTA path persist in its
+    `<fasta>.rotations.sqlite` sidecar, and in-memory records use the in-process table.
+    """
+    refs: List[Tuple[str, str]] = list(_iter_records(records))
+    if not refs:
+        return []
+    anchor = RotationAnchor(anchor_seq if anchor_seq is not None else refs[0][1], k=k)
+    sidecar = RotationCache.for_fasta(records) if cache is None and isinstance(records, (str, Path)) else None
+    try:
+        cache = cache or sidecar
+        rotated = list(canonicalize_records(refs, anchor, cache))
+        return compare_sequences(canonicalize(query_seq, anchor, cache)[0], rotated)
+    finally:
+        if sidecar is not None:
+            sidecar.close()
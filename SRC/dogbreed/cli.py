@@ -2,7 +2,13 @@
 
 import argparse
 from pathlib import Path
+from dogbreed.cluster import cluster_records, write_clusters
 from dogbreed.dog_breed_identifier import DogBreedIdentifier
+from dogbreed.fasta_rewriter import load_mapping
+from dogbreed.ingest import ingest_directory
+from dogbreed.pipeline import explain
+from dogbreed.sharded import ShardServer
+from dogbreed.snp_index import build_snp_index
 
 
 def identify():
@@ -12,14 +18,17 @@ def identify():
     parser.add_argument("--mystery", required=True, help="Mystery FASTA file (unknown breed)")
     parser.add_argument("--map", required=True, help="CSV mapping accession_id → breed")
     parser.add_argument("--out", default="Results", help="Output directory")
+    parser.add_argument("--explain", action="store_true", help="Show which stages re-ran and why")
     args = parser.parse_args()
 
-    # Run identification
-    identifier = DogBreedIdentifier(args.fasta, args.mystery, args.map, args.out)
-    best_id, pid = identifier.identify_mystery()
-    breed = identifier.lookup_breed(best_id)
+    # Run the incremental pipeline (unchanged stages are skipped)
+    identifier = DogBreedIdentifier(args.fasta, args.mystery, args.out, map_file=args.map)
+    (best_id, pid), report = identifier.run()
 
-    print(f"✅ Best match: {breed} ({best_id}), {pid:.2f}% identity")
+    if args.explain:
+        for line in explain(report):
+            print(f"   {line}")
+    print(f"✅ Best match: {best_id}, {pid:.2f}% identity")
 
 
 def tree():
@@ -30,9 +39,101 @@ def tree():
     parser.add_argument("--out", default="Results", help="Output directory")
     args = parser.parse_args()
 
-    identifier = DogBreedIdentifier(args.fasta, args.fasta, args.map, args.out)
+    identifier = DogBreedIdentifier(args.fasta, args.fasta, args.out, map_file=args.map)
     written = identifier.build_tree()
 
     print("🌳 Tree generated:")
     for w in written:
         print(f"   - {w}")
+
+
+def classify_reads():
+    """CLI: Classify sequencing reads (FASTQ) and estimate breed abundance."""
+    parser = argparse.ArgumentParser("dogbreed-classify-reads")
+    parser.add_argument("--fasta", required=True, help="Reference FASTA (all dog breeds)")
+    parser.add_argument("--reads", required=True, help="FASTQ file with reads (.gz accepted)")
+    parser.add_argument("--map", required=True, help="CSV mapping accession_id → breed")
+    parser.add_argument("--out", default="Results", help="Output directory")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    identifier = DogBreedIdentifier(args.fasta, args.reads, args.out, map_file=args.map)
+    summary = identifier.classify_reads(args.reads, processes=args.processes)
+
+    print(f"🧬 Classified {summary['total'] - summary['unclassified']}/{summary['total']} reads")
+    for label, fraction in summary["abundance"].items():
+        print(f"   - {label}: {summary['counts'][label]} reads ({fraction:.2%})")
+
+
+def snp_index():
+    """CLI: Precompute the diagnostic-SNP fingerprint table for a reference panel."""
+    parser = argparse.ArgumentParser("dogbreed-snp-index")
+    parser.add_argument("--fasta", required=True, help="Reference FASTA (all dog breeds)")
+    parser.add_argument("--anchor", required=True, help="Anchor genome FASTA (e.g. data/fasta_files/CM023446.fasta)")
+    parser.add_argument("--out", default="Results/snp_index.npz", help="Output fingerprint table (.npz)")
+    args = parser.parse_args()
+
+    written = build_snp_index(args.fasta, args.anchor, args.out)
+    print(f"🧬 Fingerprint table written to {written}")
+
+
+def cluster():
+    """CLI: Collapse near-identical references into clusters (CD-HIT style)."""
+    parser = argparse.ArgumentParser("dogbreed-cluster")
+    parser.add_argument("--fasta", required=True, help="Reference FASTA (all dog breeds)")
+    parser.add_argument("--map", required=True, help="CSV mapping accession_id → breed")
+    parser.add_argument("--identity", type=float, default=0.97, help="Clustering identity threshold (0-1)")
+    parser.add_argument("--kmer", type=int, default=8, help="Word size for the k-mer prefilter")
+    parser.add_argument("--out", default="Results", help="Output directory")
+    args = parser.parse_args()
+
+    clusters = cluster_records(args.fasta, identity=args.identity, k=args.kmer)
+    out_dir = Path(args.out)
+    reps, table = write_clusters(clusters, args.fasta, out_dir / "representatives.fa",
+                                 out_dir / "clusters.csv", mapping=load_mapping(args.map))
+
+    print(f"🧩 {sum(len(m) for m in clusters.values())} sequences → {len(clusters)} clusters")
+    print(f"   - {reps}")
+    print(f"   - {table}")
+
+
+def ingest():
+    """CLI: Consolidate a directory of per-accession FASTA files into one reference FASTA."""
+    parser = argparse.ArgumentParser("dogbreed-ingest")
+    parser.add_argument("--src", default="data/fasta_files", help="Directory tree of per-accession FASTA files")
+    parser.add_argument("--map", default="data/breed_mapping.csv", help="CSV mapping accession_id → breed")
+    parser.add_argument("--out", default="data/dog_sequences.fa", help="Consolidated reference FASTA")
+    parser.add_argument("--processes", type=int, default=None, help="Worker processes (default: all cores)")
+    args = parser.parse_args()
+
+    summary = ingest_directory(args.src, args.out, mapping=load_mapping(args.map), processes=args.processes)
+
+    print(f"📥 {summary['records']} sequences from {summary['files']} files → {args.out}")
+    print(f"   - {summary['reused']} unchanged files reused, {summary['parsed']} parsed")
+    print(f"   - duplicates dropped: {summary['duplicate_accessions']} by accession, "
+          f"{summary['duplicate_sequences']} by sequence")
+    if summary["unlabelled"]:
+        print(f"   - {summary['unlabelled']} sequences without a breed label")
+    for problem in summary["problems"]:
+        print(f"   ⚠️ {problem}")
+
+
+def shard_worker():
+    """CLI: Serve one shard of the reference panel for sharded (scatter-gather) search."""
+    parser = argparse.ArgumentParser("dogbreed-shard-worker")
+    parser.add_argument("--fasta", required=True, help="FASTA with this worker's shard of the references")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=7070, help="TCP port")
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--name", default=None, help="Shard name reported to health checks")
+    args = parser.parse_args()
+
+    address = args.socket or (args.host, args.port)
+    server = ShardServer(args.fasta, address, name=args.name or Path(args.fasta).stem)
+    print(f"🧩 Shard {server.name} ({len(server.refs)} sequences) listening on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+# SRC/dogbreed/cluster.py
+import csv
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+from dogbreed.sequence_utils import kmer_set
+
+PathLike = Union[str, Path]
+
+CLUSTER_FIELDS = ["cluster_id", "accession_id", "breed", "representative", "percent_identity"]
+
+
+def cluster_records(
+    records: RecordsLike,
+    identity: float = 0.97,
+    k: int = 8,
+) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Greedy CD-HIT-style clustering of a reference panel.
+
+    Sequences are visited longest first; each one joins the first representative it
+    matches at >= `identity`, otherwise it founds a new cluster. A shared k-mer
+    filter (each mismatch can destroy at most k k-mers) rules out most
+    representatives before any alignment, so this is not all-vs-all.
+
+    Returns {representative_id: [(member_id, percent_identity), ...]} with the
+    representative listed first in its own cluster.
+    """
+    seqs = sorted(((rid, _norm(s)) for rid, s in _iter_records(records)), key=lambda x: len(x[1]), reverse=True)
+
+    clusters: Dict[str, List[Tuple[str, float]]] = {}
+    rep_seqs: Dict[str, str] = {}
+    kmer_index: Dict[str, List[str]] = {}
+
+    for rec_id, seq in seqs:
+        kmers = kmer_set(seq, k)
+        allowed_mismatches = int((1.0 - identity) * len(seq))
+        min_shared = max(1, len(kmers) - allowed_mismatches * k)
+
+        shared: Counter = Counter()
+        for kmer in kmers:
+            for rep in kmer_index.get(kmer, ()):
+                shared[rep] += 1
+
+        joined = False
+        for rep, n in shared.most_common():
+            if n < min_shared:
+                break
+            pid = percent_identity(seq, rep_seqs[rep])
+            if pid >= identity * 100.0:
+                clusters[rep].append((rec_id, round(pid, 2)))
+                joined = True
+                break
+
+        if not joined:
+            clusters[rec_id] = [(rec_id, 100.0)]
+            rep_seqs[rec_id] = seq
+            for kmer in kmers:
+                kmer_index.setdefault(kmer, []).append(rec_id)
+
+    return clusters
+
+
+def write_clusters(
+    clusters: Mapping[str, List[Tuple[str, float]]],
+    records: RecordsLike,
+    reps_fasta: PathLike,
+    table_csv: PathLike,
+    mapping: Optional[Mapping[str, str]] = None,
+) -> Tuple[str, str]:
+    """Write the representatives FASTA and the cluster membership table (with breed labels)."""
+    mapping = mapping or {}
+    reps_fasta, table_csv = Path(reps_fasta), Path(table_csv)
+    reps_fasta.parent.mkdir(parents=True, exist_ok=True)
+    table_csv.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(reps_fasta, "w", encoding="utf-8") as out:
+        for rec_id, seq in _iter_records(records):
+            if rec_id in clusters:
+                out.write(f">{rec_id}\n{seq}\n")
+
+    with open(table_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(CLUSTER_FIELDS)
+        for cluster_id, (rep, members) in enumerate(clusters.items(), start=1):
+            for member, pid in members:
+                writer.writerow([cluster_id, member, mapping.get(member, "Unknown Breed"), rep, pid])
+
+    return str(reps_fasta), str(table_csv)
+
+
+def load_clusters(table_csv: PathLike) -> Dict[str, List[str]]:
+    """Read a membership table back into {representative_id: [member_id, ...]}."""
+    clusters: Dict[str, List[str]] = {}
+    with open(table_csv, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            clusters.setdefault(row["representative"], []).append(row["accession_id"])
+    return clusters
@@ -1,11 +1,17 @@
 from __future__ import annotations
 # SRC/dogbreed/compare_sequences.py
 import csv
-from typing import Tuple, Dict, List, Iterable, Union, Iterator
+import heapq
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Tuple, Dict, List, Iterable, Union, Iterator, Mapping, Optional
 from Bio import Align, SeqIO, pairwise2
 from Bio.SeqRecord import SeqRecord
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from dogbreed.orientation import OrientationIndex
+
 # Configure a deterministic global aligner (no pairwise2)
 _aligner = Align.PairwiseAligner()
 _aligner.mode = "global"           # Needleman–Wunsch style
@@ -72,10 +78,10 @@ def compare_fasta(path: str) -> Tuple[str, str, float]:
     return (recs[0].id, recs[1].id, round(pid, 2))
 
 
-RecordsLike = Union[str, Iterable[SeqRecord], Iterable[Tuple[str, str]]]
+RecordsLike = Union[str, Mapping[str, str], Iterable[SeqRecord], Iterable[Tuple[str, str]]]
 
 def _iter_records(records: RecordsLike) -> Iterator[Tuple[str, str]]:
-    """Yield (id, seq) pairs from a path, file-like, SeqRecords, or tuples."""
+    """Yield (id, seq) pairs from a path, file-like, mapping/SequenceCollection, SeqRecords, or tuples."""
     # Path or string: parse FASTA
     if isinstance(records, (str, Path)):
         with open(records, "r", encoding="utf-8") as handle:
@@ -89,6 +95,11 @@ def _iter_records(records: RecordsLike) -> Iterator[Tuple[str, str]]:
             yield rec.id, str(rec.seq)
         return
 
+    # Mapping-like ({id: seq} dict or SequenceCollection): no per-record objects needed
+    if hasattr(records, "items"):
+        yield from records.items()
+        return
+
     # Iterable of items: accept SeqRecord or (id, seq)
     for rec in records:
         if isinstance(rec, SeqRecord):
@@ -100,20 +111,180 @@ def _iter_records(records: RecordsLike) -> Iterator[Tuple[str, str]]:
             raise TypeError(f"Unsupported record type: {type(rec)!r}")
         
 
-def compare_sequences(query_seq: str, records: RecordsLike) -> List[Dict[str, Union[str, float]]]:  
+def _compare_clustered(q: str, records: RecordsLike, clusters: Mapping[str, List[str]]) -> List[Tuple[str, float]]:
+    """Score cluster representatives first, then expand only the winning cluster."""
+    refs = dict(_iter_records(records))
+    scores = {rid: round(percent_identity(q, refs[rid]), 2) for rid in clusters if rid in refs}
+    if not scores:
+        return []
+
+    winner = max(scores, key=scores.get)
+    for member in clusters[winner]:
+        if member not in scores and member in refs:
+            scores[member] = round(percent_identity(q, refs[member]), 2)
+
+    return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+
+class CancellationToken:
+    """Thread-safe flag a caller can set to stop a running comparison."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+ProgressCallback = Callable[[int, List[Tuple[str, float]]], None]
+
+
+class ComparisonStream:
+    """
+    Iterator that yields (id, percent_identity) as soon as each reference is scored.
+
+    - `top` is the running top-k (best first), available at any point
+    - `progress(done, top)` is called after every pair
+    - iteration stops early when `cancel` is cancelled, when `time.monotonic()`
+      passes `deadline`, or when `stop_when(top)` returns True (e.g. a confident winner);
+      `stopped` then says why
+    """
+
+    def __init__(
+        self,
+        query_seq: str,
+        records: RecordsLike,
+        top_k: int = 5,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[CancellationToken] = None,
+        deadline: Optional[float] = None,
+        stop_when: Optional[Callable[[List[Tuple[str, float]]], bool]] = None,
+    ):
+        self.query = _norm(query_seq)
+        self.records = records
+        self.top_k = top_k
+        self.progress = progress
+        self.cancel = cancel
+        self.deadline = deadline
+        self.stop_when = stop_when
+        self.done = 0
+        self.stopped: Optional[str] = None
+        self._heap: List[Tuple[float, int, str]] = []  # min-heap of the current top-k
+
+    @property
+    def top(self) -> List[Tuple[str, float]]:
+        return [(rid, pid) for pid, _, rid in sorted(self._heap, reverse=True)]
+
+    def _should_stop(self) -> Optional[str]:
+        if self.cancel is not None and self.cancel.cancelled:
+            return "cancelled"
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return "deadline"
+        if self.stop_when is not None and self.stop_when(self.top):
+            return "stop_when"
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[str, float]]:
+        for rec_id, rec_seq in _iter_records(self.records):
+            self.stopped = self._should_stop()
+            if self.stopped:
+                return
+
+            pid = round(percent_identity(self.query, rec_seq), 2)
+            entry = (pid, -self.done, rec_id)  # earlier records win ties
+            if len(self._heap) < self.top_k:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                heapq.heapreplace(self._heap, entry)
+            self.done += 1
+
+            if self.progress is not None:
+                self.progress(self.done, self.top)
+            yield rec_id, pid
+
+
+def iter_compare(query_seq: str, records: RecordsLike, **kwargs) -> ComparisonStream:
+    """Streaming counterpart of `compare_sequences`; see `ComparisonStream` for options."""
+    return ComparisonStream(query_seq, records, **kwargs)
+
+
+def _orient_query(q: str, records: RecordsLike, orient: Union[bool, "OrientationIndex"]) -> Tuple[str, str, RecordsLike]:
+    """(query on the references' strand, "+" or "-", records still readable for the comparison)."""
+    from dogbreed.orientation import OrientationIndex
+
+    if not isinstance(orient, OrientationIndex):
+        if isinstance(records, (str, Path)):
+            orient = OrientationIndex.for_path(records)  # cached per file content
+        else:
+            if not hasattr(records, "items"):
+                records = list(_iter_records(records))  # read twice: index + comparison
+            orient = OrientationIndex(records)
+    q, strand = orient.orient(q)
+    return q, strand, records
+
+
+def compare_sequences(
+    query_seq: str,
+    records: RecordsLike,
+    clusters: Optional[Mapping[str, List[str]]] = None,
+    orient: Union[bool, "OrientationIndex"] = False,
+    tolerance: Optional[float] = None,
+) -> List[Tuple[str, float]]:
     """
     Return a list of comparison results between the query sequence and each record.
+
+    Rows are always (id, percent_identity), best first.
+
+    With `clusters` ({representative_id: [member_id, ...]}, see `cluster.load_clusters`)
+    only the representatives and the members of the best-scoring cluster are aligned.
+
+    With `orient` (True, or a prebuilt `orientation.OrientationIndex` to reuse across
+    queries; a FASTA path's index is built once per file content) the query is
+    reverse-complemented first if a k-mer vote says it is on the opposite strand.
+    `compare_oriented` also returns the strand that was used.
+
+    With `tolerance` (percentage points) identities are first estimated from k-mer
+    containment with a confidence interval, and only candidates whose interval
+    overlaps the leader's (widened by `tolerance`) are aligned exactly. Rows stay in
+    estimate order and carry the exact identity where one was computed, else the
+    estimate; `approx_identity.compare_with_tolerance` returns both values and the method.
     """
     q = _norm(query_seq)
-    scores: List[Tuple[str, float]] = []
-    for rec_id, rec_seq in _iter_records(records):
-        pid = percent_identity(q, rec_seq)
-        scores.append((rec_id, round(pid, 2)))
+    if orient:
+        q, _, records = _orient_query(q, records, orient)
 
-    scores.sort(key=lambda x: x[1], reverse=True)
+    if clusters is not None:
+        scores = _compare_clustered(q, records, clusters)
+    elif tolerance is not None:
+        from dogbreed.approx_identity import compare_with_tolerance
+
+        scores = [(rid, pid if pid is not None else round(est, 2))
+                  for rid, est, _, _, pid, _ in compare_with_tolerance(q, records, tolerance=tolerance)]
+    else:
+        scores = list(ComparisonStream(q, records))
+        scores.sort(key=lambda x: x[1], reverse=True)
     return scores
 
 
+def compare_oriented(
+    query_seq: str,
+    records: RecordsLike,
+    orient: Union[bool, "OrientationIndex"] = True,
+    **kwargs,
+) -> Tuple[List[Tuple[str, float]], str]:
+    """
+    `compare_sequences` with strand detection: returns (rows, strand), where strand is
+    "+" or "-" for the orientation the query was compared in. Other keyword arguments
+    are passed through.
+    """
+    q, strand, records = _orient_query(_norm(query_seq), records, orient)
+    return compare_sequences(q, records, **kwargs), strand
+
+
 def closest_match(query_seq: str, records: RecordsLike) -> str:
     """
     Convenience wrapper: return the ID of the top-scoring record.
@@ -132,7 +303,7 @@ def scores_to_probabilities(scores: list[tuple[str, float]]) -> list[tuple[str,
     Returns:
         List of (record_id, percent_identity, probability)
     """
-    weights = [s[1] for _, s in scores]
+    weights = [s for _, s in scores]
     total = sum(weights)
 
     if total == 0:
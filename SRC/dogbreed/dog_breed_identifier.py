@@ -1,70 +1,144 @@
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import csv
+import json
 
-from dogbreed.compare_sequences import compare_sequences
+from dogbreed.compare_sequences import compare_sequences, save_results_to_csv, scores_to_probabilities
+from dogbreed.fasta_rewriter import load_mapping, manifest_path, rewrite_fasta_ids
+from dogbreed.mapping_journal import MappingJournal
+from dogbreed.pipeline import Pipeline, Stage
+from dogbreed.read_classifier import classify_reads
+from dogbreed.result_cache import ResultCache, query_key, reference_version
+from dogbreed.tree_search import TreeSearchIndex
 from dogbreed.phylogenetic_tree import generate_phylogenetic_tree as generate_tree
 from Bio import SeqIO
 
 
 class DogBreedIdentifier:
-    def __init__(self, fasta_file: str, mystery_file: str, out_dir: str):
+    def __init__(self, fasta_file: str, mystery_file: str, out_dir: str,
+                 map_file: str = "data/breed_mapping.csv", cache_size: int = 1024):
         self.fasta_file = Path(fasta_file)
         self.mystery_file = Path(mystery_file)
+        self.map_file = Path(map_file)
         self.out_dir = Path(out_dir)
         self.out_dir.mkdir(parents=True, exist_ok=True)
 
         # Results files
         self.named_fasta = self.out_dir / "dog_sequences_named.fa"
+        self.results_csv = self.out_dir / "identification_results.csv"
+        self.newick_file = self.out_dir / "phylogenetic_tree.nwk"
+        self.png_file = self.out_dir / "phylogenetic_tree.png"
+
+        # Ranked results of earlier queries, reused while the reference version is unchanged
+        self.cache_file = self.out_dir / ".result_cache.sqlite"
+        self.cache_size = cache_size
 
     def replace_ids_with_names(self) -> str:
-        """Convert FASTA accession IDs to breed names using a CSV mapping file."""
-        map_file = Path("data/breed_mapping.csv")
-        mapping: Dict[str, str] = {}
-
-        with open(map_file, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                mapping[row["accession_id"]] = row["breed"]
-
-        # Replace IDs in fasta file
-        records = []
-        for record in SeqIO.parse(str(self.fasta_file), "fasta"):
-            if record.id in mapping:
-                record.id = mapping[record.id]
-                record.description = mapping[record.id]
-            records.append(record)
-
-        SeqIO.write(records, str(self.named_fasta), "fasta")
+        """
+        Convert FASTA accession IDs to breed names using a CSV mapping file.
+        Streams record by record and is a no-op when the reference FASTA and
+        mapping are unchanged since the last run (see fasta_rewriter manifest).
+        """
+        mapping: Dict[str, str] = load_mapping(self.map_file)
+        rewrite_fasta_ids(self.fasta_file, mapping, self.named_fasta)
         return str(self.named_fasta)
 
-    def identify(self) -> List[Tuple[str, float]]:
+    def identify(self, orient: bool = False, use_cache: bool = True) -> List[Tuple[str, float]]:
         """
         Compare the mystery sequence to the named reference set.
-        Returns a list of (best_id, percent_identity).
+        Returns a list of (best_id, percent_identity); with `orient` a reverse-complemented
+        query is flipped first (`compare_sequences.compare_oriented` reports the strand).
+
+        The full ranking is cached per normalised query and reference version (FASTA,
+        mapping and parameters), so resubmitted sequences skip the scan.
         """
-        if not self.named_fasta.exists():
-            self.replace_ids_with_names()
+        self.replace_ids_with_names()
 
         query_record = next(SeqIO.parse(self.mystery_file, "fasta"))
         query_seq = str(query_record.seq)
 
-        ranked = compare_sequences(query_seq, str(self.named_fasta))
+        if use_cache:
+            with ResultCache(self.cache_file, self.cache_size) as cache:
+                key, version = query_key(query_seq), self._reference_version({"orient": orient})
+                ranked = cache.get(key, version)
+                if ranked is None:
+                    ranked = compare_sequences(query_seq, str(self.named_fasta), orient=orient)
+                    cache.put(key, version, ranked)
+        else:
+            ranked = compare_sequences(query_seq, str(self.named_fasta), orient=orient)
 
         if ranked:
             return [(ranked[0][0], ranked[0][1])]
         else:
             return [("Unknown", 0.0)]
 
+    def _reference_version(self, params: Dict[str, object]) -> str:
+        """Version of the named reference, from the hashes recorded by `replace_ids_with_names`."""
+        manifest = json.loads(manifest_path(self.named_fasta).read_text(encoding="utf-8"))
+        return reference_version(manifest["input_sha256"], manifest["mapping_sha256"],
+                                 {**params, "rename": manifest["options"]})
+
     def build_tree(self) -> List[str]:
         """
         Build a phylogenetic tree from the named FASTA file.
         Returns list of output file paths [nwk, png].
         """
-        if not self.named_fasta.exists():
-            self.replace_ids_with_names()
+        self.replace_ids_with_names()
+        return self._generate_tree()
+
+    def _generate_tree(self) -> List[str]:
+        return generate_tree(self.named_fasta, self.out_dir, self.newick_file.name, self.png_file.name)
+
+    def identify_by_tree(self, beam_width: int = 2) -> Dict[str, object]:
+        """
+        Tree-guided search: descend the breed tree with a beam and only align the leaves reached.
+        Requires a tree whose leaves are the named reference IDs (see `build_tree`).
+        """
+        self.replace_ids_with_names()
+        query_record = next(SeqIO.parse(self.mystery_file, "fasta"))
+        index = TreeSearchIndex(self.newick_file, str(self.named_fasta))
+        return index.search(str(query_record.seq), beam_width=beam_width)
 
-        nwk_name = "phylogenetic_tree.nwk"
-        png_name = "phylogenetic_tree.png"
-        return generate_tree(self.named_fasta, self.out_dir, nwk_name, png_name)
+    def classify_reads(self, fastq_file: str, processes: Optional[int] = 1) -> Dict[str, object]:
+        """
+        Classify a FASTQ (optionally gzipped) read by read against the named reference set.
+        Ties resolve to the lowest common clade of the breed tree when one has been built.
+        """
+        self.replace_ids_with_names()
+        tree = self.newick_file if self.newick_file.exists() else None
+        return classify_reads(fastq_file, str(self.named_fasta), tree=tree, processes=processes)
+
+    def write_ranking(self) -> str:
+        """Rank every reference against the mystery sequence and save it as CSV."""
+        query_record = next(SeqIO.parse(self.mystery_file, "fasta"))
+        ranked = compare_sequences(str(query_record.seq), str(self.named_fasta))
+        save_results_to_csv(scores_to_probabilities(ranked), self.results_csv)
+        return str(self.results_csv)
+
+    def pipeline(self) -> Pipeline:
+        """
+        Build graph: rename → (identify ‖ tree).
+        Identification and tree building only depend on the renamed FASTA, so they run concurrently.
+        """
+        pipe = Pipeline(self.out_dir / ".pipeline_state.json")
+        journal = MappingJournal(self.map_file).journal_path
+        pipe.add(Stage("rename", self.replace_ids_with_names,
+                       inputs=[self.fasta_file, self.map_file, journal], outputs=[self.named_fasta]))
+        pipe.add(Stage("identify", self.write_ranking, deps=["rename"],
+                       inputs=[self.named_fasta, self.mystery_file], outputs=[self.results_csv]))
+        # Alignment, distance matrix and rendering happen inside generate_tree; pyplot stays on the main thread
+        pipe.add(Stage("tree", self._generate_tree, deps=["rename"], inputs=[self.named_fasta],
+                       outputs=[self.newick_file, self.png_file], concurrent=False))
+        return pipe
+
+    def run(self) -> Tuple[Tuple[str, float], List[Tuple[str, bool, List[str]]]]:
+        """
+        Run the incremental pipeline, skipping stages whose inputs are unchanged.
+        Returns ((best_id, percent_identity), report) where report feeds `pipeline.explain`.
+        """
+        report = self.pipeline().run()
+        with open(self.results_csv, newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        best = (rows[0][0], float(rows[0][1])) if rows else ("Unknown", 0.0)
+        return best, report
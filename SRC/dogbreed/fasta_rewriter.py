@@ -0,0 +1,116 @@
+from __future__ import annotations
+# SRC/dogbreed/fasta_rewriter.py
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Union
+
+from Bio import SeqIO
+from Bio.SeqRecord import SeqRecord
+
+from dogbreed.io_utils import atomic_write, file_sha256
+from dogbreed.mapping_journal import MappingJournal
+
+PathLike = Union[str, Path]
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def mapping_sha256(mapping: Mapping[str, str]) -> str:
+    """Order-independent SHA-256 of an accession_id → breed mapping."""
+    payload = json.dumps(sorted(mapping.items()), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def manifest_path(out_path: PathLike) -> Path:
+    out_path = Path(out_path)
+    return out_path.with_name(out_path.name + MANIFEST_SUFFIX)
+
+
+def rename_records(
+    records: Iterable[SeqRecord],
+    mapping: Mapping[str, str],
+    fallback: str = "{accession}",
+    replace_spaces: bool = False,
+    description: bool = True,
+) -> Iterator[SeqRecord]:
+    """
+    Lazily replace record IDs with breed names.
+
+    - mapped IDs become their breed name
+    - unmapped IDs become `fallback` formatted with the accession
+    - `replace_spaces` turns spaces into underscores (tree-friendly labels)
+    - `description=False` writes the header with the ID only
+    """
+    for record in records:
+        acc_id = record.id
+        name = mapping.get(acc_id) or fallback.format(accession=acc_id)
+        if replace_spaces:
+            name = name.replace(" ", "_")
+        record.id = name
+        record.name = name
+        record.description = name if description else ""
+        yield record
+
+
+def _fingerprint(fasta_path: Path, mapping: Mapping[str, str], options: Dict[str, object]) -> Dict[str, object]:
+    return {
+        "input_sha256": file_sha256(fasta_path),
+        "mapping_sha256": mapping_sha256(mapping),
+        "options": options,
+    }
+
+
+def is_up_to_date(out_path: PathLike, fingerprint: Dict[str, object]) -> bool:
+    """True if `out_path` exists and its manifest records exactly `fingerprint`."""
+    out_path = Path(out_path)
+    try:
+        recorded = json.loads(manifest_path(out_path).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return False
+    return out_path.exists() and recorded == fingerprint
+
+
+def rewrite_fasta_ids(
+    fasta_path: PathLike,
+    mapping: Mapping[str, str],
+    out_path: PathLike,
+    fallback: str = "{accession}",
+    replace_spaces: bool = False,
+    description: bool = True,
+    force: bool = False,
+) -> Path:
+    """
+    Stream `fasta_path` to `out_path` with accession IDs replaced by breed names.
+
+    Records are written as they are read (constant memory). The output is only
+    regenerated when the input content, the mapping or the options changed, as
+    recorded in a sidecar manifest (`<out>.manifest.json`).
+    """
+    fasta_path = Path(fasta_path)
+    out_path = Path(out_path)
+    options = {"fallback": fallback, "replace_spaces": replace_spaces, "description": description}
+    fingerprint = _fingerprint(fasta_path, mapping, options)
+
+    if not force and is_up_to_date(out_path, fingerprint):
+        return out_path
+
+    with atomic_write(out_path) as out, open(fasta_path, "r", encoding="utf-8") as src:
+        renamed = rename_records(SeqIO.parse(src, "fasta"), mapping, fallback, replace_spaces, description)
+        SeqIO.write(renamed, out, "fasta")
+
+    manifest_path(out_path).write_text(json.dumps(fingerprint, indent=2), encoding="utf-8")
+    return out_path
+
+
+def load_mapping(map_path: Optional[PathLike]) -> Dict[str, str]:
+    """
+    Load accession_id → breed (CSV + pending journal); empty when no path is given.
+    A path that does not exist raises FileNotFoundError, so a mistyped map is not
+    silently treated as "nothing mapped".
+    """
+    if map_path is None:
+        return {}
+    if not Path(map_path).exists():
+        raise FileNotFoundError(f"Breed mapping not found: {map_path}")
+    return MappingJournal(map_path).read_merged()
@@ -1,7 +1,7 @@
 from pathlib import Path
 from typing import Union
-import csv
-from Bio import SeqIO
+
+from dogbreed.fasta_rewriter import load_mapping, rewrite_fasta_ids
 
 
 def generate_alignment_input(
@@ -19,26 +19,10 @@ def generate_alignment_input(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Load breed mapping (accession_id -> breed)
-    mapping = {}
-    with open(map_path, newline="") as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            mapping[row["accession_id"]] = row["breed"]
-
-    # Rewrite sequences with breed names (fallback to accession if missing)
-    records = []
-    for record in SeqIO.parse(fasta_path, "fasta"):
-        acc_id = record.id  # keep original accession ID
-        if acc_id in mapping:
-            record.id = mapping[acc_id]
-            record.description = mapping[acc_id]
-        else:
-            # fallback: accession ID
-            record.id = acc_id
-            record.description = acc_id
-        records.append(record)
+    mapping = load_mapping(map_path)
 
-    # Save new FASTA file
+    # Stream sequences with breed names (fallback to accession if missing);
+    # skipped when input and mapping are unchanged since the last run
     out_fasta = output_dir / "alignment_with_names.fa"
-    SeqIO.write(records, str(out_fasta), "fasta")
+    rewrite_fasta_ids(fasta_path, mapping, out_fasta)
     return str(out_fasta)
@@ -0,0 +1,151 @@
+from __future__ import annotations
+# SRC/dogbreed/identity_matrix.py
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from dogbreed.compare_sequences import RecordsLike, percent_identity
+from dogbreed.shared_refs import SharedReferenceStore, StoreHandle, set_worker_state, worker_state
+
+PathLike = Union[str, Path]
+Tile = Tuple[int, int]
+
+
+def _tiles(n: int, tile_size: int) -> List[Tile]:
+    """Upper-triangle tile coordinates (block_row <= block_col)."""
+    blocks = (n + tile_size - 1) // tile_size
+    return [(bi, bj) for bi in range(blocks) for bj in range(bi, blocks)]
+
+
+def _read_checkpoint(path: Path) -> Set[Tile]:
+    done: Set[Tile] = set()
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.endswith("\n") and "," in line:
+                    bi, bj = line.strip().split(",")
+                    done.add((int(bi), int(bj)))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _init_worker(handle: StoreHandle, tile_size: int) -> None:
+    set_worker_state(store=SharedReferenceStore.attach(handle), tile_size=tile_size)
+
+
+def _compute_tile(tile: Tile) -> Tuple[Tile, np.ndarray]:
+    state = worker_state()
+    return _tile_block(state["store"], state["tile_size"], tile)
+
+
+def _tile_block(store: SharedReferenceStore, size: int, tile: Tile) -> Tuple[Tile, np.ndarray]:
+    bi, bj = tile
+    rows = range(bi * size, min((bi + 1) * size, len(store)))
+    cols = range(bj * size, min((bj + 1) * size, len(store)))
+
+    # Decode each sequence once per tile and reuse it across the block
+    row_seqs = [store.sequence(i) for i in rows]
+    col_seqs = row_seqs if bi == bj else [store.sequence(j) for j in cols]
+
+    block = np.full((len(rows), len(cols)), np.nan, dtype=np.float32)
+    for a, i in enumerate(rows):
+        for b, j in enumerate(cols):
+            if i < j:  # upper triangle only; the diagonal is 100 by definition
+                block[a, b] = percent_identity(row_seqs[a], col_seqs[b])
+            elif i == j:
+                block[a, b] = 100.0
+    return tile, block
+
+
+def compute_identity_matrix(
+    records: RecordsLike,
+    out_path: PathLike,
+    tile_size: int = 32,
+    processes: Optional[int] = None,
+) -> Path:
+    """
+    All-vs-all percent identity matrix written to a memory-mapped `.npy`.
+
+    Only the upper triangle is computed, in tiles of `tile_size` x `tile_size`
+    pairs spread over a process pool (references are shared via shared memory).
+    Each finished tile is mirrored into the lower triangle, flushed, and logged to
+    `<out>.tiles`, so an interrupted run resumes where it stopped. Sequence IDs
+    (row/column order) are stored in `<out>.meta.json`.
+    """
+    out_path = Path(out_path)
+    meta_path = out_path.with_name(out_path.name + ".meta.json")
+    ckpt_path = out_path.with_name(out_path.name + ".tiles")
+
+    with SharedReferenceStore(records) as store:
+        n = len(store)
+        meta = {
+            "ids": store.ids,
+            "tile_size": tile_size,
+            "content_sha256": store.content_sha256(),
+        }
+
+        resume = False
+        if out_path.exists() and meta_path.exists():
+            try:
+                resume = json.loads(meta_path.read_text(encoding="utf-8")) == meta
+            except ValueError:
+                resume = False
+
+        if resume:
+            matrix = np.lib.format.open_memmap(out_path, mode="r+")
+            done = _read_checkpoint(ckpt_path)
+        else:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            matrix = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float32, shape=(n, n))
+            matrix[:] = np.nan
+            matrix.flush()
+            meta_path.write_text(json.dumps(meta), encoding="utf-8")
+            ckpt_path.write_text("", encoding="utf-8")
+            done = set()
+
+        todo = [t for t in _tiles(n, tile_size) if t not in done]
+
+        def store_tile(tile: Tile, block: np.ndarray, ckpt) -> None:
+            bi, bj = tile
+            i0, j0 = bi * tile_size, bj * tile_size
+            i1, j1 = i0 + block.shape[0], j0 + block.shape[1]
+            filled = ~np.isnan(block)
+            np.copyto(matrix[i0:i1, j0:j1], block, where=filled)
+            np.copyto(matrix[j0:j1, i0:i1], block.T, where=filled.T)  # mirror into the lower triangle
+            matrix.flush()
+            ckpt.write(f"{bi},{bj}\n")
+            ckpt.flush()
+            os.fsync(ckpt.fileno())
+
+        with open(ckpt_path, "a", encoding="utf-8") as ckpt:
+            if processes == 1:
+                for tile in todo:
+                    store_tile(*_tile_block(store, tile_size, tile), ckpt)
+            else:
+                workers = processes or os.cpu_count() or 1
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(store.handle, tile_size)) as pool:
+                    pending: Set[Future] = set()
+                    for tile in todo:
+                        pending.add(pool.submit(_compute_tile, tile))
+                        if len(pending) >= 2 * workers:
+                            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for fut in finished:
+                                store_tile(*fut.result(), ckpt)
+                    for fut in pending:
+                        store_tile(*fut.result(), ckpt)
+
+        del matrix
+    return out_path
+
+
+def load_identity_matrix(out_path: PathLike) -> Tuple[List[str], np.ndarray]:
+    """Return (ids, matrix) for a finished run; the matrix is memory-mapped read-only."""
+    out_path = Path(out_path)
+    meta = json.loads(out_path.with_name(out_path.name + ".meta.json").read_text(encoding="utf-8"))
+    return meta["ids"], np.load(out_path, mmap_mode="r")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+# SRC/dogbreed/identity_profile.py
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from dogbreed.compare_sequences import RecordsLike, _aligner, _iter_records, _norm, compare_sequences
+
+PathLike = Union[str, Path]
+Profile = Dict[str, np.ndarray]
+
+
+def alignment_arrays(query_seq: str, ref_seq: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Align once and return (match, gap) boolean arrays in reference coordinates.
+
+    `match[j]` is True where reference position j is aligned to an identical query
+    base; `gap[j]` is True where it faces a gap in the query. Query insertions have
+    no reference position and are not represented.
+    """
+    q, r = _norm(query_seq), _norm(ref_seq)
+    aln = _aligner.align(r, q)[0]
+    ref_codes = np.frombuffer(r.encode("ascii"), dtype=np.uint8)
+    query_codes = np.frombuffer(q.encode("ascii"), dtype=np.uint8)
+
+    match = np.zeros(len(r), dtype=bool)
+    gap = np.ones(len(r), dtype=bool)
+    for (r0, r1), (q0, q1) in zip(*aln.aligned):
+        match[r0:r1] = ref_codes[r0:r1] == query_codes[q0:q1]
+        gap[r0:r1] = False
+    return match, gap
+
+
+def window_profile(match: np.ndarray, gap: np.ndarray, window: int = 200, step: int = 50) -> Profile:
+    """
+    Per-window identity (%) and gap fraction via cumulative sums: O(L) whatever the window size.
+    Windows start every `step` bases; a sequence shorter than `window` gives one window.
+    """
+    n = len(match)
+    window = max(1, min(window, n))
+    starts = np.arange(0, n - window + 1, max(1, step))
+    cm = np.concatenate(([0], np.cumsum(match, dtype=np.int64)))
+    cg = np.concatenate(([0], np.cumsum(gap, dtype=np.int64)))
+    return {
+        "start": starts,
+        "identity": (cm[starts + window] - cm[starts]) / window * 100.0,
+        "gap_fraction": (cg[starts + window] - cg[starts]) / window,
+    }
+
+
+def identity_profile(query_seq: str, ref_seq: str, window: int = 200, step: int = 50) -> Profile:
+    match, gap = alignment_arrays(query_seq, ref_seq)
+    profile = window_profile(match, gap, window, step)
+    profile["match"], profile["gap"] = match, gap
+    return profile
+
+
+def top_hit_profiles(
+    query_seq: str,
+    records: RecordsLike,
+    top_k: int = 3,
+    window: int = 200,
+    step: int = 50,
+    ranked: Optional[Sequence[Tuple]] = None,
+) -> Dict[str, Profile]:
+    """
+    Profiles against the `top_k` best references (one alignment each).
+    Pass `ranked` (e.g. from `compare_sequences`) to reuse an existing ranking.
+    """
+    refs = dict(_iter_records(records))
+    if ranked is None:
+        ranked = compare_sequences(query_seq, refs)
+    return {row[0]: identity_profile(query_seq, refs[row[0]], window, step) for row in ranked[:top_k]}
+
+
+def plot_profiles(profiles: Mapping[str, Profile], png_path: PathLike, window: Optional[int] = None) -> Optional[str]:
+    """Line plot of window identity along the reference; returns the path, or None without matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    for name, profile in profiles.items():
+        ax.plot(profile["start"], profile["identity"], label=name)
+    ax.set_xlabel("Reference position" + (f" (window {window} bp)" if window else ""))
+    ax.set_ylabel("% identity")
+    ax.set_ylim(0, 100)
+    ax.legend(loc="lower left")
+    fig.savefig(png_path, bbox_inches="tight")
+    plt.close(fig)
+    return str(png_path)
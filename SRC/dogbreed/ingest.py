@@ -0,0 +1,181 @@
+from __future__ import annotations
+# SRC/dogbreed/ingest.py
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
+
+from Bio import SeqIO
+
+from dogbreed.compare_sequences import _norm
+from dogbreed.io_utils import atomic_write
+
+PathLike = Union[str, Path]
+
+FASTA_SUFFIXES = (".fa", ".fasta", ".fna", ".fas")
+STATE_SUFFIX = ".ingest.json"
+MAX_AMBIGUOUS = 0.5  # reject records that are mostly N
+
+# (accession, normalised sequence, content sha256)
+IngestRecord = Tuple[str, str, str]
+
+
+def state_path(out_path: PathLike) -> Path:
+    out_path = Path(out_path)
+    return out_path.with_name(out_path.name + STATE_SUFFIX)
+
+
+def scan_fasta_files(root: PathLike) -> Iterator[Path]:
+    """Yield FASTA files under `root` in sorted (deterministic) order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(FASTA_SUFFIXES) and not name.startswith("."):
+                yield Path(dirpath) / name
+
+
+def _stat_key(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def read_accession_file(path: PathLike) -> Tuple[List[IngestRecord], List[str]]:
+    """Parse, validate and normalise one file. Returns (records, problems)."""
+    records: List[IngestRecord] = []
+    problems: List[str] = []
+    try:
+        for rec in SeqIO.parse(str(path), "fasta"):
+            try:
+                seq = _norm(str(rec.seq))
+            except ValueError:
+                problems.append(f"{path}: {rec.id}: empty sequence")
+                continue
+            if seq.count("N") > MAX_AMBIGUOUS * len(seq):
+                problems.append(f"{path}: {rec.id}: more than {MAX_AMBIGUOUS:.0%} ambiguous bases")
+                continue
+            records.append((rec.id, seq, hashlib.sha256(seq.encode("ascii")).hexdigest()))
+    except (ValueError, UnicodeDecodeError) as exc:
+        problems.append(f"{path}: unreadable FASTA ({exc})")
+    if not records and not problems:
+        problems.append(f"{path}: no records")
+    return records, problems
+
+
+def _read_batch(paths: List[str]) -> List[Tuple[str, List[IngestRecord], List[str]]]:
+    return [(p, *read_accession_file(p)) for p in paths]
+
+
+def _breed_for(accession: str, mapping: Mapping[str, str], unversioned: Mapping[str, str]) -> Optional[str]:
+    """Exact accession first, then the accession without its version suffix (AY656744 ↔ AY656744.1)."""
+    return mapping.get(accession) or unversioned.get(accession.split(".", 1)[0])
+
+
+def ingest_directory(
+    src_dir: PathLike,
+    out_path: PathLike,
+    mapping: Optional[Mapping[str, str]] = None,
+    processes: Optional[int] = None,
+    batch_size: int = 64,
+) -> Dict[str, object]:
+    """
+    Consolidate a tree of per-accession FASTA files into one reference FASTA.
+
+    - files are parsed, validated and normalised in a process pool, in batches
+    - files whose (mtime, size) match the last ingest are not re-read; their
+      sequences come from the previous output via `SeqIO.index`, checked by hash
+    - duplicates are dropped by accession and by sequence content (first file wins)
+    - headers carry the breed from `mapping` (">accession breed")
+    - the output is written once, atomically, followed by `<out>.ingest.json`
+
+    Returns a summary with file and record counts and the list of problems.
+    """
+    src_dir, out_path = Path(src_dir), Path(out_path)
+    mapping = mapping or {}
+    unversioned = {acc.split(".", 1)[0]: breed for acc, breed in mapping.items()}
+    state_file = state_path(out_path)
+
+    try:
+        previous = json.loads(state_file.read_text(encoding="utf-8")) if out_path.exists() else {}
+    except ValueError:
+        previous = {}
+    prev_files: Dict[str, dict] = previous.get("files", {})
+
+    files = list(scan_fasta_files(src_dir))
+    stats = {str(p.relative_to(src_dir)): _stat_key(p) for p in files}
+    unchanged = [rel for rel, key in stats.items() if prev_files.get(rel, {}).get("stat") == key]
+
+    # Unchanged files: take their sequences from the previous output instead of re-reading them.
+    # A file is re-read anyway if one of its records is missing there (it was a duplicate last time).
+    reused: Dict[str, Tuple[List[IngestRecord], List[str]]] = {}
+    if unchanged:
+        prev_index = SeqIO.index(str(out_path), "fasta")
+        try:
+            for rel in unchanged:
+                recs: List[IngestRecord] = []
+                for acc, sha in prev_files[rel]["records"]:
+                    seq = str(prev_index[acc].seq) if acc in prev_index else None
+                    if seq is None or hashlib.sha256(seq.encode("ascii")).hexdigest() != sha:
+                        break
+                    recs.append((acc, seq, sha))
+                else:
+                    reused[rel] = (recs, prev_files[rel].get("problems", []))
+        finally:
+            prev_index.close()
+    changed = [str(src_dir / rel) for rel in stats if rel not in reused]
+
+    # Parse changed files in parallel; results are keyed by path and consumed in scan order
+    parsed: Dict[str, Tuple[List[IngestRecord], List[str]]] = {}
+    batches = [changed[i:i + batch_size] for i in range(0, len(changed), batch_size)]
+    if processes == 1 or len(batches) <= 1:
+        for batch in batches:
+            for p, recs, problems in _read_batch(batch):
+                parsed[p] = (recs, problems)
+    else:
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Set[Future] = set()
+            for batch in batches:
+                pending.add(pool.submit(_read_batch, batch))
+                if len(pending) >= 2 * workers:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        for p, recs, problems in fut.result():
+                            parsed[p] = (recs, problems)
+            for fut in pending:
+                for p, recs, problems in fut.result():
+                    parsed[p] = (recs, problems)
+
+    summary = {"files": len(files), "reused": len(reused), "parsed": len(changed), "records": 0,
+               "duplicate_accessions": 0, "duplicate_sequences": 0, "unlabelled": 0, "problems": []}
+    seen_acc: Set[str] = set()
+    seen_sha: Set[str] = set()
+    new_state: Dict[str, dict] = {}
+
+    with atomic_write(out_path) as out:
+        for rel in stats:
+            recs, problems = reused[rel] if rel in reused else parsed[str(src_dir / rel)]
+            summary["problems"].extend(problems)
+
+            for acc, seq, sha in recs:
+                if acc in seen_acc:
+                    summary["duplicate_accessions"] += 1
+                    continue
+                if sha in seen_sha:
+                    summary["duplicate_sequences"] += 1
+                    continue
+                seen_acc.add(acc)
+                seen_sha.add(sha)
+
+                breed = _breed_for(acc, mapping, unversioned)
+                if breed is None:
+                    summary["unlabelled"] += 1
+                out.write(f">{acc} {breed}\n{seq}\n" if breed else f">{acc}\n{seq}\n")
+                summary["records"] += 1
+
+            new_state[rel] = {"stat": stats[rel], "records": [[acc, sha] for acc, _, sha in recs],
+                              "problems": problems}
+
+    state_file.write_text(json.dumps({"files": new_state}), encoding="utf-8")
+    return summary
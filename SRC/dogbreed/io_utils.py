@@ -0,0 +1,67 @@
+from __future__ import annotations
+# SRC/dogbreed/io_utils.py
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, Union
+
+PathLike = Union[str, Path]
+
+_CHUNK = 1 << 20
+
+# Process umask, read once: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def file_sha256(path: PathLike) -> str:
+    """SHA-256 of a file's content, read in 1 MiB chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _final_mode(path: Path) -> int:
+    """Permissions for the replacement: those of the file being replaced, else 0666 minus the umask."""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def atomic_write(
+    path: PathLike,
+    mode: str = "w",
+    newline: Optional[str] = None,
+    encoding: str = "utf-8",
+    fsync: bool = False,
+) -> Iterator[IO]:
+    """
+    Open a temporary file next to `path` for writing and move it over `path` on success.
+
+    Readers see either the old file or the complete new one; on error the temporary
+    file is removed and `path` is untouched. The result keeps the permissions of the
+    file it replaces (new files get the usual umask default rather than mkstemp's 0600).
+    `fsync=True` flushes the data to disk before the swap.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    text = {} if "b" in mode else {"newline": newline, "encoding": encoding}
+    try:
+        with os.fdopen(fd, mode, **text) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp, _final_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,61 @@
+from __future__ import annotations
+# SRC/dogbreed/mapping_csv.py
+import csv
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from dogbreed.io_utils import atomic_write, file_sha256
+
+PathLike = Union[str, Path]
+UpdatesLike = Union[Mapping[str, str], Iterable[Tuple[str, str]]]
+
+FIELDNAMES = ["accession_id", "breed"]
+
+
+def csv_signature(csv_path: PathLike) -> Optional[str]:
+    """
+    Content hash of a CSV file, None if missing.
+    Hashing (rather than mtime + size) also catches same-size edits within one mtime tick.
+    """
+    try:
+        return file_sha256(csv_path)
+    except FileNotFoundError:
+        return None
+
+
+def iter_updates(updates: UpdatesLike) -> Iterator[Tuple[str, str]]:
+    """Yield (accession_id, breed) pairs from a dict or an iterable of pairs."""
+    items = updates.items() if isinstance(updates, Mapping) else updates
+    for acc, breed in items:
+        yield str(acc), str(breed)
+
+
+def parse_mapping_rows(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Parse (accession_id, breed) rows from mapping CSV text.
+    Accepts either a `breed` or `breed_name` column; rows without an ID are skipped.
+    """
+    for row in csv.DictReader(lines):
+        acc = row.get("accession_id")
+        breed = row.get("breed", row.get("breed_name"))
+        if acc and breed is not None:
+            yield acc, breed
+
+
+def read_mapping_rows(csv_path: PathLike) -> Iterator[Tuple[str, str]]:
+    """Stream (accession_id, breed) rows from a mapping CSV (see `parse_mapping_rows`)."""
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        yield from parse_mapping_rows(f)
+
+
+def write_mapping_csv(csv_path: PathLike, rows: Iterable[Tuple[str, str]]) -> Path:
+    """
+    Write (accession_id, breed) rows as an `accession_id,breed` CSV.
+    The file is replaced atomically so readers never see a half-written mapping.
+    """
+    csv_path = Path(csv_path)
+    with atomic_write(csv_path, newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        writer.writerows(rows)
+    return csv_path
@@ -0,0 +1,231 @@
+from __future__ import annotations
+# SRC/dogbreed/mapping_journal.py
+import csv
+import hashlib
+import io
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+
+from dogbreed.io_utils import atomic_write
+from dogbreed.mapping_csv import (UpdatesLike, csv_signature, iter_updates, parse_mapping_rows, read_mapping_rows,
+                                  write_mapping_csv)
+
+if TYPE_CHECKING:
+    from dogbreed.search_index import SearchIndex
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+PathLike = Union[str, Path]
+
+
+@contextmanager
+def file_lock(lock_path: PathLike, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an inter-process lock on `lock_path` (blocking): exclusive by default.
+    `shared=True` is for readers: it opens an existing lock file read-only and never
+    creates one (FileNotFoundError if no writer has ever locked it).
+    """
+    lock_path = Path(lock_path)
+    if not shared:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "rb" if shared else "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_RLCK if shared else msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# First journal line: content hash of the CSV the entries apply on top of
+_BASE_PREFIX = "# base "
+
+
+class MappingJournal:
+    """
+    Append-only update journal that sits next to a breed mapping CSV.
+
+    - workers `append` updates in O(1) under a short file lock (no read-modify-write)
+    - `compact` folds the journal into the canonical CSV and resets it; `apply_updates`
+      triggers it once the journal outgrows `compact_ratio` of the CSV, so a CSV
+      rewrite is amortised over many appends
+    - `read_merged` returns base + journal without taking the lock, so readers
+      never block writers (and never create files)
+
+    The journal starts with the hash of the CSV it extends. A reader that pairs a
+    CSV with a journal from another generation (a compaction in progress, or a
+    hand-edited CSV) sees the mismatch and re-reads under the lock.
+    """
+
+    def __init__(self, csv_path: PathLike, compact_ratio: float = 0.25):
+        self.csv_path = Path(csv_path)
+        self.journal_path = self.csv_path.with_name(self.csv_path.name + ".journal")
+        self.lock_path = self.csv_path.with_name(self.csv_path.name + ".lock")
+        self.compact_ratio = compact_ratio
+
+    def append(self, updates: UpdatesLike, index: Optional["SearchIndex"] = None) -> int:
+        """
+        Append accession_id → breed updates to the journal. Returns the number written.
+        A live `index` is relabelled while the lock is held, after the journal write.
+        """
+        rows = list(iter_updates(updates))
+        if not rows:
+            return 0
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+
+        # One write per batch; the lock keeps batches from interleaving
+        with file_lock(self.lock_path):
+            header = ""
+            if not self.journal_path.exists():
+                # Only a brand-new journal hashes the CSV; compaction leaves a fresh one behind
+                header = f"{_BASE_PREFIX}{csv_signature(self.csv_path) or ''}\n"
+            with open(self.journal_path, "a", newline="", encoding="utf-8") as f:
+                f.write(header + buf.getvalue())
+                f.flush()
+                os.fsync(f.fileno())
+            if index is not None:
+                index.relabel_many(rows)
+        return len(rows)
+
+    def _read(self) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+        """
+        (base, entries): the CSV hash the journal extends (None if unknown) and its
+        entries in append order. A trailing line without a newline is a write in
+        progress and is ignored.
+        """
+        try:
+            with open(self.journal_path, newline="", encoding="utf-8") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None, []
+
+        complete = data[: data.rfind("\n") + 1]
+        base = None
+        if complete.startswith(_BASE_PREFIX):
+            header, _, complete = complete.partition("\n")
+            base = header[len(_BASE_PREFIX):]
+        return base, [(row[0], row[1]) for row in csv.reader(io.StringIO(complete)) if len(row) >= 2]
+
+    def pending(self) -> List[Tuple[str, str]]:
+        """Journal entries not yet folded into the CSV, in append order."""
+        return self._read()[1]
+
+    def _read_pair(self) -> Tuple[Dict[str, str], List[Tuple[str, str]], bool]:
+        """Read the CSV, then the journal: (mapping, entries, whether the journal extends this CSV)."""
+        try:
+            with open(self.csv_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            mapping, signature = {}, ""
+        else:
+            mapping = dict(parse_mapping_rows(io.StringIO(raw.decode("utf-8"), newline="")))
+            signature = hashlib.sha256(raw).hexdigest()
+        base, entries = self._read()
+        return mapping, entries, base == signature or (base is None and not entries)
+
+    def read_merged(self) -> Dict[str, str]:
+        """
+        Return the canonical mapping with pending journal entries applied on top.
+        If the CSV and journal are from different generations (a compaction replaced
+        one of them mid-read, or the CSV was edited by hand), re-read under a shared lock.
+        """
+        mapping, entries, consistent = self._read_pair()
+        if not consistent:
+            try:
+                with file_lock(self.lock_path, shared=True):
+                    mapping, entries, _ = self._read_pair()
+            except FileNotFoundError:
+                pass  # no writer has ever locked this CSV, so no compaction is in flight
+        mapping.update(entries)
+        return mapping
+
+    def needs_compaction(self) -> bool:
+        """
+        True once the journal entries outgrow `compact_ratio` of the CSV (or the CSV is missing).
+        The `# base` header is not counted, so small CSVs still batch several updates.
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                first = f.readline()
+                journal = os.fstat(f.fileno()).st_size
+        except FileNotFoundError:
+            return False
+        if first.startswith(_BASE_PREFIX.encode("ascii")):
+            journal -= len(first)
+        if not journal:
+            return False
+        try:
+            base = self.csv_path.stat().st_size
+        except FileNotFoundError:
+            return True
+        return journal > self.compact_ratio * base
+
+    def compact(self, updates: Optional[UpdatesLike] = None, index: Optional["SearchIndex"] = None) -> int:
+        """
+        Fold the journal, then `updates` if given, into the canonical CSV and reset the journal.
+        Later entries win, so `updates` override older journal values for the same ID.
+        With `index`, the same entries are relabelled in the search index while the lock is
+        held, after the CSV is written, so the two never disagree.
+        Returns the number of entries applied.
+        """
+        with file_lock(self.lock_path):
+            entries = self.pending()
+            if updates is not None:
+                entries.extend(iter_updates(updates))
+            if not entries and self.csv_path.exists():
+                return 0
+
+            # Later rows win; existing IDs keep their place, new ones are appended
+            mapping = dict(read_mapping_rows(self.csv_path)) if self.csv_path.exists() else {}
+            mapping.update(entries)
+            write_mapping_csv(self.csv_path, mapping.items())
+            if index is not None:
+                index.relabel_many(entries)
+
+            # A fresh journal names the new CSV as its base; until it is swapped in,
+            # readers pairing the new CSV with the old journal fall back to the lock
+            self._reset(csv_signature(self.csv_path) or "")
+            return len(entries)
+
+    def _reset(self, signature: str) -> None:
+        with atomic_write(self.journal_path, newline="", fsync=True) as f:
+            f.write(f"{_BASE_PREFIX}{signature}\n")
+
+
+def apply_updates(
+    csv_path: PathLike,
+    updates: UpdatesLike,
+    index: Optional["SearchIndex"] = None,
+    write_through: bool = False,
+) -> None:
+    """
+    Apply a batch of accession_id → breed updates to a mapping CSV.
+    Existing IDs are overwritten, new IDs are appended, duplicates never accumulate.
+
+    Updates are appended to the journal under its lock, so concurrent updaters never
+    drop each other's rows and a single update costs O(batch), not O(rows). The CSV is
+    compacted once the journal outgrows `MappingJournal.compact_ratio` of it, or right
+    away with `write_through=True`. A live `search_index.SearchIndex` passed as `index`
+    is relabelled in the same step.
+    """
+    journal = MappingJournal(csv_path)
+    if write_through:
+        journal.compact(updates, index=index)
+        return
+    journal.append(updates, index=index)
+    if journal.needs_compaction():
+        journal.compact()
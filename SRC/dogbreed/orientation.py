@@ -0,0 +1,73 @@
+from __future__ import annotations
+# SRC/dogbreed/orientation.py
+from pathlib import Path
+from typing import Dict, Set, Tuple, Union
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm
+from dogbreed.io_utils import file_sha256
+from dogbreed.sequence_utils import reverse_complement
+
+PathLike = Union[str, Path]
+
+FORWARD = "+"
+REVERSE = "-"
+
+# (resolved FASTA path, k) → (content hash, index), rebuilt when the file content changes;
+# least recently used first, so a long-running process keeps only a few indexes
+_PATH_INDEXES: Dict[Tuple[str, int], Tuple[str, "OrientationIndex"]] = {}
+_MAX_PATH_INDEXES = 4
+
+
+class OrientationIndex:
+    """
+    Set of forward-strand reference k-mers used to vote on a query's strand.
+
+    A query shares many k-mers with the references on its true strand and almost
+    none on the other, so counting hits for the query and its reverse complement
+    decides the orientation without aligning both.
+    """
+
+    def __init__(self, records: RecordsLike, k: int = 15):
+        self.k = k
+        self._kmers: Set[str] = set()
+        for _, seq in _iter_records(records):
+            s = _norm(seq)
+            self._kmers.update(s[i:i + k] for i in range(len(s) - k + 1))
+
+    @classmethod
+    def for_path(cls, fasta_path: PathLike, k: int = 15) -> "OrientationIndex":
+        """Index of a reference FASTA, built once per file content and reused across queries."""
+        key = (str(Path(fasta_path).resolve()), k)
+        sha = file_sha256(fasta_path)
+        cached = _PATH_INDEXES.pop(key, None)
+        if cached is None or cached[0] != sha:
+            cached = (sha, cls(str(fasta_path), k=k))
+            if len(_PATH_INDEXES) >= _MAX_PATH_INDEXES:
+                _PATH_INDEXES.pop(next(iter(_PATH_INDEXES)))  # least recently used
+        _PATH_INDEXES[key] = cached  # (re)insert as most recently used
+        return cached[1]
+
+    def _hits(self, seq: str) -> int:
+        k = self.k
+        return sum(1 for i in range(len(seq) - k + 1) if seq[i:i + k] in self._kmers)
+
+    def votes(self, query_seq: str) -> Tuple[int, int]:
+        """Return (forward_hits, reverse_complement_hits)."""
+        q = _norm(query_seq)
+        return self._hits(q), self._hits(reverse_complement(q))
+
+    def orient(self, query_seq: str) -> Tuple[str, str]:
+        """
+        Return (sequence, strand) with the query flipped only when the reverse
+        complement wins the vote; ties (including queries shorter than k) keep "+".
+        """
+        q = _norm(query_seq)
+        fwd, rev = self._hits(q), self._hits(reverse_complement(q))
+        if rev > fwd:
+            return reverse_complement(q), REVERSE
+        return q, FORWARD
+
+
+def detect_orientation(query_seq: str, records: RecordsLike, k: int = 15) -> str:
+    """Convenience wrapper: "+" or "-" for a single query."""
+    return OrientationIndex(records, k=k).orient(query_seq)[1]
@@ -0,0 +1,194 @@
+from __future__ import annotations
+# SRC/dogbreed/pipeline.py
+import hashlib
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from dogbreed.io_utils import file_sha256
+
+PathLike = Union[str, Path]
+
+
+class Stage:
+    """
+    One step of the build graph.
+
+    - `inputs` / `outputs`: files the stage reads / writes
+    - `deps`: names of stages that must finish first
+    - `params`: JSON-serialisable settings that are part of the fingerprint
+    - `concurrent=False` keeps the stage on the calling thread (e.g. matplotlib rendering)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        action: Callable[[], object],
+        inputs: Sequence[PathLike] = (),
+        outputs: Sequence[PathLike] = (),
+        deps: Sequence[str] = (),
+        params: Optional[Dict[str, object]] = None,
+        concurrent: bool = True,
+    ):
+        self.name = name
+        self.action = action
+        self.inputs = [Path(p) for p in inputs]
+        self.outputs = [Path(p) for p in outputs]
+        self.deps = list(deps)
+        self.params = params or {}
+        self.concurrent = concurrent
+
+
+def _hash_or_missing(path: Path) -> str:
+    return file_sha256(path) if path.exists() else "missing"
+
+
+def _fingerprint(stage: Stage) -> Dict[str, object]:
+    return {
+        "inputs": {str(p): _hash_or_missing(p) for p in stage.inputs},
+        "params": hashlib.sha256(json.dumps(stage.params, sort_keys=True, default=str).encode()).hexdigest(),
+    }
+
+
+class Pipeline:
+    """
+    Small incremental build graph.
+
+    Each stage is skipped when its content fingerprint (input hashes + params) and
+    its outputs are unchanged since the last successful run; otherwise it re-runs and
+    the reasons are recorded. Stages whose dependencies are met run concurrently.
+    State lives in a JSON file (default `<out_dir>/.pipeline_state.json`).
+    """
+
+    def __init__(self, state_path: PathLike, max_workers: int = 4):
+        self.state_path = Path(state_path)
+        self.max_workers = max_workers
+        self.stages: Dict[str, Stage] = {}
+        self._lock = threading.Lock()
+        try:
+            self._state: Dict[str, Dict[str, object]] = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            self._state = {}
+
+    def add(self, stage: Stage) -> Stage:
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage name: {stage.name}")
+        self.stages[stage.name] = stage
+        return stage
+
+    # ---------------------------
+    # Staleness
+    # ---------------------------
+
+    def why_stale(self, stage: Stage) -> List[str]:
+        """Return the reasons `stage` must run (empty list → up to date)."""
+        recorded = self._state.get(stage.name)
+        if not recorded:
+            return ["never run"]
+
+        reasons: List[str] = []
+        current = _fingerprint(stage)
+        old_inputs = recorded["fingerprint"]["inputs"]
+        for path, digest in current["inputs"].items():
+            if path not in old_inputs:
+                reasons.append(f"new input: {path}")
+            elif old_inputs[path] != digest:
+                reasons.append(f"input changed: {path}")
+        if current["params"] != recorded["fingerprint"]["params"]:
+            reasons.append("params changed")
+
+        old_outputs = recorded.get("outputs", {})
+        for out in stage.outputs:
+            if not out.exists():
+                reasons.append(f"output missing: {out}")
+            elif old_outputs.get(str(out)) != file_sha256(out):
+                reasons.append(f"output modified: {out}")
+        return reasons
+
+    def _record(self, stage: Stage) -> None:
+        entry = {
+            "fingerprint": _fingerprint(stage),
+            "outputs": {str(p): _hash_or_missing(p) for p in stage.outputs},
+        }
+        with self._lock:
+            self._state[stage.name] = entry
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            self.state_path.write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+
+    # ---------------------------
+    # Execution
+    # ---------------------------
+
+    def _closure(self, targets: Optional[Iterable[str]]) -> Set[str]:
+        """Names of `targets` plus everything they depend on."""
+        todo = list(targets) if targets is not None else list(self.stages)
+        needed: Set[str] = set()
+        while todo:
+            name = todo.pop()
+            if name not in self.stages:
+                raise KeyError(f"Unknown stage: {name}")
+            if name not in needed:
+                needed.add(name)
+                todo.extend(self.stages[name].deps)
+        return needed
+
+    def _execute(self, stage: Stage) -> Tuple[bool, List[str]]:
+        reasons = self.why_stale(stage)
+        if not reasons:
+            return False, []
+        stage.action()
+        self._record(stage)
+        return True, reasons
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> List[Tuple[str, bool, List[str]]]:
+        """
+        Run `targets` (default: all stages) and their dependencies.
+        Returns [(stage_name, ran, reasons), ...] in completion order.
+        """
+        pending = self._closure(targets)
+        done: Set[str] = set()
+        report: List[Tuple[str, bool, List[str]]] = []
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                ready = sorted(n for n in pending if all(d in done for d in self.stages[n].deps))
+                if not ready and not running:
+                    raise RuntimeError(f"Dependency cycle among stages: {sorted(pending)}")
+
+                inline: List[str] = []
+                for name in ready:
+                    pending.discard(name)
+                    if self.stages[name].concurrent:
+                        running[pool.submit(self._execute, self.stages[name])] = name
+                    else:
+                        inline.append(name)
+
+                # Main-thread stages run while pool stages are in flight
+                for name in inline:
+                    ran, reasons = self._execute(self.stages[name])
+                    report.append((name, ran, reasons))
+                    done.add(name)
+                if inline:
+                    continue
+
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = running.pop(fut)
+                    ran, reasons = fut.result()
+                    report.append((name, ran, reasons))
+                    done.add(name)
+        return report
+
+
+def explain(report: Iterable[Tuple[str, bool, List[str]]]) -> List[str]:
+    """Human-readable lines for a `Pipeline.run` report."""
+    lines = []
+    for name, ran, reasons in report:
+        if ran:
+            lines.append(f"{name}: re-ran ({'; '.join(reasons)})")
+        else:
+            lines.append(f"{name}: up to date, skipped")
+    return lines
@@ -0,0 +1,176 @@
+from __future__ import annotations
+# SRC/dogbreed/planner.py
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm
+
+logger = logging.getLogger(__name__)
+
+HAMMING = "hamming"
+BANDED = "banded"
+FULL = "full"
+
+
+def _encode(seq: str) -> np.ndarray:
+    return np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+
+
+# ---------------------------
+# Engines — one objective, LCS identity: matched bases / max(len) * 100.
+# Full DP computes it exactly, banded DP exactly when the optimal path stays inside the
+# band (a lower bound otherwise), and Hamming is its ungapped lower bound.
+# ---------------------------
+
+def hamming_identity(a: str, b: str) -> float:
+    """Ungapped position-by-position identity (equal-length pairs)."""
+    n = max(len(a), len(b))
+    if not n:
+        return 0.0
+    m = min(len(a), len(b))
+    return float((_encode(a[:m]) == _encode(b[:m])).sum()) / n * 100.0
+
+
+def banded_identity(a: str, b: str, band: int) -> float:
+    """
+    LCS-style identity restricted to a diagonal band of half-width `band`.
+
+    One array holds the DP row and only the band slice is updated per row:
+    the diagonal/vertical moves are a vectorised maximum, and the horizontal move
+    is a running `np.maximum.accumulate`. Cells left of the band keep values from
+    earlier rows, which are valid lower bounds, so the result never overestimates.
+    """
+    A, B = _encode(a), _encode(b)
+    n, m = len(A), len(B)
+    if not n or not m:
+        return 0.0
+    row = np.zeros(m + 1, dtype=np.int32)
+    for i in range(1, n + 1):
+        centre = (i * m) // n
+        lo, hi = max(1, centre - band), min(m, centre + band)
+        if lo > hi:
+            continue
+        step = np.maximum(row[lo:hi + 1], row[lo - 1:hi] + (B[lo - 1:hi] == A[i - 1]))
+        step[0] = max(step[0], row[lo - 1])
+        row[lo:hi + 1] = np.maximum.accumulate(step)
+        if hi < m:
+            # Carry the band's right edge forward so later rows see a consistent lower bound
+            row[hi + 1:hi + 2] = np.maximum(row[hi + 1:hi + 2], row[hi])
+    return float(row[m]) / max(n, m) * 100.0
+
+
+def full_identity(a: str, b: str) -> float:
+    """Unbanded LCS identity: the banded DP with a band covering every cell (scores only, no traceback)."""
+    return banded_identity(a, b, band=max(len(a), len(b)))
+
+
+# ---------------------------
+# Planning
+# ---------------------------
+
+class Plan:
+    """One planner decision: chosen engine, band (for banded DP), the features it saw and why."""
+
+    def __init__(self, engine: str, features: Dict[str, float], reason: str, band: int = 0):
+        self.engine = engine
+        self.features = features
+        self.reason = reason
+        self.band = band
+
+    def __repr__(self) -> str:
+        return f"Plan({self.engine!r}, band={self.band}, reason={self.reason!r})"
+
+
+class QueryPlanner:
+    """
+    Picks the cheapest engine that is still correct for a pair.
+
+    Features:
+    - `length_ratio`: shorter / longer length
+    - `kmer_identity`: identity estimated from shared k-mers (containment^(1/k))
+    - `diagonal_spread`: spread of the diagonals that shared k-mers sit on, a proxy
+      for the indel load (0 means every shared k-mer is on the main diagonal)
+
+    Rules, in order:
+    - equal lengths, no spread and high estimated identity → ungapped Hamming
+    - spread + length difference fits within `max_band` → banded DP with that band
+    - otherwise → full DP
+    """
+
+    def __init__(self, k: int = 11, hamming_min: float = 97.0, banded_min: float = 80.0,
+                 max_band: int = 256, pad: int = 8):
+        self.k = k
+        self.hamming_min = hamming_min
+        self.banded_min = banded_min
+        self.max_band = max_band
+        self.pad = pad
+
+    def features(self, a: str, b: str) -> Dict[str, float]:
+        k = self.k
+        pos_b: Dict[str, int] = {}
+        for j in range(len(b) - k + 1):
+            pos_b.setdefault(b[j:j + k], j)
+        diagonals: List[int] = []
+        total = 0
+        for i in range(len(a) - k + 1):
+            total += 1
+            j = pos_b.get(a[i:i + k])
+            if j is not None:
+                diagonals.append(j - i)
+        shared = len(diagonals) / total if total else 0.0
+        spread = 0
+        if diagonals:
+            lo, hi = np.percentile(diagonals, [5, 95])
+            spread = int(hi - lo)
+        return {
+            "length_ratio": min(len(a), len(b)) / max(len(a), len(b), 1),
+            "kmer_identity": shared ** (1 / k) * 100.0,
+            "diagonal_spread": spread,
+            "length_diff": abs(len(a) - len(b)),
+        }
+
+    def plan(self, a: str, b: str) -> Plan:
+        f = self.features(a, b)
+        if f["length_diff"] == 0 and f["diagonal_spread"] == 0 and f["kmer_identity"] >= self.hamming_min:
+            return Plan(HAMMING, f, "equal length, no indel signal, near-identical")
+        band = int(f["length_diff"] + f["diagonal_spread"]) + self.pad
+        if f["kmer_identity"] >= self.banded_min and band <= self.max_band:
+            return Plan(BANDED, f, f"low divergence, indels fit a band of {band}", band=band)
+        if f["kmer_identity"] < self.banded_min:
+            return Plan(FULL, f, "divergent pair")
+        return Plan(FULL, f, f"indel load needs a band of {band} > {self.max_band}")
+
+    def score(self, a: str, b: str, audit: Optional[List[Plan]] = None) -> Tuple[float, Plan]:
+        """Plan and run one pair. Every decision is logged (and appended to `audit` if given)."""
+        a, b = _norm(a), _norm(b)
+        plan = self.plan(a, b)
+        logger.info("planner: %s (%s) features=%s", plan.engine, plan.reason, plan.features)
+        if audit is not None:
+            audit.append(plan)
+
+        if plan.engine == HAMMING:
+            return hamming_identity(a, b), plan
+        if plan.engine == BANDED:
+            return banded_identity(a, b, plan.band), plan
+        return full_identity(a, b), plan
+
+
+def compare_planned(
+    query_seq: str,
+    records: RecordsLike,
+    planner: Optional[QueryPlanner] = None,
+    audit: Optional[List[Tuple[str, Plan]]] = None,
+) -> List[Tuple[str, float]]:
+    """Rank references with a per-pair engine choice; `audit` collects (id, Plan) for each pair."""
+    planner = planner or QueryPlanner()
+    scores: List[Tuple[str, float]] = []
+    for rec_id, seq in _iter_records(records):
+        plans: List[Plan] = []
+        pid, _ = planner.score(query_seq, seq, audit=plans)
+        if audit is not None:
+            audit.append((rec_id, plans[0]))
+        scores.append((rec_id, round(pid, 2)))
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
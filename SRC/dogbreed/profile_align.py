@@ -0,0 +1,200 @@
+from __future__ import annotations
+# SRC/dogbreed/profile_align.py
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+from Bio import SeqIO
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm
+from dogbreed.io_utils import atomic_write, file_sha256
+
+PathLike = Union[str, Path]
+
+PROFILE_SUFFIX = ".profile.npz"
+
+# Query bases → profile rows; anything ambiguous uses row 4 (mean of A/C/G/T)
+_ROW = np.full(256, 4, dtype=np.intp)
+for _i, _b in enumerate(b"ACGT"):
+    _ROW[_b] = _i
+
+_DIAG, _UP, _LEFT = 0, 1, 2
+
+
+def profile_path(aln_path: PathLike) -> Path:
+    aln_path = Path(aln_path)
+    return aln_path.with_name(aln_path.name + PROFILE_SUFFIX)
+
+
+class ColumnProfile:
+    """
+    Per-column base frequencies of an existing multiple alignment.
+
+    `freqs` is (5, L): rows A, C, G, T hold the fraction of sequences with that base
+    in each column and row 4 their mean (the score of an ambiguous query base);
+    `gap` is the fraction of gaps per column.
+    """
+
+    def __init__(self, freqs: np.ndarray, gap: np.ndarray, n_seqs: int, source_sha256: str = ""):
+        self.freqs = freqs
+        self.gap = gap
+        self.n_seqs = n_seqs
+        self.source_sha256 = source_sha256
+
+    def __len__(self) -> int:
+        return self.freqs.shape[1]
+
+    @classmethod
+    def from_alignment(cls, aln_path: PathLike) -> "ColumnProfile":
+        counts = None
+        gaps = None
+        n = 0
+        for rec in SeqIO.parse(str(aln_path), "fasta"):
+            row = np.frombuffer(str(rec.seq).upper().encode("ascii"), dtype=np.uint8)
+            if counts is None:
+                counts = np.zeros((4, len(row)), dtype=np.int64)
+                gaps = np.zeros(len(row), dtype=np.int64)
+            elif len(row) != counts.shape[1]:
+                raise ValueError(f"{rec.id}: aligned length {len(row)} != {counts.shape[1]}")
+            for i, base in enumerate(b"ACGT"):
+                counts[i] += row == base
+            gaps += row == ord("-")
+            n += 1
+        if counts is None:
+            raise ValueError(f"No sequences in alignment {aln_path}")
+
+        freqs = np.empty((5, counts.shape[1]), dtype=np.float64)
+        freqs[:4] = counts / n
+        freqs[4] = freqs[:4].mean(axis=0)
+        return cls(freqs, gaps / n, n, file_sha256(aln_path))
+
+    def save(self, path: PathLike) -> Path:
+        """Write the profile atomically, so a concurrent `load_profile` never sees a partial file."""
+        path = Path(path)
+        with atomic_write(path, "wb") as f:
+            np.savez_compressed(f, freqs=self.freqs, gap=self.gap, n_seqs=np.array(self.n_seqs),
+                                source_sha256=np.array(self.source_sha256))
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> "ColumnProfile":
+        with np.load(path) as data:
+            return cls(data["freqs"], data["gap"], int(data["n_seqs"]), str(data["source_sha256"]))
+
+
+def load_profile(aln_path: PathLike) -> ColumnProfile:
+    """Profile of `aln_path`, reusing `<aln>.profile.npz` while the alignment content is unchanged."""
+    cache = profile_path(aln_path)
+    if cache.exists():
+        try:
+            profile = ColumnProfile.load(cache)
+            if profile.source_sha256 == file_sha256(aln_path):
+                return profile
+        except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            pass  # unreadable cache: rebuild it
+    profile = ColumnProfile.from_alignment(aln_path)
+    profile.save(cache)
+    return profile
+
+
+def align_to_profile(seq: str, profile: ColumnProfile, gap: float = 0.5) -> Tuple[str, Dict[int, str]]:
+    """
+    Global alignment of one sequence to a column profile with linear gaps, O(len(seq) · L).
+
+    Scores: a base scores its frequency in the column; a query insertion costs `gap`;
+    skipping a column costs `gap` scaled by how rarely that column is gapped.
+    Rows are filled with NumPy: diagonal/vertical moves are one vector max, and the
+    horizontal (skip-column) chain is `np.maximum.accumulate` over prefix-summed costs.
+    Directions are kept as a uint8 matrix for the traceback.
+
+    Returns (row, insertions): `row` has one character per profile column (base or
+    '-'), and `insertions[b]` holds query bases that go before column b (b == L: at the end).
+    """
+    q = _norm(seq)
+    rows = _ROW[np.frombuffer(q.encode("ascii"), dtype=np.uint8)]
+    m, L = len(q), len(profile)
+
+    skip = gap * (1.0 - profile.gap)                  # cost of a gap in the query at column j
+    D = np.concatenate(([0.0], np.cumsum(skip)))      # D[j] = total skip cost of columns < j
+    H = -D.copy()                                      # row 0: query starts with skipped columns
+    trace = np.empty((m + 1, L + 1), dtype=np.uint8)
+    trace[0, :] = _LEFT
+
+    for i in range(1, m + 1):
+        diag = H[:-1] + profile.freqs[rows[i - 1]]
+        up = H[1:] - gap
+        step = np.empty(L + 1)
+        step[0] = H[0] - gap
+        step[1:] = np.maximum(diag, up)
+        best = np.maximum.accumulate(step + D) - D
+        trace[i, 0] = _UP
+        trace[i, 1:] = np.where(diag >= up, _DIAG, _UP)
+        trace[i, best > step + 1e-9] = _LEFT  # tolerance: the prefix-sum round trip is not exact
+        H = best
+
+    # Traceback from the bottom-right corner
+    row: List[str] = ["-"] * L
+    insertions: Dict[int, List[str]] = {}
+    i, j = m, L
+    while i > 0 or j > 0:
+        move = trace[i, j]
+        if move == _DIAG:
+            row[j - 1] = q[i - 1]
+            i, j = i - 1, j - 1
+        elif move == _UP:
+            insertions.setdefault(j, []).append(q[i - 1])
+            i -= 1
+        else:
+            j -= 1
+    return "".join(row), {b: "".join(reversed(chars)) for b, chars in insertions.items()}
+
+
+def _expand(row: str, widths: Dict[int, int], inserted: Dict[int, str]) -> str:
+    """Re-insert gap columns: `widths[b]` new columns before column b, filled from `inserted[b]`."""
+    parts: List[str] = []
+    for b in range(len(row) + 1):
+        width = widths.get(b, 0)
+        if width:
+            chars = inserted.get(b, "")
+            parts.append(chars + "-" * (width - len(chars)))
+        if b < len(row):
+            parts.append(row[b])
+    return "".join(parts)
+
+
+def add_to_alignment(
+    aln_path: PathLike,
+    records: RecordsLike,
+    out_path: PathLike,
+    gap: float = 0.5,
+) -> Path:
+    """
+    Add new sequences to an existing aligned FASTA without realigning the references.
+
+    Each new sequence is aligned to the (cached) column profile. Insertions relative
+    to the profile become new gap columns in every existing row; several new
+    sequences inserting at the same spot share those columns. Empty records are
+    skipped. The extended alignment is written atomically to `out_path`, ready for
+    `generate_phylogenetic_tree.generate_tree`.
+    """
+    profile = load_profile(aln_path)
+    added: List[Tuple[str, str, Dict[int, str]]] = []
+    for rec_id, seq in _iter_records(records):
+        if not (seq or "").strip():
+            continue
+        row, inserted = align_to_profile(seq, profile, gap)
+        added.append((rec_id, row, inserted))
+
+    widths: Dict[int, int] = {}
+    for _, _, inserted in added:
+        for b, chars in inserted.items():
+            widths[b] = max(widths.get(b, 0), len(chars))
+
+    out_path = Path(out_path)
+    with atomic_write(out_path) as out:
+        for rec in SeqIO.parse(str(aln_path), "fasta"):
+            out.write(f">{rec.description}\n{_expand(str(rec.seq), widths, {})}\n")
+        for rec_id, row, inserted in added:
+            out.write(f">{rec_id}\n{_expand(row, widths, inserted)}\n")
+    return out_path
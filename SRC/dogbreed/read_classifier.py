@@ -0,0 +1,204 @@
+from __future__ import annotations
+# SRC/dogbreed/read_classifier.py
+import gzip
+import os
+import re
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from Bio import Phylo
+from Bio.SeqIO.QualityIO import FastqGeneralIterator
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm
+from dogbreed.sequence_utils import reverse_complement
+from dogbreed.shared_refs import set_worker_state, worker_state
+
+PathLike = Union[str, Path]
+
+UNCLASSIFIED = "unclassified"
+_ACGT_RUNS = re.compile(r"[ACGT]+")
+
+
+def _canonical_kmers(seq: str, k: int) -> Iterator[str]:
+    """Yield canonical k-mers (min of forward / reverse complement), skipping ambiguous bases."""
+    for run in _ACGT_RUNS.findall(seq):
+        rc = reverse_complement(run)
+        n = len(run)
+        for i in range(n - k + 1):
+            fwd = run[i:i + k]
+            rev = rc[n - i - k:n - i]
+            yield fwd if fwd <= rev else rev
+
+
+class KmerIndex:
+    """
+    Canonical k-mer → reference bitmask index.
+
+    Each k-mer maps to an int whose set bits are the reference indices containing it,
+    which keeps the index small when most k-mers are shared across breeds.
+    """
+
+    def __init__(self, records: RecordsLike, k: int = 21):
+        self.k = k
+        self.labels: List[str] = []
+        self.kmers: Dict[str, int] = {}
+        for i, (rec_id, seq) in enumerate(_iter_records(records)):
+            self.labels.append(rec_id)
+            bit = 1 << i
+            for kmer in set(_canonical_kmers(_norm(seq), k)):
+                self.kmers[kmer] = self.kmers.get(kmer, 0) | bit
+
+    def hits(self, read: str) -> Counter:
+        """Count k-mer hits per reference index for one read."""
+        counts: Counter = Counter()
+        for kmer in _canonical_kmers(read, self.k):
+            mask = self.kmers.get(kmer)
+            while mask:
+                low = mask & -mask
+                counts[low.bit_length() - 1] += 1
+                mask ^= low
+        return counts
+
+
+class CladeResolver:
+    """
+    Lowest-common-clade lookup over a breed tree.
+    Stores each leaf's root→leaf path of clade labels, so it pickles cheaply to workers.
+    """
+
+    def __init__(self, newick_path: Optional[PathLike] = None):
+        self.paths: Dict[str, List[str]] = {}
+        if newick_path is None:
+            return
+        tree = Phylo.read(str(newick_path), "newick")
+        for leaf in tree.get_terminals():
+            path = tree.get_path(leaf) or [leaf]
+            self.paths[leaf.name] = ["root"] + [self._label(clade) for clade in path]
+
+    @staticmethod
+    def _label(clade) -> str:
+        if clade.is_terminal():
+            return clade.name
+        return "(" + ",".join(sorted(t.name for t in clade.get_terminals())) + ")"
+
+    def resolve(self, names: Set[str]) -> str:
+        """Label of the smallest clade containing all `names`."""
+        if len(names) == 1:
+            return next(iter(names))
+        paths = [self.paths.get(n) for n in names]
+        if any(p is None for p in paths):
+            # Not all names are in the tree: fall back to an explicit set label
+            return "(" + ",".join(sorted(names)) + ")"
+        common = "root"
+        for labels in zip(*paths):
+            if len(set(labels)) != 1:
+                break
+            common = labels[0]
+        return common
+
+
+def classify_read(read: str, index: KmerIndex, resolver: CladeResolver, min_hits: int = 2) -> str:
+    """Return the breed (or lowest common clade for ties) for one read; empty reads are unclassified."""
+    try:
+        read = _norm(read)
+    except ValueError:
+        return UNCLASSIFIED
+    counts = index.hits(read)
+    if not counts:
+        return UNCLASSIFIED
+    best = max(counts.values())
+    if best < min_hits:
+        return UNCLASSIFIED
+    names = {index.labels[i] for i, c in counts.items() if c == best}
+    return resolver.resolve(names)
+
+
+def iter_fastq(path: PathLike) -> Iterator[Tuple[str, str]]:
+    """Stream (read_id, sequence) from a FASTQ file, gzip-compressed or not."""
+    path = Path(path)
+    with open(path, "rb") as probe:
+        gzipped = probe.read(2) == b"\x1f\x8b"
+    opener = gzip.open if gzipped else open
+    with opener(path, "rt", encoding="utf-8") as handle:
+        for title, seq, _qual in FastqGeneralIterator(handle):
+            yield title.split(None, 1)[0], seq
+
+
+def _chunks(reads: Iterator[Tuple[str, str]], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for _, seq in reads:
+        chunk.append(seq)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(index: KmerIndex, resolver: CladeResolver, min_hits: int) -> None:
+    set_worker_state(index=index, resolver=resolver, min_hits=min_hits)
+
+
+def _classify_chunk(reads: Sequence[str]) -> Counter:
+    state = worker_state()
+    return _count_labels(reads, state["index"], state["resolver"], state["min_hits"])
+
+
+def _count_labels(reads: Sequence[str], index: KmerIndex, resolver: CladeResolver, min_hits: int) -> Counter:
+    return Counter(classify_read(r, index, resolver, min_hits) for r in reads)
+
+
+def classify_reads(
+    fastq_path: PathLike,
+    reference: Union[KmerIndex, RecordsLike],
+    tree: Optional[PathLike] = None,
+    k: int = 21,
+    min_hits: int = 2,
+    processes: Optional[int] = 1,
+    chunk_size: int = 5000,
+) -> Dict[str, object]:
+    """
+    Classify FASTQ reads against a reference panel and estimate breed abundance.
+
+    - reads are streamed in chunks; at most 2 chunks per worker are in flight,
+      so memory stays bounded regardless of the number of reads
+    - ties between breeds resolve to their lowest common clade in `tree` (Newick)
+    - `processes=None` uses every core, `1` classifies in-process
+
+    Returns {"total", "unclassified", "counts": {label: reads}, "abundance": {label: fraction}}.
+    """
+    index = reference if isinstance(reference, KmerIndex) else KmerIndex(reference, k)
+    resolver = CladeResolver(tree)
+    counts: Counter = Counter()
+    chunks = _chunks(iter_fastq(fastq_path), chunk_size)
+
+    if processes == 1:
+        for chunk in chunks:
+            counts.update(_count_labels(chunk, index, resolver, min_hits))
+    else:
+        workers = processes or os.cpu_count() or 1
+        max_pending = 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(index, resolver, min_hits)) as pool:
+            pending: Set[Future] = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_classify_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        counts.update(fut.result())
+            for fut in pending:
+                counts.update(fut.result())
+
+    total = sum(counts.values())
+    unclassified = counts.pop(UNCLASSIFIED, 0)
+    classified = total - unclassified
+    abundance = {label: round(n / classified, 4) for label, n in counts.most_common()} if classified else {}
+    return {
+        "total": total,
+        "unclassified": unclassified,
+        "counts": dict(counts.most_common()),
+        "abundance": abundance,
+    }
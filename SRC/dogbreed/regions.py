@@ -0,0 +1,125 @@
+from __future__ import annotations
+# SRC/dogbreed/regions.py
+import hashlib
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+
+# Dog mitogenome reference the region coordinates refer to
+REFERENCE_ID = "NC_002008"
+
+# 0-based, end-exclusive coordinates on the dog mitogenome reference (NC_002008, 16,727 bp)
+REGIONS: Dict[str, Tuple[int, int]] = {
+    "control_region": (15457, 16727),
+    "HVR1": (15457, 16129),
+}
+
+
+class RegionExtractor:
+    """
+    Cut a named region out of sequences using anchors from a reference genome.
+
+    Anchor k-mers are taken from the first and last `window` bases of the region in
+    the reference; the region is found where they occur in each sequence. If no
+    anchor matches, the reference coordinates are used (clipped to the sequence),
+    or the whole sequence when it is shorter than the region start. Slices are
+    cached by sequence content, so each reference is cut once per region.
+    """
+
+    def __init__(
+        self,
+        reference_seq: str,
+        regions: Mapping[str, Tuple[int, int]] = REGIONS,
+        k: int = 15,
+        window: int = 200,
+    ):
+        self.reference = _norm(reference_seq)
+        self.regions = dict(regions)
+        self.k = k
+        self.window = window
+        self._cache: Dict[Tuple[str, str], str] = {}
+
+    def _anchors(self, region: str) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+        """([(kmer, distance from region start)], [(kmer, distance from kmer end to region end)])."""
+        start, end = self.regions[region]
+        end = min(end, len(self.reference))
+        k, step = self.k, max(1, self.k // 2)
+        head = [(self.reference[i:i + k], i - start)
+                for i in range(start, min(start + self.window, end - k + 1), step)]
+        tail = [(self.reference[i - k:i], end - i)
+                for i in range(end, max(end - self.window, start + k - 1), -step)]
+        return head, tail
+
+    def locate(self, seq: str, region: str) -> Tuple[int, int]:
+        """(start, end) of `region` in `seq`."""
+        s = _norm(seq)
+        head, tail = self._anchors(region)
+
+        start = next((pos - off for kmer, off in head if (pos := s.find(kmer)) >= 0), None)
+        end = next((pos + self.k + off for kmer, off in tail if (pos := s.rfind(kmer)) >= 0), None)
+
+        ref_start, ref_end = self.regions[region]
+        if start is None:
+            start = ref_start if ref_start < len(s) else 0
+        if end is None or end <= start:
+            end = ref_end
+        return max(0, start), min(len(s), end)
+
+    def extract(self, seq: str, region: str) -> str:
+        s = _norm(seq)
+        key = (hashlib.sha256(s.encode("ascii")).hexdigest(), region)
+        cached = self._cache.get(key)
+        if cached is None:
+            start, end = self.locate(s, region)
+            cached = self._cache[key] = s[start:end]
+        return cached
+
+
+def _is_reference(rec_id: str, reference_id: str) -> bool:
+    """Match an accession with or without its version suffix (NC_002008 ~ NC_002008.4)."""
+    return rec_id == reference_id or rec_id.split(".", 1)[0] == reference_id.split(".", 1)[0]
+
+
+def find_reference(records: RecordsLike, reference_id: str = REFERENCE_ID) -> str:
+    """Sequence of the designated reference record; raises ValueError if it is not in `records`."""
+    for rec_id, seq in _iter_records(records):
+        if _is_reference(rec_id, reference_id):
+            return seq
+    raise ValueError(f"Reference {reference_id} not found; pass reference_seq or reference_id")
+
+
+def compare_regions(
+    query_seq: str,
+    records: RecordsLike,
+    region: str = "control_region",
+    reference_seq: Optional[str] = None,
+    whole_genome: bool = False,
+    extractor: Optional[RegionExtractor] = None,
+    reference_id: str = REFERENCE_ID,
+) -> List[Tuple]:
+    """
+    Rank references by identity over one region only (`REGIONS`, e.g. "HVR1").
+
+    The region is located with anchors from `reference_seq`, or else from the record
+    named `reference_id` (the NC_002008 reference the coordinates refer to; a
+    ValueError if absent). Pass a long-lived `extractor` to reuse its slice cache
+    across queries.
+    Rows are (id, region_identity), or (id, region_identity, genome_identity) with
+    `whole_genome=True`.
+    """
+    refs = list(_iter_records(records))
+    if not refs:
+        return []
+    if extractor is None:
+        extractor = RegionExtractor(reference_seq if reference_seq is not None else find_reference(refs, reference_id))
+
+    q_region = extractor.extract(query_seq, region)
+    rows: List[Tuple] = []
+    for rec_id, rec_seq in refs:
+        pid = round(percent_identity(q_region, extractor.extract(rec_seq, region)), 2)
+        if whole_genome:
+            rows.append((rec_id, pid, round(percent_identity(query_seq, rec_seq), 2)))
+        else:
+            rows.append((rec_id, pid))
+    rows.sort(key=lambda x: x[1], reverse=True)
+    return rows
@@ -0,0 +1,95 @@
+from __future__ import annotations
+# SRC/dogbreed/result_cache.py
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from dogbreed.compare_sequences import _norm
+
+PathLike = Union[str, Path]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    query_sha256 TEXT PRIMARY KEY,
+    version      TEXT NOT NULL,
+    ranked       TEXT NOT NULL,     -- JSON list of rows
+    last_used    INTEGER NOT NULL   -- logical clock for LRU eviction
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+
+def query_key(query_seq: str) -> str:
+    """SHA-256 of the normalised query, so case and U/T differences still hit."""
+    return hashlib.sha256(_norm(query_seq).encode("ascii")).hexdigest()
+
+
+def reference_version(fasta_sha256: str, mapping_sha256: str, params: Dict[str, object]) -> str:
+    """Fingerprint of everything a ranking depends on besides the query."""
+    payload = json.dumps([fasta_sha256, mapping_sha256, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Ranked results per query, stored in SQLite and bounded with LRU eviction.
+
+    Each entry carries the reference version it was computed against; a lookup
+    under another version misses, and storing a result for a new version drops
+    every entry of the old one.
+    """
+
+    def __init__(self, db_path: PathLike = ":memory:", max_entries: int = 1024):
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(self.db_path, timeout=30.0)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def _tick(self) -> int:
+        return (self._conn.execute("SELECT MAX(last_used) FROM results").fetchone()[0] or 0) + 1
+
+    def get(self, key: str, version: str) -> Optional[List[Tuple]]:
+        row = self._conn.execute(
+            "SELECT ranked FROM results WHERE query_sha256 = ? AND version = ?", (key, version)
+        ).fetchone()
+        if row is None:
+            return None
+        with self._conn:
+            self._conn.execute("UPDATE results SET last_used = ? WHERE query_sha256 = ?", (self._tick(), key))
+        return [tuple(r) for r in json.loads(row[0])]
+
+    def put(self, key: str, version: str, ranked: Sequence[Sequence]) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM results WHERE version != ?", (version,))
+            self._conn.execute(
+                "INSERT INTO results (query_sha256, version, ranked, last_used) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(query_sha256) DO UPDATE SET version = excluded.version, "
+                "ranked = excluded.ranked, last_used = excluded.last_used",
+                (key, version, json.dumps([list(r) for r in ranked]), self._tick()),
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE query_sha256 NOT IN "
+                "(SELECT query_sha256 FROM results ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+# SRC/dogbreed/search_index.py
+import threading
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+from dogbreed.mapping_csv import UpdatesLike, iter_updates
+
+PathLike = Union[str, Path]
+
+# A/C/G/T → 0..3, everything else breaks the k-mer
+_CODE = np.full(256, 255, dtype=np.uint8)
+for _i, _b in enumerate(b"ACGT"):
+    _CODE[_b] = _i
+
+
+def kmer_codes(seq: str, k: int) -> np.ndarray:
+    """Unique 2-bit packed k-mers (uint64, k <= 31) of a sequence, skipping ambiguous bases."""
+    codes = _CODE[np.frombuffer(seq.encode("ascii"), dtype=np.uint8)]
+    if len(codes) < k:
+        return np.empty(0, dtype=np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(codes, k)
+    windows = windows[(windows != 255).all(axis=1)].astype(np.uint64)
+    weights = np.uint64(4) ** np.arange(k - 1, -1, -1, dtype=np.uint64)
+    return np.unique((windows * weights).sum(axis=1, dtype=np.uint64))
+
+
+def _postings(docs: Mapping[int, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Inverted index as two parallel arrays sorted by k-mer: (kmers, doc ids)."""
+    if not docs:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+    kmers = np.concatenate(list(docs.values()))
+    ids = np.concatenate([np.full(len(c), d, dtype=np.int64) for d, c in docs.items()])
+    order = np.argsort(kmers, kind="stable")
+    return kmers[order], ids[order]
+
+
+class SearchIndex:
+    """
+    K-mer prefilter over the reference panel that can be edited in place.
+
+    - the base segment is an immutable sorted (k-mer, doc) array searched with
+      `np.searchsorted`
+    - `add` puts new documents in a small append segment (a dict of postings)
+    - `remove` (and re-adding an accession) tombstones the old document id
+    - `relabel` only touches the label table; postings are unchanged
+    - `merge` rebuilds the base from live documents; once the append segment and
+      tombstones outgrow `merge_ratio` of the base it runs on a background thread,
+      and edits made meanwhile are carried over when the new base is swapped in
+    """
+
+    def __init__(self, k: int = 12, merge_ratio: float = 0.25):
+        self.k = k
+        self.merge_ratio = merge_ratio
+        self._lock = threading.RLock()
+        self._merge_thread: Optional[threading.Thread] = None
+
+        self._accessions: List[str] = []          # doc id → accession
+        self._seqs: Dict[int, str] = {}           # live doc id → sequence
+        self._kmers: Dict[int, np.ndarray] = {}   # live doc id → k-mer codes (filled lazily after load)
+        self._live: Dict[str, int] = {}           # accession → live doc id
+        self.labels: Dict[str, str] = {}          # accession → breed
+
+        self._base_kmers, self._base_docs = _postings({})
+        self._base_size = 0
+        self._append: Dict[int, np.ndarray] = {}
+        self._tombstones: Set[int] = set()
+
+    @classmethod
+    def build(cls, records: RecordsLike, labels: Optional[Mapping[str, str]] = None, k: int = 12,
+              merge_ratio: float = 0.25) -> "SearchIndex":
+        index = cls(k=k, merge_ratio=merge_ratio)
+        if labels:
+            index.labels.update(labels)
+        for rec_id, seq in _iter_records(records):
+            index._add_doc(rec_id, _norm(seq))
+        index.merge()
+        return index
+
+    # ---------------------------
+    # Edits
+    # ---------------------------
+
+    def _add_doc(self, accession: str, seq: str) -> None:
+        old = self._live.pop(accession, None)
+        if old is not None:
+            self._drop_doc(old)
+        doc = len(self._accessions)
+        self._accessions.append(accession)
+        self._seqs[doc] = seq
+        self._kmers[doc] = kmer_codes(seq, self.k)
+        self._append[doc] = self._kmers[doc]
+        self._live[accession] = doc
+
+    def _drop_doc(self, doc: int) -> None:
+        self._seqs.pop(doc, None)
+        self._kmers.pop(doc, None)
+        if self._append.pop(doc, None) is None:
+            self._tombstones.add(doc)  # still referenced by the base segment
+
+    def add(self, accession: str, seq: str, label: Optional[str] = None) -> None:
+        """Add (or replace) one reference."""
+        with self._lock:
+            self._add_doc(accession, _norm(seq))
+            if label is not None:
+                self.labels[accession] = label
+        self._maybe_merge()
+
+    def remove(self, accession: str) -> bool:
+        with self._lock:
+            doc = self._live.pop(accession, None)
+            if doc is None:
+                return False
+            self._drop_doc(doc)
+            self.labels.pop(accession, None)
+        self._maybe_merge()
+        return True
+
+    def relabel(self, accession: str, label: str) -> None:
+        self.relabel_many([(accession, label)])
+
+    def relabel_many(self, updates: UpdatesLike) -> int:
+        """Apply accession → breed updates as one batch (labels for unknown accessions are kept for later adds)."""
+        rows = list(iter_updates(updates))
+        with self._lock:
+            self.labels.update(rows)
+        return len(rows)
+
+    # ---------------------------
+    # Merging
+    # ---------------------------
+
+    def needs_merge(self) -> bool:
+        with self._lock:
+            return len(self._append) + len(self._tombstones) > self.merge_ratio * max(self._base_size, 1)
+
+    def merge(self) -> None:
+        """Rebuild the base segment from live documents (the heavy part runs without the lock)."""
+        with self._lock:
+            horizon = len(self._accessions)
+            pending = {d: (self._kmers.get(d), self._seqs[d]) for d in self._live.values()}
+            dropped = set(self._tombstones)
+
+        snapshot = {d: codes if codes is not None else kmer_codes(seq, self.k) for d, (codes, seq) in pending.items()}
+        kmers, docs = _postings(snapshot)
+
+        with self._lock:
+            # Documents removed while we were building become tombstones of the new base
+            self._tombstones = {d for d in snapshot if d not in self._seqs} | (self._tombstones - dropped)
+            self._append = {d: c for d, c in self._append.items() if d >= horizon}
+            self._base_kmers, self._base_docs = kmers, docs
+            self._base_size = len(snapshot)
+            for d, codes in snapshot.items():
+                if d in self._seqs:
+                    self._kmers.setdefault(d, codes)
+
+    def merge_in_background(self) -> threading.Thread:
+        with self._lock:
+            if self._merge_thread is None or not self._merge_thread.is_alive():
+                self._merge_thread = threading.Thread(target=self.merge, name="search-index-merge", daemon=True)
+                self._merge_thread.start()
+            return self._merge_thread
+
+    def _maybe_merge(self) -> None:
+        if self.needs_merge():
+            self.merge_in_background()
+
+    def wait_for_merge(self) -> None:
+        thread = self._merge_thread
+        if thread is not None:
+            thread.join()
+
+    # ---------------------------
+    # Query
+    # ---------------------------
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, accession: object) -> bool:
+        return accession in self._live
+
+    def candidates(self, query_seq: str, limit: int = 20) -> List[Tuple[str, int]]:
+        """Live accessions sharing the most k-mers with the query: [(accession, shared), ...]."""
+        q = kmer_codes(_norm(query_seq), self.k)
+        with self._lock:
+            lo = np.searchsorted(self._base_kmers, q, side="left")
+            hi = np.searchsorted(self._base_kmers, q, side="right")
+            hits = [self._base_docs[a:b] for a, b in zip(lo, hi) if b > a]
+            counts: Dict[int, int] = {}
+            if hits:
+                docs, n = np.unique(np.concatenate(hits), return_counts=True)
+                counts = {int(d): int(c) for d, c in zip(docs, n) if int(d) not in self._tombstones}
+            for doc, codes in self._append.items():
+                shared = int(np.isin(q, codes, assume_unique=True).sum())
+                if shared:
+                    counts[doc] = shared
+            ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:limit]
+            return [(self._accessions[d], c) for d, c in ranked]
+
+    def search(self, query_seq: str, top_n: int = 5, limit: int = 20) -> List[Tuple[str, str, float]]:
+        """Align only the prefilter candidates: [(accession, breed, percent_identity), ...]."""
+        with self._lock:
+            picked = [(acc, self._seqs[self._live[acc]], self.labels.get(acc, "Unknown Breed"))
+                      for acc, _ in self.candidates(query_seq, limit)]
+        rows = [(acc, label, round(percent_identity(query_seq, seq), 2)) for acc, seq, label in picked]
+        rows.sort(key=lambda x: x[2], reverse=True)
+        return rows[:top_n]
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+
+    def save(self, path: PathLike) -> Path:
+        path = Path(path)
+        with self._lock:
+            live = sorted(self._live.values())
+            append_kmers, append_docs = _postings(self._append)
+            with open(path, "wb") as f:
+                np.savez_compressed(
+                    f,
+                    k=np.array(self.k),
+                    accessions=np.array(self._accessions),
+                    live=np.array(live, dtype=np.int64),
+                    seqs=np.array([self._seqs[d] for d in live]),
+                    labels=np.array(sorted(self.labels.items())).reshape(-1, 2),
+                    base_kmers=self._base_kmers,
+                    base_docs=self._base_docs,
+                    base_size=np.array(self._base_size),
+                    append_kmers=append_kmers,
+                    append_docs=append_docs,
+                    tombstones=np.array(sorted(self._tombstones), dtype=np.int64),
+                )
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike, merge_ratio: float = 0.25) -> "SearchIndex":
+        with np.load(path) as data:
+            index = cls(k=int(data["k"]), merge_ratio=merge_ratio)
+            index._accessions = [str(x) for x in data["accessions"]]
+            for doc, seq in zip(data["live"].tolist(), data["seqs"]):
+                index._seqs[doc] = str(seq)
+                index._live[index._accessions[doc]] = doc
+            index.labels = {str(a): str(b) for a, b in data["labels"]}
+            index._base_kmers, index._base_docs = data["base_kmers"], data["base_docs"]
+            index._base_size = int(data["base_size"])
+            # Only the append segment needs per-document k-mers now; base documents get them on the next merge
+            for doc in np.unique(data["append_docs"]).tolist():
+                index._kmers[doc] = index._append[doc] = kmer_codes(index._seqs[doc], index.k)
+            index._tombstones = set(data["tombstones"].tolist())
+        return index
@@ -0,0 +1,179 @@
+from __future__ import annotations
+# SRC/dogbreed/sequence_collection.py
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, overload
+
+import numpy as np
+from Bio import SeqIO
+
+PathLike = Union[str, Path]
+
+
+class SequenceRecordView:
+    """Lightweight (id, seq) view into a SequenceCollection; no per-record sequence copy."""
+
+    __slots__ = ("_collection", "_index")
+
+    def __init__(self, collection: "SequenceCollection", index: int):
+        self._collection = collection
+        self._index = index
+
+    @property
+    def id(self) -> str:
+        return self._collection._ids[self._index]
+
+    @property
+    def data(self) -> np.ndarray:
+        """uint8 view of the sequence bytes (zero-copy)."""
+        return self._collection._row(self._index)
+
+    @property
+    def seq(self) -> str:
+        return self.data.tobytes().decode("ascii")
+
+    def __len__(self) -> int:
+        return int(self._collection._ends[self._index] - self._collection._starts[self._index])
+
+    def __str__(self) -> str:
+        return self.seq
+
+    def __repr__(self) -> str:
+        return f"SequenceRecordView(id={self.id!r}, length={len(self)})"
+
+
+class SequenceCollection:
+    """
+    Compact, read-only collection of sequences.
+
+    All sequences live in one uint8 buffer addressed by start/end offsets, with an
+    id → index dict for lookups. Iteration yields `SequenceRecordView`s, slicing
+    shares the buffer, and `keys()` / `values()` / `items()` / `get()` / `in` behave like the old
+    {id: sequence} dicts so existing callers keep working.
+    """
+
+    def __init__(self, ids: List[str], buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self._ids = ids
+        self._buffer = buffer
+        self._starts = starts
+        self._ends = ends
+        self._index: Dict[str, int] = {rid: i for i, rid in enumerate(ids)}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, str]], upper: bool = False) -> "SequenceCollection":
+        """
+        Build from (id, sequence) pairs, copying each sequence into the shared buffer once.
+        A repeated id keeps its first position and takes the later sequence, like a dict.
+        """
+        ids: List[str] = []
+        slots: Dict[str, int] = {}
+        starts: List[int] = []
+        ends: List[int] = []
+        buf = bytearray()
+        repack = False
+        for rec_id, seq in records:
+            seq = str(seq)
+            slot = slots.get(rec_id)
+            if slot is None:
+                slot = slots[rec_id] = len(ids)
+                ids.append(rec_id)
+                starts.append(len(buf))
+                ends.append(0)
+            else:
+                starts[slot] = len(buf)
+                repack = True
+            buf += (seq.upper() if upper else seq).encode("ascii")
+            ends[slot] = len(buf)
+
+        if repack:
+            # Duplicates left dead bytes behind: repack so the buffer holds live sequences only
+            packed = bytearray()
+            for i, (a, b) in enumerate(zip(starts, ends)):
+                starts[i] = len(packed)
+                packed += buf[a:b]
+                ends[i] = len(packed)
+            buf = packed
+        return cls(ids, np.frombuffer(buf, dtype=np.uint8),
+                   np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64))
+
+    @classmethod
+    def from_fasta(cls, fasta_path: PathLike, upper: bool = False) -> "SequenceCollection":
+        def pairs() -> Iterator[Tuple[str, str]]:
+            for record in SeqIO.parse(str(fasta_path), "fasta"):
+                if record.id.strip():
+                    yield record.id, str(record.seq)
+        return cls.from_records(pairs(), upper=upper)
+
+    # ---------------------------
+    # Sequence protocol
+    # ---------------------------
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[SequenceRecordView]:
+        for i in range(len(self._ids)):
+            yield SequenceRecordView(self, i)
+
+    @overload
+    def __getitem__(self, key: int) -> SequenceRecordView: ...
+    @overload
+    def __getitem__(self, key: slice) -> "SequenceCollection": ...
+    @overload
+    def __getitem__(self, key: str) -> str: ...
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.get_view(key).seq
+        if isinstance(key, slice):
+            return SequenceCollection(self._ids[key], self._buffer, self._starts[key], self._ends[key])
+        if key < 0:
+            key += len(self._ids)
+        if not 0 <= key < len(self._ids):
+            raise IndexError("SequenceCollection index out of range")
+        return SequenceRecordView(self, key)
+
+    # ---------------------------
+    # Mapping-style access
+    # ---------------------------
+
+    def __contains__(self, rec_id: object) -> bool:
+        return rec_id in self._index
+
+    def get_view(self, rec_id: str) -> SequenceRecordView:
+        return SequenceRecordView(self, self._index[rec_id])
+
+    def get(self, rec_id: str, default: Optional[str] = None) -> Optional[str]:
+        return self[rec_id] if rec_id in self._index else default
+
+    def index_of(self, rec_id: str) -> int:
+        return self._index[rec_id]
+
+    def keys(self) -> List[str]:
+        return list(self._ids)
+
+    def values(self) -> Iterator[str]:
+        for view in self:
+            yield view.seq
+
+    def items(self) -> Iterator[Tuple[str, str]]:
+        for view in self:
+            yield view.id, view.seq
+
+    # ---------------------------
+    # Raw access
+    # ---------------------------
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(buffer, starts, ends): the packed uint8 buffer and per-record offsets, no copies."""
+        return self._buffer, self._starts, self._ends
+
+    def _row(self, i: int) -> np.ndarray:
+        return self._buffer[self._starts[i]:self._ends[i]]
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self._ends - self._starts
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.lengths.sum())
@@ -0,0 +1,15 @@
+from __future__ import annotations
+# SRC/dogbreed/sequence_utils.py
+from typing import FrozenSet
+
+_COMPLEMENT = str.maketrans("ACGTRYSWKMBDHVN", "TGCAYRSWMKVHDBN")
+
+
+def reverse_complement(seq: str) -> str:
+    """Reverse complement of a normalised sequence (IUPAC codes map to their complements)."""
+    return seq.translate(_COMPLEMENT)[::-1]
+
+
+def kmer_set(seq: str, k: int) -> FrozenSet[str]:
+    """Distinct k-mers of a sequence (every overlapping window)."""
+    return frozenset(seq[i:i + k] for i in range(len(seq) - k + 1))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+# SRC/dogbreed/sharded.py
+import json
+import os
+import socket
+import socketserver
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from dogbreed.compare_sequences import ComparisonStream, RecordsLike, _iter_records, _norm
+
+# ("host", port) for TCP, or a filesystem path for a Unix socket
+Address = Union[Tuple[str, int], str]
+
+_MAX_LINE = 64 * 1024 * 1024
+
+
+def partition(records: RecordsLike, shards: int) -> List[List[Tuple[str, str]]]:
+    """Split references round-robin into `shards` roughly equal lists."""
+    parts: List[List[Tuple[str, str]]] = [[] for _ in range(shards)]
+    for i, rec in enumerate(_iter_records(records)):
+        parts[i % shards].append(rec)
+    return parts
+
+
+# ---------------------------
+# Worker side
+# ---------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request line in, one response line out, per connection turn."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                reply = self.server.shard.dispatch(json.loads(line))
+            except Exception as exc:  # report, never kill the worker
+                reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # pragma: no cover - Windows
+    _UnixServer = None
+
+
+class ShardServer:
+    """
+    One resident shard of the reference panel behind a TCP or Unix socket.
+
+    Operations (JSON, one object per line):
+    - {"op": "ping"} → {"ok": true, "shard": name, "size": n}
+    - {"op": "search", "query": seq, "top_k": k} → {"ok": true, "hits": [[id, pid], ...]}
+    """
+
+    def __init__(self, records: RecordsLike, address: Address = ("127.0.0.1", 0), name: str = "shard"):
+        self.name = name
+        self.refs: List[Tuple[str, str]] = [(rid, _norm(seq)) for rid, seq in _iter_records(records)]
+        if isinstance(address, str):
+            if _UnixServer is None:
+                raise ValueError("Unix sockets are not available on this platform")
+            if os.path.exists(address):
+                os.remove(address)
+            self._server = _UnixServer(address, _Handler)
+        else:
+            self._server = _TCPServer(address, _Handler)
+        self._server.shard = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        addr = self._server.server_address
+        return addr if isinstance(addr, str) else (addr[0], addr[1])
+
+    def dispatch(self, request: Dict[str, object]) -> Dict[str, object]:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "shard": self.name, "size": len(self.refs)}
+        if op == "search":
+            stream = ComparisonStream(str(request["query"]), self.refs, top_k=int(request.get("top_k", 5)))
+            for _ in stream:
+                pass
+            return {"ok": True, "shard": self.name, "hits": [list(hit) for hit in stream.top]}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def serve_forever(self) -> None:
+        self._thread = threading.current_thread()
+        self._server.serve_forever()
+
+    def start(self) -> "ShardServer":
+        """Serve on a background thread (tests, or several shards in one process)."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"{self.name}-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        # shutdown() waits for the serve loop to acknowledge, so it would block forever if none ever ran
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)
+
+    def __enter__(self) -> "ShardServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ---------------------------
+# Coordinator side
+# ---------------------------
+
+def request(address: Address, payload: Dict[str, object], timeout: float) -> Dict[str, object]:
+    """Send one request and wait for its reply; raises OSError/TimeoutError/ValueError on failure."""
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline(_MAX_LINE)
+    if not line:
+        raise ConnectionError("shard closed the connection")
+    reply = json.loads(line)
+    if not reply.get("ok"):
+        raise ValueError(reply.get("error", "shard error"))
+    return reply
+
+
+class ShardedSearch:
+    """
+    Scatter-gather coordinator over shard workers.
+
+    The query is sent to every shard in parallel, each returns its own top-k, and the
+    union is merged into the exact global top-k (a global top-k hit is always in its
+    shard's top-k). Timeout policy: each shard gets `timeout` seconds; a shard that
+    times out is failed right away (it may still be busy with the search, so the request
+    is not sent again), while connection errors get `retries` extra attempts. With
+    `require_all=True` a missing shard raises, otherwise the partial result lists it
+    under "missing".
+    """
+
+    def __init__(self, addresses: Sequence[Address], timeout: float = 30.0, retries: int = 1,
+                 require_all: bool = True):
+        self.addresses = [a if isinstance(a, str) else tuple(a) for a in addresses]
+        self.timeout = timeout
+        self.retries = retries
+        self.require_all = require_all
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.addresses)))
+
+    def _call(self, address: Address, payload: Dict[str, object]) -> Dict[str, object]:
+        last: Exception = TimeoutError("no attempt made")
+        for _ in range(self.retries + 1):
+            try:
+                return request(address, payload, self.timeout)
+            except socket.timeout:
+                raise  # the shard may still be computing: a resend would only queue a second search
+            except OSError as exc:
+                last = exc
+        raise last
+
+    def _scatter(self, payload: Dict[str, object]) -> List[Tuple[Address, Optional[Dict[str, object]], Optional[str]]]:
+        futures = [(addr, self._pool.submit(self._call, addr, payload)) for addr in self.addresses]
+        results = []
+        for addr, fut in futures:
+            try:
+                results.append((addr, fut.result(), None))
+            except Exception as exc:
+                results.append((addr, None, f"{type(exc).__name__}: {exc}"))
+        return results
+
+    def health(self) -> Dict[str, Dict[str, object]]:
+        """Ping every shard: {address: {"ok": bool, "size"/"error": ...}}."""
+        status = {}
+        for addr, reply, error in self._scatter({"op": "ping"}):
+            status[str(addr)] = {"ok": True, "shard": reply["shard"], "size": reply["size"]} if reply \
+                else {"ok": False, "error": error}
+        return status
+
+    def search(self, query_seq: str, top_k: int = 5) -> Dict[str, object]:
+        """Return {"hits": [(id, pid), ...], "shards": n_answered, "missing": {address: error}}."""
+        payload = {"op": "search", "query": _norm(query_seq), "top_k": top_k}
+        merged: List[Tuple[float, int, str]] = []
+        missing: Dict[str, str] = {}
+        answered = 0
+        for shard_no, (addr, reply, error) in enumerate(self._scatter(payload)):
+            if reply is None:
+                missing[str(addr)] = error
+                continue
+            answered += 1
+            for rank, (rec_id, pid) in enumerate(reply["hits"]):
+                merged.append((-float(pid), shard_no * (top_k + 1) + rank, rec_id))
+        if missing and self.require_all:
+            raise RuntimeError(f"{len(missing)} shard(s) unavailable: {missing}")
+
+        merged.sort()
+        return {"hits": [(rec_id, -neg) for neg, _, rec_id in merged[:top_k]],
+                "shards": answered, "missing": missing}
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
+
+    def __enter__(self) -> "ShardedSearch":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
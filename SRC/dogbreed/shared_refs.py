@@ -0,0 +1,184 @@
+from __future__ import annotations
+# SRC/dogbreed/shared_refs.py
+import hashlib
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+
+# (data segment name, offsets segment name, ids) — all a worker needs to attach
+StoreHandle = Tuple[str, str, Tuple[str, ...]]
+
+
+# pid -> whether that process inherited its resource tracker (decided on its first attach,
+# before attaching can start a tracker of its own)
+_INHERITED_TRACKER: Dict[int, bool] = {}
+
+
+def _attach_segment(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without letting this process's tracker unlink it."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        # Older Pythons always register on attach. Pool workers share the owner's
+        # tracker (fork and spawn both pass it on), where that is a no-op; only a
+        # process running its own tracker must unregister, or that tracker would
+        # unlink the owner's segment when the process exits
+        pid = os.getpid()
+        if pid not in _INHERITED_TRACKER:
+            _INHERITED_TRACKER[pid] = resource_tracker._resource_tracker._fd is not None
+        shm = shared_memory.SharedMemory(name=name)
+        if not _INHERITED_TRACKER[pid]:
+            resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _release(segments: Sequence[shared_memory.SharedMemory], unlink: bool) -> None:
+    for shm in segments:
+        if unlink:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            shm.close()
+        except BufferError:
+            # A view is still alive (e.g. at interpreter exit); the mapping goes with the process
+            pass
+
+
+class SharedReferenceStore:
+    """
+    Reference sequences packed into `multiprocessing.shared_memory`.
+
+    One contiguous byte buffer holds every normalised sequence and a second segment
+    holds int64 offsets, so workers attach zero-copy and only receive index ranges
+    as tasks. The creating process owns (and unlinks) the segments:
+
+    - on `close()` / leaving the `with` block, including on exceptions and Ctrl-C
+    - at interpreter exit via `weakref.finalize`
+    - if the process is killed, the multiprocessing resource tracker unlinks them
+    """
+
+    def __init__(self, records: Optional[RecordsLike] = None, _handle: Optional[StoreHandle] = None):
+        if _handle is not None:
+            data_name, offsets_name, ids = _handle
+            self.ids = list(ids)
+            self._data = _attach_segment(data_name)
+            self._offsets_shm = _attach_segment(offsets_name)
+            self._owner = False
+        else:
+            ids: List[str] = []
+            encoded: List[bytes] = []
+            for rec_id, seq in _iter_records(records or []):
+                ids.append(rec_id)
+                encoded.append(_norm(seq).encode("ascii"))
+            self.ids = ids
+
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(b) for b in encoded], out=offsets[1:])
+            self._data = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+            self._offsets_shm = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+            self._owner = True
+
+            buf = np.ndarray((self._data.size,), dtype=np.uint8, buffer=self._data.buf)
+            for b, start in zip(encoded, offsets[:-1]):
+                buf[start:start + len(b)] = np.frombuffer(b, dtype=np.uint8)
+            np.ndarray(offsets.shape, dtype=np.int64, buffer=self._offsets_shm.buf)[:] = offsets
+
+        self.offsets = np.ndarray((len(self.ids) + 1,), dtype=np.int64, buffer=self._offsets_shm.buf)
+        self._finalizer = weakref.finalize(self, _release, (self._data, self._offsets_shm), self._owner)
+
+    @classmethod
+    def attach(cls, handle: StoreHandle) -> "SharedReferenceStore":
+        return cls(_handle=handle)
+
+    @property
+    def handle(self) -> StoreHandle:
+        return (self._data.name, self._offsets_shm.name, tuple(self.ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def view(self, i: int) -> memoryview:
+        """Zero-copy bytes of sequence `i`."""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self._data.buf[start:end]
+
+    def sequence(self, i: int) -> str:
+        return bytes(self.view(i)).decode("ascii")
+
+    def content_sha256(self) -> str:
+        """SHA-256 over every sequence in order (identifies the panel content)."""
+        h = hashlib.sha256()
+        for i in range(len(self)):
+            h.update(self.view(i))
+            h.update(b"\n")
+        return h.hexdigest()
+
+    def close(self) -> None:
+        # Drop numpy views into the buffers before the segments are closed
+        self.offsets = None
+        self._finalizer()
+
+    def __enter__(self) -> "SharedReferenceStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Worker-side state, set once per process by the pool initializer
+_WORKER: Dict[str, object] = {}
+
+
+def set_worker_state(**state: object) -> None:
+    """Pool initializer helper: replace this worker process's state (pools in this package share it)."""
+    _WORKER.clear()
+    _WORKER.update(state)
+
+
+def worker_state() -> Dict[str, object]:
+    """State stored by `set_worker_state` in this worker process."""
+    return _WORKER
+
+
+def _init_worker(handle: StoreHandle, query: str) -> None:
+    set_worker_state(store=SharedReferenceStore.attach(handle), query=query)
+
+
+def _score_range(bounds: Tuple[int, int]) -> List[Tuple[str, float]]:
+    state = worker_state()
+    store: SharedReferenceStore = state["store"]
+    query: str = state["query"]
+    lo, hi = bounds
+    return [(store.ids[i], round(percent_identity(query, store.sequence(i)), 2)) for i in range(lo, hi)]
+
+
+def compare_sequences_parallel(
+    query_seq: str,
+    records: RecordsLike,
+    processes: Optional[int] = None,
+    chunk_size: int = 8,
+) -> List[Tuple[str, float]]:
+    """
+    Process-pool version of `compare_sequences`.
+    References go to workers through shared memory; tasks are just (start, end) ranges.
+    """
+    q = _norm(query_seq)
+    with SharedReferenceStore(records) as store:
+        n = len(store)
+        ranges = [(lo, min(lo + chunk_size, n)) for lo in range(0, n, chunk_size)]
+        scores: List[Tuple[str, float]] = []
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(store.handle, q)) as pool:
+            for part in pool.map(_score_range, ranges):
+                scores.extend(part)
+
+    scores.sort(key=lambda x: x[1], reverse=True)
+    return scores
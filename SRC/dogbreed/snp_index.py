@@ -0,0 +1,235 @@
+from __future__ import annotations
+# SRC/dogbreed/snp_index.py
+from pathlib import Path
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from Bio import SeqIO
+
+from dogbreed.compare_sequences import RecordsLike, _aligner, _iter_records, _norm, compare_sequences
+
+PathLike = Union[str, Path]
+
+_CALLED = np.frombuffer(b"ACGT", dtype=np.uint8)
+GAP = ord("-")
+
+
+def _encode(seq: str) -> np.ndarray:
+    return np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+
+
+SEED_K = 16
+# Largest unseeded window (query x anchor DP cells) aligned between two seed runs
+_MAX_WINDOW_CELLS = 1 << 22
+
+Block = Tuple[int, int, int]  # (query start, anchor start, length) of an exact match
+
+
+def anchor_seeds(anchor: str, k: int = SEED_K) -> Dict[str, int]:
+    """Position of every k-mer that occurs exactly once in `anchor`."""
+    seen: Dict[str, int] = {}
+    for i in range(len(anchor) - k + 1):
+        kmer = anchor[i:i + k]
+        seen[kmer] = -1 if kmer in seen else i
+    return {kmer: i for kmer, i in seen.items() if i >= 0}
+
+
+def _seed_blocks(s: str, seeds: Dict[str, int], k: int) -> List[Block]:
+    """Collinear chain of exact k-mer hits (longest increasing in both coordinates), merged into blocks."""
+    hits = [(q, seeds[s[q:q + k]]) for q in range(len(s) - k + 1) if s[q:q + k] in seeds]
+    # Patience LIS on the anchor position (hits are already ordered by query position)
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev = [-1] * len(hits)
+    for i, (_, a) in enumerate(hits):
+        j = bisect_left(tails, a)
+        if j == len(tails):
+            tails.append(a)
+            tail_idx.append(i)
+        else:
+            tails[j] = a
+            tail_idx[j] = i
+        prev[i] = tail_idx[j - 1] if j else -1
+    chain: List[Tuple[int, int]] = []
+    i = tail_idx[-1] if tail_idx else -1
+    while i >= 0:
+        chain.append(hits[i])
+        i = prev[i]
+    chain.reverse()
+
+    blocks: List[Block] = []
+    q_end = a_end = 0
+    for q, a in chain:
+        shift = max(q_end - q, a_end - a, 0)  # trim overlap with the previous block
+        if shift >= k:
+            continue
+        q, a, n = q + shift, a + shift, k - shift
+        if blocks and q == q_end and a == a_end:
+            bq, ba, bn = blocks[-1]
+            blocks[-1] = (bq, ba, bn + n)
+        else:
+            blocks.append((q, a, n))
+        q_end, a_end = q + n, a + n
+    return blocks
+
+
+def _project_window(out: np.ndarray, query: np.ndarray, s: str, anchor: str,
+                    q0: int, q1: int, a0: int, a1: int) -> bool:
+    """Align s[q0:q1] to anchor[a0:a1] into `out`; False if the window is too large."""
+    if q0 == q1 or a0 == a1:
+        return True  # pure insertion or deletion: nothing to project
+    if (q1 - q0) * (a1 - a0) > _MAX_WINDOW_CELLS:
+        return False
+    aln = _aligner.align(anchor[a0:a1], s[q0:q1])[0]
+    for (x0, x1), (y0, y1) in zip(*aln.aligned):
+        out[a0 + x0:a0 + x1] = query[q0 + y0:q0 + y1]
+    return True
+
+
+def project_to_anchor(seq: str, anchor: str, seeds: Optional[Dict[str, int]] = None) -> np.ndarray:
+    """
+    Align `seq` to `anchor` and return its bases in anchor coordinates
+    (uint8 array of len(anchor); '-' where the anchor position is not covered).
+    Insertions relative to the anchor are dropped.
+
+    Exact runs of unique anchor k-mers (`seeds`, from `anchor_seeds`) are copied as is
+    and only the windows between them are aligned, so a query close to the anchor costs
+    O(L) rather than the O(L^2) of one global DP. Without usable seeds, or when a window
+    exceeds `_MAX_WINDOW_CELLS`, the whole sequence is aligned globally instead.
+    """
+    s = _norm(seq)
+    query = _encode(s)
+    out = np.full(len(anchor), GAP, dtype=np.uint8)
+    if seeds is None:
+        seeds = anchor_seeds(anchor)
+    blocks = _seed_blocks(s, seeds, SEED_K)
+    if blocks:
+        q_end = a_end = 0
+        for q, a, n in blocks + [(len(s), len(anchor), 0)]:
+            if not _project_window(out, query, s, anchor, q_end, q, a_end, a):
+                break
+            out[a:a + n] = query[q:q + n]
+            q_end, a_end = q + n, a + n
+        else:
+            return out
+        out.fill(GAP)
+
+    aln = _aligner.align(anchor, s)[0]
+    for (a0, a1), (q0, q1) in zip(*aln.aligned):
+        out[a0:a1] = query[q0:q1]
+    return out
+
+
+class SnpIndex:
+    """
+    Per-breed fingerprint table over the informative sites of a reference panel.
+
+    Every reference is aligned once to an anchor genome; anchor positions where the
+    panel carries more than one called allele become the fingerprint sites. A query
+    then needs a single (seeded) projection onto the anchor, and scoring is a
+    vectorised comparison over `sites` only.
+    """
+
+    def __init__(self, anchor: str, labels: List[str], sites: np.ndarray, alleles: np.ndarray):
+        self.anchor = anchor
+        self.labels = labels
+        self.sites = sites        # (n_sites,) anchor positions
+        self.alleles = alleles    # (n_refs, n_sites) uint8 bases, '-' if uncalled
+        self._seeds: Optional[Dict[str, int]] = None
+
+    @property
+    def seeds(self) -> Dict[str, int]:
+        """Unique anchor k-mers for seeded projection, built on first use."""
+        if self._seeds is None:
+            self._seeds = anchor_seeds(self.anchor)
+        return self._seeds
+
+    @classmethod
+    def build(cls, records: RecordsLike, anchor: str) -> "SnpIndex":
+        anchor = _norm(anchor)
+        seeds = anchor_seeds(anchor)
+        labels: List[str] = []
+        rows: List[np.ndarray] = []
+        for rec_id, seq in _iter_records(records):
+            labels.append(rec_id)
+            rows.append(project_to_anchor(seq, anchor, seeds))
+        if not rows:
+            raise ValueError("Reference panel is empty")
+
+        panel = np.vstack(rows)
+        called = np.isin(panel, _CALLED)
+        # A site is informative if at least two different called alleles occur
+        distinct = np.zeros(panel.shape[1], dtype=np.int8)
+        for base in _CALLED:
+            distinct += ((panel == base) & called).any(axis=0)
+        sites = np.flatnonzero(distinct >= 2).astype(np.int32)
+        return cls(anchor, labels, sites, panel[:, sites].copy())
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+
+    def save(self, path: PathLike) -> Path:
+        path = Path(path)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                anchor=np.array(self.anchor),
+                labels=np.array(self.labels),
+                sites=self.sites,
+                alleles=self.alleles,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: PathLike) -> "SnpIndex":
+        with np.load(path) as data:
+            return cls(str(data["anchor"]), [str(x) for x in data["labels"]], data["sites"], data["alleles"])
+
+    # ---------------------------
+    # Query
+    # ---------------------------
+
+    def score(self, query_seq: str) -> Tuple[List[Tuple[str, float]], float]:
+        """
+        Return ([(label, % identity at informative sites), ...] sorted desc, coverage),
+        where coverage is the fraction of sites with a called base in the query.
+        """
+        if not len(self.sites):
+            return [(label, 100.0) for label in self.labels], 0.0
+
+        q = project_to_anchor(query_seq, self.anchor, self.seeds)[self.sites]
+        q_called = np.isin(q, _CALLED)
+        coverage = float(q_called.mean())
+
+        both = q_called & np.isin(self.alleles, _CALLED)
+        matches = ((self.alleles == q) & both).sum(axis=1)
+        compared = both.sum(axis=1)
+        pid = np.where(compared > 0, matches / np.maximum(compared, 1) * 100.0, 0.0)
+
+        ranked = sorted(zip(self.labels, (round(float(p), 2) for p in pid)), key=lambda x: x[1], reverse=True)
+        return ranked, coverage
+
+
+def build_snp_index(reference_fasta: PathLike, anchor_fasta: PathLike, out_path: PathLike) -> Path:
+    """Precompute the fingerprint table for a reference FASTA against an anchor genome."""
+    anchor = str(next(SeqIO.parse(str(anchor_fasta), "fasta")).seq)
+    return SnpIndex.build(str(reference_fasta), anchor).save(out_path)
+
+
+def identify_by_snps(
+    query_seq: str,
+    index: SnpIndex,
+    records: Optional[RecordsLike] = None,
+    min_coverage: float = 0.8,
+) -> List[Tuple[str, float]]:
+    """
+    Rank references by their alleles at informative sites.
+    Falls back to full-length `compare_sequences` when the query covers fewer than
+    `min_coverage` of the sites (and `records` were given).
+    """
+    ranked, coverage = index.score(query_seq)
+    if coverage < min_coverage and records is not None:
+        return compare_sequences(query_seq, records)
+    return ranked
@@ -0,0 +1,82 @@
+from __future__ import annotations
+# SRC/dogbreed/tree_search.py
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Tuple, Union
+
+from Bio import Phylo
+
+from dogbreed.compare_sequences import RecordsLike, _iter_records, _norm, percent_identity
+from dogbreed.sequence_utils import kmer_set
+
+PathLike = Union[str, Path]
+
+
+class TreeSearchIndex:
+    """
+    Top-down beam search over a reference tree (the Newick from `generate_tree`).
+
+    Each clade keeps a few representative leaves (the ones closest to the clade's
+    root). While descending, candidates are ranked by cheap k-mer containment
+    against those representatives; full alignment only runs on the leaves the beam
+    finally reaches.
+    """
+
+    def __init__(self, newick_path: PathLike, records: RecordsLike, reps_per_clade: int = 2, k: int = 12):
+        self.tree = Phylo.read(str(newick_path), "newick")
+        self.k = k
+        self.refs: Dict[str, str] = {rid: _norm(seq) for rid, seq in _iter_records(records)}
+
+        leaves = [t for t in self.tree.get_terminals() if t.name in self.refs]
+        if not leaves:
+            raise ValueError("No tree leaves match the reference records")
+        self.n_leaves = len(leaves)
+
+        # Precompute representatives and their k-mer sets once
+        self._kmers: Dict[str, FrozenSet[str]] = {}
+        self.reps: Dict[int, List[str]] = {}
+        for clade in self.tree.find_clades():
+            depths = clade.depths(unit_branch_lengths=not self._has_lengths())
+            ranked = sorted((d, t.name) for t, d in depths.items() if t.is_terminal() and t.name in self.refs)
+            reps = [name for _, name in ranked[:reps_per_clade]]
+            self.reps[id(clade)] = reps
+            for name in reps:
+                if name not in self._kmers:
+                    self._kmers[name] = kmer_set(self.refs[name], k)
+
+    def _has_lengths(self) -> bool:
+        return any(c.branch_length for c in self.tree.find_clades())
+
+    def _clade_score(self, clade, query_kmers: FrozenSet[str]) -> float:
+        """Best k-mer containment of the query among the clade's representatives."""
+        if not query_kmers:
+            return 0.0
+        reps = self.reps.get(id(clade), [])
+        return max((len(query_kmers & self._kmers[r]) / len(query_kmers) for r in reps), default=0.0)
+
+    def search(self, query_seq: str, beam_width: int = 2) -> Dict[str, object]:
+        """
+        Return {"ranked": [(id, percent_identity), ...], "alignments": n,
+                "exhaustive": n_leaves, "saved": n_leaves - n}.
+        """
+        q = _norm(query_seq)
+        query_kmers = kmer_set(q, self.k)
+
+        beam = [self.tree.root]
+        while any(not c.is_terminal() for c in beam):
+            candidates = []
+            for clade in beam:
+                candidates.extend([clade] if clade.is_terminal() else clade.clades)
+            candidates = [c for c in candidates if self.reps.get(id(c))]
+            candidates.sort(key=lambda c: self._clade_score(c, query_kmers), reverse=True)
+            beam = candidates[:beam_width]
+
+        ranked: List[Tuple[str, float]] = [
+            (leaf.name, round(percent_identity(q, self.refs[leaf.name]), 2)) for leaf in beam
+        ]
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return {
+            "ranked": ranked,
+            "alignments": len(ranked),
+            "exhaustive": self.n_leaves,
+            "saved": self.n_leaves - len(ranked),
+        }
@@ -0,0 +1,111 @@
+from __future__ import annotations
+# SRC/dogbreed/ungapped.py
+from typing import Iterable
+
+import numpy as np
+
+from dogbreed.sequence_collection import SequenceCollection
+
+# Working memory per block of references. A cell costs ~16 bytes across the int64 gather
+# index, the mask, the gathered bytes and (with IUPAC) the float32 scores
+BLOCK_BYTES = 16 << 20
+_CELL_BYTES = 16
+
+_IUPAC = {
+    "A": "A", "C": "C", "G": "G", "T": "T", "U": "T",
+    "R": "AG", "Y": "CT", "S": "CG", "W": "AT", "K": "GT", "M": "AC",
+    "B": "CGT", "D": "AGT", "H": "ACT", "V": "ACG", "N": "ACGT",
+}
+
+
+def _iupac_table() -> np.ndarray:
+    """
+    256 x 256 partial-match scores: probability that two (possibly ambiguous) bases
+    are the same, |A ∩ B| / (|A| |B|). Other byte pairs score 1 when equal, else 0.
+    """
+    table = np.eye(256, dtype=np.float32)
+    table[0, 0] = 0.0  # padding never matches
+    for a, sa in _IUPAC.items():
+        for b, sb in _IUPAC.items():
+            score = len(set(sa) & set(sb)) / (len(sa) * len(sb))
+            for ca in (a, a.lower()):
+                for cb in (b, b.lower()):
+                    table[ord(ca), ord(cb)] = score
+    return table
+
+
+IUPAC_TABLE = _iupac_table()
+
+
+def _encode(seq: str) -> np.ndarray:
+    return np.frombuffer(seq.encode("ascii"), dtype=np.uint8)
+
+
+class UngappedPanel:
+    """
+    A reference panel as one packed uint8 buffer plus offsets (the SequenceCollection layout).
+
+    `identities` compares a query against every reference position by position in
+    blocks of references: each block is gathered into a padded (rows x len(query))
+    matrix and compared to the query in one broadcast. Rows per block follow from a
+    byte budget (`block_bytes // width`), so long queries get proportionally fewer rows.
+    """
+
+    def __init__(self, buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self.buffer = buffer
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.lengths = np.asarray(ends, dtype=np.int64) - self.starts
+
+    @classmethod
+    def from_collection(cls, collection: SequenceCollection) -> "UngappedPanel":
+        return cls(*collection.arrays())
+
+    @classmethod
+    def from_sequences(cls, seqs: Iterable[str]) -> "UngappedPanel":
+        return cls.from_collection(SequenceCollection.from_records((str(i), s) for i, s in enumerate(seqs)))
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def matches(self, query: str, iupac: bool = False, block_bytes: int = BLOCK_BYTES) -> np.ndarray:
+        """Per-reference count of matching positions over the common prefix (float, partial with IUPAC)."""
+        q = _encode(query)
+        out = np.zeros(len(self), dtype=np.float64)
+        width = min(len(q), int(self.lengths.max(initial=0)))
+        if width == 0:
+            return out
+        cols = np.arange(width, dtype=np.int64)
+        q = q[:width]
+        rows = max(1, block_bytes // (width * _CELL_BYTES))
+        for lo in range(0, len(self), rows):
+            hi = min(lo + rows, len(self))
+            lengths = self.lengths[lo:hi, None]
+            inside = cols[None, :] < lengths
+            idx = np.where(inside, self.starts[lo:hi, None] + cols[None, :], 0)
+            block = np.where(inside, self.buffer[idx] if len(self.buffer) else 0, 0).astype(np.uint8)
+            if iupac:
+                out[lo:hi] = IUPAC_TABLE[q[None, :], block].sum(axis=1, dtype=np.float64)
+            else:
+                out[lo:hi] = (block == q[None, :]).sum(axis=1)
+        return out
+
+    def identities(self, query: str, denominator: str = "max", iupac: bool = False,
+                   block_bytes: int = BLOCK_BYTES) -> np.ndarray:
+        """
+        Fraction of identical positions for every reference.
+
+        - `denominator="max"`: divide by the longer of query/reference (dogbreed.utils semantics)
+        - `denominator="min"`: divide by the shorter one (Main/utils semantics)
+        Pairs with a zero denominator score 0.
+        """
+        if denominator not in ("max", "min"):
+            raise ValueError("denominator must be 'max' or 'min'")
+        combine = np.maximum if denominator == "max" else np.minimum
+        denom = combine(self.lengths, len(query)).astype(np.float64)
+        matches = self.matches(query, iupac=iupac, block_bytes=block_bytes)
+        return np.divide(matches, denom, out=np.zeros_like(matches), where=denom > 0)
+
+
+def ungapped_identity(a: str, b: str, denominator: str = "max", iupac: bool = False) -> float:
+    """Single-pair convenience wrapper around `UngappedPanel.identities`."""
+    return float(UngappedPanel.from_sequences([b]).identities(a, denominator, iupac)[0])
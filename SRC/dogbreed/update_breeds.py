@@ -1,34 +1,21 @@
-import csv
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
+from dogbreed.mapping_journal import apply_updates
+from dogbreed.search_index import SearchIndex
 
-def update_breed_mapping_file(csv_path: Path, updates: Dict[str, str]) -> None:
+
+def update_breed_mapping_file(csv_path: Path, updates: Dict[str, str], index: Optional[SearchIndex] = None) -> None:
     """
     Update the breed mapping CSV with new or updated accession_id → breed pairs.
 
     - If an accession_id exists, update its breed.
     - If it does not exist, add it as a new row.
     - Preserves all other existing rows.
-    """
-    csv_path = Path(csv_path)
-
-    # Load existing rows into a dict
-    existing = {}
-    if csv_path.exists():
-        with open(csv_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                existing[row["accession_id"]] = row["breed"]
-
-    # Apply updates (overwrites or adds new)
-    for acc_id, breed in updates.items():
-        existing[acc_id] = breed
-
-    # Write back to CSV
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["accession_id", "breed"])
-        writer.writeheader()
-        for acc_id, breed in existing.items():
-            writer.writerow({"accession_id": acc_id, "breed": breed})
 
+    The batch is applied under the mapping journal's lock and written through to the
+    CSV, so concurrent callers never drop each other's rows (see
+    `mapping_journal.apply_updates`; workers that only need `read_merged` views can
+    append to the journal instead). A live search `index` is relabelled under the same lock.
+    """
+    apply_updates(Path(csv_path), updates, index=index, write_through=True)
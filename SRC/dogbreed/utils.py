@@ -1,28 +1,26 @@
 from pathlib import Path
-from typing import Dict, List, Tuple
-from Bio import SeqIO
-import csv
+from typing import Dict, List, Mapping, Optional, Tuple
 
+from dogbreed.mapping_journal import MappingJournal, apply_updates
+from dogbreed.search_index import SearchIndex
+from dogbreed.sequence_collection import SequenceCollection
+from dogbreed.ungapped import UngappedPanel
 
-def load_fasta(fasta_path: Path) -> Dict[str, str]:
+
+def load_fasta(fasta_path: Path) -> SequenceCollection:
     """
-    Load sequences from FASTA into {id: sequence}.
+    Load sequences from FASTA into a compact {id: sequence} collection.
     Handles empty or malformed files gracefully.
     """
-    sequences = {}
     if not fasta_path.exists():
-        return sequences
+        return SequenceCollection.from_records([])
 
     try:
-        for record in SeqIO.parse(str(fasta_path), "fasta"):
-            # Only keep valid IDs
-            if record.id.strip():
-                sequences[record.id] = str(record.seq)
+        # Only keep valid IDs (from_fasta skips blank ones)
+        return SequenceCollection.from_fasta(fasta_path)
     except Exception:
-        # Malformed FASTA → return empty dict instead of crashing
-        return {}
-
-    return sequences
+        # Malformed FASTA → return empty collection instead of crashing
+        return SequenceCollection.from_records([])
 
 
 def load_breed_mapping(csv_path: Path) -> Dict[str, str]:
@@ -35,58 +33,38 @@ def load_breed_mapping(csv_path: Path) -> Dict[str, str]:
         return mapping
 
     try:
-        with open(csv_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if "accession_id" in row and "breed" in row:
-                    mapping[row["accession_id"]] = row["breed"]
+        # Canonical CSV plus any journal entries that have not been compacted yet
+        mapping = MappingJournal(csv_path).read_merged()
     except Exception:
         return {}
 
     return mapping
 
 
-def find_best_match(query: str, reference: Dict[str, str]) -> List[Tuple[str, float]]:
+def find_best_match(query: str, reference: Mapping[str, str], iupac: bool = False) -> List[Tuple[str, float]]:
     """
     Find the best match for a query sequence in reference dict.
     Returns ranked list [(id, percent_identity), ...].
-    """
-    scores = []
-    for acc, seq in reference.items():
-        matches = sum(q == s for q, s in zip(query, seq))
-        pid = (matches / max(len(query), len(seq))) * 100 if seq else 0.0
-        scores.append((acc, pid))
 
+    Position-by-position identity over the longer length, computed for the whole
+    panel at once (a SequenceCollection is scored straight from its buffer).
+    `iupac=True` gives ambiguity codes partial credit.
+    """
+    if isinstance(reference, SequenceCollection):
+        ids, panel = reference.keys(), UngappedPanel.from_collection(reference)
+    else:
+        ids, seqs = list(reference.keys()), list(reference.values())
+        panel = UngappedPanel.from_sequences(seqs)
+    pids = panel.identities(query, denominator="max", iupac=iupac) * 100
+
+    scores = [(acc, float(pid)) for acc, pid in zip(ids, pids)]
     scores.sort(key=lambda x: x[1], reverse=True)
     return scores
 
 
-def update_breed_mapping(csv_path: Path, updates: Dict[str, str]) -> None:
+def update_breed_mapping(csv_path: Path, updates: Dict[str, str], index: Optional[SearchIndex] = None) -> None:
     """
     Update or add breeds in the mapping CSV.
-    Overwrites old values if accession already exists.
+    Overwrites old values if accession already exists; a live search `index` is relabelled too.
     """
-    rows = []
-    seen = set()
-
-    # Load existing
-    if csv_path.exists():
-        with open(csv_path, newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                acc = row["accession_id"]
-                if acc in updates:
-                    row["breed"] = updates[acc]
-                rows.append(row)
-                seen.add(acc)
-
-    # Add new rows
-    for acc, breed in updates.items():
-        if acc not in seen:
-            rows.append({"accession_id": acc, "breed": breed})
-
-    # Write back
-    with open(csv_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=["accession_id", "breed"])
-        writer.writeheader()
-        writer.writerows(rows)
+    apply_updates(Path(csv_path), updates, index=index)
@@ -0,0 +1,50 @@
+import random
+import pytest
+from dogbreed import approx_identity as mod
+from dogbreed.compare_sequences import compare_sequences
+
+
+def _mutate(seq: str, rate: float, rng: random.Random) -> str:
+    return "".join(rng.choice("ACGT".replace(c, "")) if rng.random() < rate else c for c in seq)
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(3)
+    base = "".join(rng.choice("ACGT") for _ in range(2000))
+    far = "".join(rng.choice("ACGT") for _ in range(2000))
+    return base, [("Near", _mutate(base, 0.01, rng)), ("Mid", _mutate(base, 0.05, rng)), ("Far", far)]
+
+
+def test_containment_estimate_brackets_true_identity(panel):
+    base, refs = panel
+    rows = {rid: (est, lo, hi) for rid, est, lo, hi in mod.approximate_compare(base, refs)}
+
+    est, lo, hi = rows["Near"]
+    assert lo <= 99.0 <= hi
+    assert rows["Mid"][0] < est
+    assert rows["Far"][2] < rows["Mid"][1]  # unrelated sequence is clearly separated
+
+
+def test_tolerance_limits_exact_alignments(panel, monkeypatch):
+    base, refs = panel
+    by_seq = {seq: rid for rid, seq in refs}
+    aligned = []
+    real = mod.percent_identity
+    monkeypatch.setattr(mod, "percent_identity", lambda a, b: aligned.append(by_seq[b]) or real(a, b))
+
+    # Only the leader survives a zero tolerance: nothing is aligned
+    ranked = compare_sequences(base, refs, tolerance=0.0)
+    assert [rid for rid, _ in ranked] == ["Near", "Mid", "Far"]
+    assert aligned == []
+
+    # A wider tolerance brings Mid into the leader's interval: exactly the contenders are aligned
+    rows = mod.compare_with_tolerance(base, refs, tolerance=5.0)
+    assert sorted(aligned) == ["Mid", "Near"]
+    assert [rid for rid, *_ in rows] == ["Near", "Mid", "Far"]  # ranked by the estimate only
+    assert [r[1] for r in rows] == sorted((r[1] for r in rows), reverse=True)
+    methods = {rid: (exact, method) for rid, _, _, _, exact, method in rows}
+    assert methods["Near"][1] == methods["Mid"][1] == mod.EXACT
+    assert methods["Far"] == (None, mod.ESTIMATED)
+
+    assert mod.wilson_interval(0, 0) == (0.0, 1.0)
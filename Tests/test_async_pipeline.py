@@ -0,0 +1,61 @@
+import csv
+import json
+from pathlib import Path
+from dogbreed.async_pipeline import BatchPipeline, run_batch
+
+
+def _queries(path: Path, n: int) -> Path:
+    seqs = ["AAAAAAAAAA", "CCCCCCCCCC", "GGGGGGGGGG"]
+    path.write_text("".join(f">q{i}\n{seqs[i % 3]}\n" for i in range(n)) + ">blank\n\n")
+    return path
+
+
+REFS = [("Lab", "AAAAAAAAAA"), ("Poodle", "CCCCCCCCCC"), ("Husky", "GGGGGGGGGG")]
+
+
+def test_run_batch_writes_csv_with_backpressure(tmp_path: Path):
+    queries = _queries(tmp_path / "queries.fa", 40)
+    out = tmp_path / "results.csv"
+
+    stats = run_batch(queries, REFS, out, top_k=2, processes=2, queue_size=2, parse_batch=3)
+
+    assert stats == {"parsed": 41, "aligned": 40, "written": 40, "skipped": 1}
+    with open(out, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 80
+    best = {r["query_id"]: r["reference_id"] for r in rows if r["rank"] == "1"}
+    assert best["q0"] == "Lab" and best["q1"] == "Poodle" and best["q5"] == "Husky"
+
+
+def test_run_batch_writes_jsonl(tmp_path: Path):
+    queries = _queries(tmp_path / "queries.fa", 3)
+    out = tmp_path / "results.jsonl"
+
+    run_batch(queries, REFS, out, top_k=1, processes=1)
+    lines = [json.loads(line) for line in out.read_text().splitlines()]
+    assert sorted(l["query"] for l in lines) == ["q0", "q1", "q2"]
+    assert all(len(l["hits"]) == 1 for l in lines)
+
+
+def test_run_batch_json_suffix_writes_one_array(tmp_path: Path):
+    queries = _queries(tmp_path / "queries.fa", 3)
+
+    run_batch(queries, REFS, tmp_path / "results.json", top_k=1, processes=1)
+    with open(tmp_path / "results.json") as f:
+        results = json.load(f)
+    assert sorted(r["query"] for r in results) == ["q0", "q1", "q2"]
+
+    run_batch(queries, REFS, tmp_path / "results.ndjson", top_k=1, processes=1)
+    lines = [json.loads(line) for line in (tmp_path / "results.ndjson").read_text().splitlines()]
+    assert len(lines) == 3
+
+
+def test_pipeline_reuse_starts_from_fresh_stats(tmp_path: Path):
+    queries = _queries(tmp_path / "queries.fa", 2)
+    pipeline = BatchPipeline(REFS, top_k=1, processes=1)
+
+    for _ in range(2):
+        stats = pipeline.run(queries, tmp_path / "results.json")
+        assert stats == {"parsed": 3, "aligned": 2, "written": 2, "skipped": 1}
+        with open(tmp_path / "results.json") as f:
+            assert len(json.load(f)) == 2
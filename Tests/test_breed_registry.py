@@ -0,0 +1,90 @@
+from pathlib import Path
+import csv
+import os
+import pytest
+from dogbreed.breed_registry import BreedRegistry, update_mapping_csv
+
+
+def read_csv(path: Path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_registry_batched_upsert_and_lookup():
+    with BreedRegistry() as reg:
+        reg.upsert_many({"id1": "Labrador", "id2": "Poodle"})
+        reg.upsert_many([("id1", "Golden Retriever"), ("id3", "Beagle")])
+
+        assert len(reg) == 3
+        assert reg.get("id1") == "Golden Retriever"
+        assert reg.get("missing", "Unknown Breed") == "Unknown Breed"
+        assert "id3" in reg
+        # First-insertion order is kept for CSV export
+        assert [acc for acc, _ in reg.items()] == ["id1", "id2", "id3"]
+
+
+def test_registry_csv_round_trip(tmp_csv: Path, tmp_path: Path):
+    with BreedRegistry() as reg:
+        assert reg.import_csv(tmp_csv) == 2
+        out = reg.export_csv(tmp_path / "out.csv")
+
+    rows = read_csv(out)
+    assert rows == [
+        {"accession_id": "id1", "breed": "Labrador"},
+        {"accession_id": "id2", "breed": "Poodle"},
+    ]
+
+
+def test_registry_import_accepts_breed_name_column(tmp_path: Path):
+    lookup = tmp_path / "lookup.csv"
+    lookup.write_text("accession_id,breed_name\nAY1.1,Shih Tzu\n", encoding="utf-8")
+
+    with BreedRegistry() as reg:
+        reg.import_csv(lookup)
+        assert reg.get("AY1.1") == "Shih Tzu"
+
+
+def test_update_mapping_csv_never_duplicates(tmp_csv: Path):
+    update_mapping_csv(tmp_csv, {"id3": "Boxer"})
+    update_mapping_csv(tmp_csv, {"id3": "Beagle"})
+
+    rows = read_csv(tmp_csv)
+    ids = [r["accession_id"] for r in rows]
+    assert ids == ["id1", "id2", "id3"]
+    assert rows[-1]["breed"] == "Beagle"
+
+
+def test_update_mapping_csv_picks_up_manual_edits(tmp_csv: Path):
+    update_mapping_csv(tmp_csv, {"id3": "Boxer"})
+
+    # Someone edits the CSV by hand: the registry must re-import it
+    tmp_csv.write_text("accession_id,breed\nid9,Dachshund\n", encoding="utf-8")
+    update_mapping_csv(tmp_csv, {"id10": "Pug"})
+
+    breeds = {r["accession_id"]: r["breed"] for r in read_csv(tmp_csv)}
+    assert breeds == {"id9": "Dachshund", "id10": "Pug"}
+
+
+def test_registry_resyncs_same_size_edit_with_same_mtime(tmp_csv: Path):
+    with BreedRegistry.for_csv(tmp_csv) as reg:
+        assert reg.get("id1") == "Labrador"
+
+    st = tmp_csv.stat()
+    tmp_csv.write_text("accession_id,breed\nid1,Labradoo\nid2,Poodle\n", encoding="utf-8")
+    os.utime(tmp_csv, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert tmp_csv.stat().st_size == st.st_size
+
+    with BreedRegistry.for_csv(tmp_csv) as reg:
+        assert reg.get("id1") == "Labradoo"
+
+
+def test_export_keeps_csv_permissions(tmp_csv: Path):
+    os.chmod(tmp_csv, 0o644)
+    update_mapping_csv(tmp_csv, {"id3": "Boxer"})
+    assert os.stat(tmp_csv).st_mode & 0o777 == 0o644
+
+    created = tmp_csv.with_name("created.csv")
+    update_mapping_csv(created, {"id1": "Pug"})
+    umask = os.umask(0)
+    os.umask(umask)
+    assert os.stat(created).st_mode & 0o777 == 0o666 & ~umask
@@ -0,0 +1,61 @@
+import hashlib
+import random
+import pytest
+from dogbreed.circular import (ROTATIONS_SUFFIX, RotationAnchor, RotationCache, _OFFSETS, canonicalize,
+                               compare_circular, rotate)
+
+
+@pytest.fixture
+def genome():
+    rng = random.Random(11)
+    return "".join(rng.choice("ACGT") for _ in range(300))
+
+
+def test_find_offset_recovers_rotation(genome):
+    anchor = RotationAnchor(genome, k=11)
+    shifted = rotate(genome, 123)
+
+    rotated, offset = canonicalize(shifted, anchor)
+    assert offset == (300 - 123)
+    assert rotated == genome
+
+
+def test_rotation_offsets_are_cached_by_reference_hash(genome):
+    anchor = RotationAnchor(genome, k=11)
+    shifted = rotate(genome, 50)
+    with RotationCache() as cache:
+        assert canonicalize(shifted, anchor, cache)[1] == 250
+        key = hashlib.sha256(shifted.encode()).hexdigest()
+        assert cache.get(anchor.sha256, key, 11) == 250
+
+        # Cached value is used instead of recomputing
+        cache.put(anchor.sha256, key, 11, 7)
+        assert canonicalize(shifted, anchor, cache)[1] == 7
+
+
+def test_rotations_are_cached_by_default(genome, tmp_path, monkeypatch):
+    calls = []
+    real = RotationAnchor.find_offset
+    monkeypatch.setattr(RotationAnchor, "find_offset", lambda self, seq: calls.append(seq) or real(self, seq))
+
+    anchor = RotationAnchor(genome, k=11)
+    canonicalize(rotate(genome, 33), anchor)
+    canonicalize(rotate(genome, 33), anchor)
+    assert len(calls) == 1
+
+    fasta = tmp_path / "refs.fa"
+    fasta.write_text(f">Lab\n{rotate(genome, 200)}\n>Husky\n{rotate(genome, 20)}\n")
+    compare_circular(rotate(genome, 90), str(fasta), k=13)
+    assert (tmp_path / ("refs.fa" + ROTATIONS_SUFFIX)).exists()
+    before = len(calls)
+    _OFFSETS.clear()
+    compare_circular(rotate(genome, 90), str(fasta), k=13)
+    assert len(calls) == before  # every offset came from the sidecar
+
+
+def test_compare_circular_ignores_start_coordinate(genome):
+    other = genome[:150] + "".join("A" if c != "A" else "C" for c in genome[150:170]) + genome[170:]
+    refs = [("Lab", rotate(genome, 200)), ("Poodle", other)]
+
+    ranked = compare_circular(rotate(genome, 90), refs, k=11)
+    assert ranked[0] == ("Lab", 100.0)
@@ -0,0 +1,43 @@
+from pathlib import Path
+import random
+import pytest
+from dogbreed.cluster import cluster_records, load_clusters, write_clusters
+from dogbreed.compare_sequences import compare_sequences
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(11)
+    a = "".join(rng.choice("ACGT") for _ in range(120))
+    b = "".join(rng.choice("ACGT") for _ in range(120))
+    a_var = a[:60] + ("C" if a[60] != "C" else "G") + a[61:]
+    return [("A1", a), ("A2", a_var), ("B1", b)]
+
+
+def test_cluster_records_groups_near_identical(panel):
+    clusters = cluster_records(panel, identity=0.95)
+    assert len(clusters) == 2
+    members = {rep: [m for m, _ in ms] for rep, ms in clusters.items()}
+    assert sorted(members.values()) == [["A1", "A2"], ["B1"]]
+
+
+def test_write_and_load_clusters(panel, tmp_path: Path):
+    clusters = cluster_records(panel, identity=0.95)
+    reps, table = write_clusters(clusters, panel, tmp_path / "reps.fa", tmp_path / "clusters.csv",
+                                 mapping={"A1": "Labrador", "A2": "Labrador", "B1": "Poodle"})
+
+    assert Path(reps).read_text().count(">") == 2
+    assert "Labrador" in Path(table).read_text()
+    loaded = load_clusters(table)
+    assert sorted(sorted(m) for m in loaded.values()) == [["A1", "A2"], ["B1"]]
+
+
+def test_compare_sequences_expands_only_winning_cluster(panel):
+    records = panel + [("B2", panel[2][1][:-1] + "A")]
+    clusters = {"A1": ["A1", "A2"], "B1": ["B1", "B2"]}
+    ranked = compare_sequences(panel[1][1], records, clusters=clusters)
+
+    ids = {rid for rid, _ in ranked}
+    assert ranked[0][0] in {"A1", "A2"}
+    # Losing cluster contributes only its representative
+    assert ids == {"A1", "A2", "B1"}
@@ -22,3 +22,36 @@ def test_closest_match_returns_best_id(tmp_path: Path):
     fa.write_text(">A\nACGT\n>B\nACGA\n", encoding="utf-8")
     best = CLOSEST("ACGT", str(fa))
     assert isinstance(best, (str, tuple, dict))
+
+
+def test_iter_compare_yields_incrementally_with_top_k(tmp_path: Path):
+    """Streaming API yields every pair and keeps a running top-k."""
+    fa = tmp_path / "dogs.fa"
+    fa.write_text(">A\nACGTACGT\n>B\nTTTTTTTT\n>C\nACGTACGA\n", encoding="utf-8")
+    seen = []
+    stream = mod.iter_compare("ACGTACGT", str(fa), top_k=2,
+                              progress=lambda done, top: seen.append((done, top[0][0])))
+
+    rows = list(stream)
+    assert [rid for rid, _ in rows] == ["A", "B", "C"]
+    assert seen[0] == (1, "A")
+    assert len(stream.top) == 2 and stream.top[0] == ("A", 100.0)
+    assert stream.stopped is None
+
+
+def test_iter_compare_cancellation_and_stop_when(tmp_path: Path):
+    """Cancellation token, deadline and stop_when all stop iteration early."""
+    records = [(f"r{i}", "ACGT") for i in range(10)]
+
+    token = mod.CancellationToken()
+    stream = mod.iter_compare("ACGT", records, cancel=token)
+    for i, _ in enumerate(stream):
+        if i == 2:
+            token.cancel()
+    assert stream.done == 3 and stream.stopped == "cancelled"
+
+    stream = mod.iter_compare("ACGT", records, deadline=0.0)
+    assert list(stream) == [] and stream.stopped == "deadline"
+
+    stream = mod.iter_compare("ACGT", records, stop_when=lambda top: bool(top) and top[0][1] == 100.0)
+    assert len(list(stream)) == 1 and stream.stopped == "stop_when"
@@ -0,0 +1,36 @@
+from pathlib import Path
+import pytest
+from dogbreed.fasta_rewriter import manifest_path, rewrite_fasta_ids
+
+
+def test_rewrite_fasta_ids_streams_names(tmp_fasta: Path, tmp_path: Path):
+    out = tmp_path / "named.fa"
+    rewrite_fasta_ids(tmp_fasta, {"id1": "Golden Retriever"}, out,
+                      fallback="Unknown_{accession}", replace_spaces=True, description=False)
+
+    assert out.read_text().splitlines()[::2] == [">Golden_Retriever", ">Unknown_id2"]
+    assert manifest_path(out).exists()
+
+
+def test_rewrite_fasta_ids_skips_when_unchanged(tmp_fasta: Path, tmp_path: Path):
+    out = tmp_path / "named.fa"
+    mapping = {"id1": "Labrador"}
+    rewrite_fasta_ids(tmp_fasta, mapping, out)
+    first = out.stat().st_mtime_ns
+
+    rewrite_fasta_ids(tmp_fasta, mapping, out)
+    assert out.stat().st_mtime_ns == first
+
+
+def test_rewrite_fasta_ids_regenerates_stale_output(tmp_fasta: Path, tmp_path: Path):
+    out = tmp_path / "named.fa"
+    rewrite_fasta_ids(tmp_fasta, {"id1": "Labrador"}, out)
+
+    # Mapping changed → regenerate
+    rewrite_fasta_ids(tmp_fasta, {"id1": "Poodle"}, out)
+    assert ">Poodle" in out.read_text()
+
+    # Input changed → regenerate
+    tmp_fasta.write_text(">id1\nACGT\n>id3\nTTTT\n", encoding="utf-8")
+    rewrite_fasta_ids(tmp_fasta, {"id1": "Poodle"}, out)
+    assert ">id3" in out.read_text()
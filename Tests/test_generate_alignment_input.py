@@ -45,3 +45,12 @@ def test_generate_alignment_input_with_missing_id(tmp_path: Path):
     assert "Labrador" in contents
     # id3 should still appear (no mapping found)
     assert "id3" in contents
+
+
+def test_generate_alignment_input_missing_map_raises(tmp_path: Path):
+    fasta_path = tmp_path / "dog_sequences.fa"
+    fasta_path.write_text(">id1\nAAAA\n", encoding="utf-8")
+
+    with pytest.raises(FileNotFoundError):
+        generate_alignment_input(fasta_path, tmp_path / "breed_mapping.csv.typo", tmp_path)
+    assert not (tmp_path / "alignment_with_names.fa").exists()
@@ -0,0 +1,46 @@
+from pathlib import Path
+import numpy as np
+import pytest
+from dogbreed.compare_sequences import percent_identity
+from dogbreed.identity_matrix import compute_identity_matrix, load_identity_matrix
+from dogbreed.shared_refs import worker_state
+
+
+@pytest.fixture
+def records():
+    return [("A", "ACGTACGT"), ("B", "ACGTTTGT"), ("C", "TTTTTTTT"), ("D", "ACGAACGT"), ("E", "GGGGCCCC")]
+
+
+def test_identity_matrix_is_symmetric_and_complete(records, tmp_path: Path):
+    out = compute_identity_matrix(records, tmp_path / "ident.npy", tile_size=2, processes=2)
+    ids, m = load_identity_matrix(out)
+
+    assert ids == ["A", "B", "C", "D", "E"]
+    assert not np.isnan(m).any()
+    assert np.allclose(m, m.T)
+    assert np.allclose(np.diag(m), 100.0)
+    assert m[0, 1] == pytest.approx(percent_identity("ACGTACGT", "ACGTTTGT"), abs=1e-4)
+
+
+def test_identity_matrix_resumes_from_checkpoint(records, tmp_path: Path):
+    out = tmp_path / "ident.npy"
+    compute_identity_matrix(records, out, tile_size=2, processes=1)
+    ckpt = out.with_name(out.name + ".tiles")
+    tiles = ckpt.read_text().splitlines()
+    assert len(tiles) == 6  # 3 blocks → upper triangle of 3x3 tiles
+
+    # Simulate an interrupted run: last tile lost, its cells never written
+    ckpt.write_text("\n".join(tiles[:-1]) + "\n")
+    m = np.lib.format.open_memmap(out, mode="r+")
+    m[4, 4] = np.nan
+    m.flush()
+    del m
+
+    compute_identity_matrix(records, out, tile_size=2, processes=1)
+    assert len(ckpt.read_text().splitlines()) == 6
+    assert load_identity_matrix(out)[1][4, 4] == 100.0
+
+
+def test_in_process_run_leaves_no_worker_state(records, tmp_path: Path):
+    compute_identity_matrix(records, tmp_path / "ident.npy", tile_size=2, processes=1)
+    assert "store" not in worker_state()
@@ -0,0 +1,41 @@
+import random
+from pathlib import Path
+import numpy as np
+import pytest
+from dogbreed.identity_profile import identity_profile, plot_profiles, top_hit_profiles, window_profile
+
+
+@pytest.fixture
+def ref():
+    rng = random.Random(4)
+    return "".join(rng.choice("ACGT") for _ in range(600))
+
+
+def test_window_profile_uses_prefix_sums():
+    match = np.array([1, 1, 0, 0, 1, 1, 1, 1], dtype=bool)
+    gap = np.array([0, 0, 1, 1, 0, 0, 0, 0], dtype=bool)
+    prof = window_profile(match, gap, window=4, step=2)
+    assert prof["start"].tolist() == [0, 2, 4]
+    assert prof["identity"].tolist() == [50.0, 50.0, 100.0]
+    assert prof["gap_fraction"].tolist() == [0.5, 0.5, 0.0]
+
+
+def test_profile_localises_divergent_region(ref):
+    # Replace positions 300-360 with a different block
+    query = ref[:300] + "".join("A" if c != "A" else "C" for c in ref[300:360]) + ref[360:]
+    prof = identity_profile(query, ref, window=60, step=60)
+    low = prof["start"][prof["identity"] < 50]
+    assert low.tolist() == [300]
+    assert len(prof["match"]) == len(ref)
+
+
+def test_top_hit_profiles_and_plot(ref, tmp_path: Path):
+    other = "".join(random.Random(8).choice("ACGT") for _ in range(600))
+    profiles = top_hit_profiles(ref[:500], [("Far", other), ("Lab", ref)], top_k=1, window=100, step=100,
+                                ranked=[("Lab", 100.0)])
+    assert list(profiles) == ["Lab"]
+    assert profiles["Lab"]["identity"][0] == 100.0
+    assert profiles["Lab"]["gap"][500:].mean() > 0.9  # query ends early
+
+    png = plot_profiles(profiles, tmp_path / "profile.png", window=100)
+    assert png is None or Path(png).exists()
@@ -0,0 +1,52 @@
+import os
+from pathlib import Path
+from Bio import SeqIO
+from dogbreed.ingest import ingest_directory, state_path
+
+
+def _write(path: Path, text: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _tree(src: Path):
+    _write(src / "AY656744.fasta", ">AY656744.1 springer\nacgtacgtu\nACGT\n")
+    _write(src / "sub" / "CM023446.fasta", ">CM023446.1\nTTTTGGGGCCCC\n")
+    _write(src / "sub" / "copy.fasta", ">AY656744.1\nGGGG\n>XX000001.1\nACGTACGTTACGT\n")
+    _write(src / "bad.fa", ">empty\n\n>masked\nNNNNNNNA\n")
+    _write(src / "notes.txt", "not a fasta")
+
+
+def test_ingest_dedupes_normalises_and_labels(tmp_path: Path):
+    src, out = tmp_path / "fasta_files", tmp_path / "dog_sequences.fa"
+    _tree(src)
+    mapping = {"AY656744.1": "English Springer Spaniel", "CM023446": "Golden Retriever"}
+
+    summary = ingest_directory(src, out, mapping=mapping, processes=1)
+    recs = list(SeqIO.parse(out, "fasta"))
+
+    assert [r.id for r in recs] == ["AY656744.1", "CM023446.1"]
+    assert str(recs[0].seq) == "ACGTACGTTACGT"
+    assert recs[0].description == "AY656744.1 English Springer Spaniel"
+    assert recs[1].description == "CM023446.1 Golden Retriever"  # unversioned mapping key
+    assert summary["duplicate_accessions"] == 1
+    assert summary["duplicate_sequences"] == 1
+    assert len(summary["problems"]) == 2
+    assert state_path(out).exists()
+
+
+def test_ingest_skips_unchanged_files(tmp_path: Path):
+    src, out = tmp_path / "fasta_files", tmp_path / "dog_sequences.fa"
+    _tree(src)
+    ingest_directory(src, out, processes=1)
+
+    again = ingest_directory(src, out, processes=2, batch_size=1)
+    # copy.fasta only holds duplicates, which are not in the output, so it is re-read
+    assert (again["reused"], again["parsed"]) == (3, 1)
+
+    changed = _write(src / "sub" / "CM023446.fasta", ">CM023446.1\nAAAACCCC\n")
+    os.utime(changed, ns=(1, 1))
+    third = ingest_directory(src, out, processes=2, batch_size=1)
+    assert third["parsed"] == 2
+    assert {r.id: str(r.seq) for r in SeqIO.parse(out, "fasta")}["CM023446.1"] == "AAAACCCC"
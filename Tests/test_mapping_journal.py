@@ -0,0 +1,145 @@
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import threading
+import pytest
+from dogbreed.io_utils import file_sha256
+from dogbreed.mapping_journal import MappingJournal, apply_updates, file_lock
+from dogbreed.update_breeds import update_breed_mapping_file
+
+
+def read_csv(path: Path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_journal_append_and_read_merged(tmp_csv: Path):
+    journal = MappingJournal(tmp_csv)
+    journal.append({"id3": "Beagle"})
+    journal.append([("id1", "Golden Retriever")])
+
+    # Base CSV is untouched until compaction, readers still see the updates
+    assert len(read_csv(tmp_csv)) == 2
+    assert journal.read_merged() == {"id1": "Golden Retriever", "id2": "Poodle", "id3": "Beagle"}
+
+
+def test_journal_ignores_partial_trailing_line(tmp_csv: Path):
+    journal = MappingJournal(tmp_csv)
+    journal.append({"id3": "Beagle"})
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write("id4,Pug")  # writer still in progress
+
+    assert journal.pending() == [("id3", "Beagle")]
+
+
+def test_journal_compaction_folds_into_csv(tmp_csv: Path):
+    journal = MappingJournal(tmp_csv)
+    journal.append({"id3": "Beagle", "id1": "Boxer"})
+
+    assert journal.compact() == 2
+    assert journal.pending() == []
+    breeds = {r["accession_id"]: r["breed"] for r in read_csv(tmp_csv)}
+    assert breeds == {"id1": "Boxer", "id2": "Poodle", "id3": "Beagle"}
+
+
+def test_apply_updates_never_duplicates(tmp_csv: Path):
+    apply_updates(tmp_csv, {"id3": "Boxer"})
+    apply_updates(tmp_csv, {"id3": "Beagle"})
+    MappingJournal(tmp_csv).compact()
+
+    rows = read_csv(tmp_csv)
+    assert [r["accession_id"] for r in rows] == ["id1", "id2", "id3"]
+    assert rows[-1]["breed"] == "Beagle"
+
+
+def test_apply_updates_picks_up_manual_edits(tmp_csv: Path):
+    apply_updates(tmp_csv, {"id3": "Boxer"}, write_through=True)
+
+    # Someone edits the CSV by hand: the registry must re-import it
+    tmp_csv.write_text("accession_id,breed\nid9,Dachshund\n", encoding="utf-8")
+    apply_updates(tmp_csv, {"id10": "Pug"}, write_through=True)
+
+    breeds = {r["accession_id"]: r["breed"] for r in read_csv(tmp_csv)}
+    assert breeds == {"id9": "Dachshund", "id10": "Pug"}
+
+
+def test_concurrent_updates_are_not_lost(tmp_csv: Path):
+    def worker(i: int) -> None:
+        update_breed_mapping_file(tmp_csv, {f"acc{i}": f"Breed {i}"})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(40)))
+
+    journal = MappingJournal(tmp_csv)
+    merged = journal.read_merged()
+    assert all(merged[f"acc{i}"] == f"Breed {i}" for i in range(40))
+    assert len(merged) == 42
+
+    journal.compact()
+    breeds = {r["accession_id"]: r["breed"] for r in read_csv(tmp_csv)}
+    assert breeds == merged
+
+
+def _large_csv(path: Path, rows: int) -> Path:
+    path.write_text("accession_id,breed\n" + "".join(f"ACC{i:05d},Breed {i}\n" for i in range(rows)),
+                    encoding="utf-8")
+    return path
+
+
+def test_apply_updates_appends_without_rewriting_csv(tmp_path: Path):
+    csv_path = _large_csv(tmp_path / "breed_mapping.csv", 200)
+    before = csv_path.read_bytes()
+
+    apply_updates(csv_path, {"ACC00001": "Boxer", "NEW1": "Pug"})
+    assert csv_path.read_bytes() == before
+    journal = MappingJournal(csv_path)
+    assert journal.pending() == [("ACC00001", "Boxer"), ("NEW1", "Pug")]
+    merged = journal.read_merged()
+    assert merged["ACC00001"] == "Boxer" and merged["NEW1"] == "Pug"
+
+    # Enough appends to outgrow the threshold fold the journal into the CSV
+    i = 0
+    while csv_path.read_bytes() == before:
+        apply_updates(csv_path, {f"NEW{i}": "Beagle"})
+        i += 1
+    assert journal.pending() == []
+    assert journal.read_merged() == dict((r["accession_id"], r["breed"]) for r in read_csv(csv_path))
+    assert 1 < i < 200
+
+
+def test_compact_updates_win_over_older_journal_values(tmp_csv: Path):
+    journal = MappingJournal(tmp_csv)
+    journal.append({"id1": "Old"})
+    journal.compact({"id1": "New"})
+
+    assert {r["accession_id"]: r["breed"] for r in read_csv(tmp_csv)}["id1"] == "New"
+    assert journal.read_merged()["id1"] == "New"
+
+
+def test_read_merged_waits_out_a_compaction_swap(tmp_csv: Path):
+    journal = MappingJournal(tmp_csv)
+    journal.append({"id1": "Old"})
+    seen = {}
+
+    with file_lock(journal.lock_path):
+        # Mid-compaction: the CSV already holds the folded entry, the journal is not reset yet
+        tmp_csv.write_text("accession_id,breed\nid1,New\nid2,Poodle\n", encoding="utf-8")
+        reader = threading.Thread(target=lambda: seen.update(journal.read_merged()))
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive()  # generations differ, so the reader waits for the lock
+        journal._reset(file_sha256(tmp_csv))
+    reader.join()
+    assert seen == {"id1": "New", "id2": "Poodle"}
+
+
+def test_small_csv_batches_updates_and_readers_create_no_files(tmp_csv: Path):
+    before = tmp_csv.read_bytes()
+    journal = MappingJournal(tmp_csv)
+    assert journal.read_merged() == {"id1": "Labrador", "id2": "Poodle"}
+    assert sorted(p.name for p in tmp_csv.parent.iterdir()) == [tmp_csv.name]
+
+    # The `# base` header does not count towards the threshold, so one short update stays journalled
+    apply_updates(tmp_csv, {"id3": "Pug"})
+    assert tmp_csv.read_bytes() == before
+    assert journal.pending() == [("id3", "Pug")]
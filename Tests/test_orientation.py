@@ -0,0 +1,70 @@
+import random
+import pytest
+from dogbreed.compare_sequences import compare_oriented, compare_sequences
+from dogbreed.orientation import OrientationIndex, detect_orientation
+from dogbreed.sequence_utils import reverse_complement
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(7)
+    return [(name, "".join(rng.choice("ACGT") for _ in range(120))) for name in ("Lab", "Poodle", "Husky")]
+
+
+def test_orientation_votes_and_flips_only_when_needed(panel):
+    index = OrientationIndex(panel, k=11)
+    query = panel[1][1][10:100]
+
+    assert index.orient(query) == (query, "+")
+    flipped, strand = index.orient(reverse_complement(query))
+    assert (flipped, strand) == (query, "-")
+
+    fwd, rev = index.votes(reverse_complement(query))
+    assert rev > fwd
+    assert detect_orientation("ACG", panel) == "+"  # shorter than k: no votes, keep as is
+
+
+def test_compare_sequences_records_strand(panel):
+    query = reverse_complement(panel[0][1])
+
+    plain = compare_sequences(query, panel)
+    assert all(len(row) == 2 for row in plain)
+
+    rows = compare_sequences(query, iter(panel), orient=True)
+    assert rows[0] == ("Lab", 100.0)
+    assert all(len(row) == 2 for row in rows)  # same row shape with or without orient
+
+    rows, strand = compare_oriented(query, iter(panel))
+    assert rows[0] == ("Lab", 100.0) and strand == "-"
+
+
+def test_path_index_is_cached_per_file_content(panel, tmp_path):
+    fasta = tmp_path / "refs.fa"
+    fasta.write_text("".join(f">{rid}\n{seq}\n" for rid, seq in panel), encoding="utf-8")
+
+    first = OrientationIndex.for_path(fasta)
+    assert OrientationIndex.for_path(fasta) is first
+    rows, strand = compare_oriented(reverse_complement(panel[2][1]), str(fasta))
+    assert dict(rows)["Husky"] == 100.0 and strand == "-"
+
+    fasta.write_text(f">Lab\n{panel[0][1]}\n", encoding="utf-8")
+    assert OrientationIndex.for_path(fasta) is not first
+
+
+def test_path_indexes_are_bounded_lru(panel, tmp_path):
+    from dogbreed import orientation
+
+    paths = []
+    for i in range(orientation._MAX_PATH_INDEXES + 1):
+        fasta = tmp_path / f"refs{i}.fa"
+        fasta.write_text(f">{panel[0][0]}\n{panel[0][1]}\n", encoding="utf-8")
+        paths.append(fasta)
+
+    first = OrientationIndex.for_path(paths[0])
+    for fasta in paths[1:-1]:
+        OrientationIndex.for_path(fasta)
+    assert OrientationIndex.for_path(paths[0]) is first  # refreshed: now most recently used
+    OrientationIndex.for_path(paths[-1])
+
+    assert len(orientation._PATH_INDEXES) <= orientation._MAX_PATH_INDEXES
+    assert OrientationIndex.for_path(paths[0]) is first  # paths[1] was evicted instead
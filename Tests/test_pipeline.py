@@ -0,0 +1,69 @@
+from pathlib import Path
+import threading
+import pytest
+from dogbreed.pipeline import Pipeline, Stage, explain
+from dogbreed.dog_breed_identifier import DogBreedIdentifier
+
+
+def _copy_stage(name, src: Path, dst: Path, calls: list, deps=()):
+    def action():
+        calls.append(name)
+        dst.write_text(src.read_text().upper())
+    return Stage(name, action, inputs=[src], outputs=[dst], deps=deps)
+
+
+def test_pipeline_skips_unchanged_and_explains(tmp_path: Path):
+    src, mid, out = tmp_path / "a.txt", tmp_path / "b.txt", tmp_path / "c.txt"
+    src.write_text("acgt")
+    calls = []
+
+    def build():
+        pipe = Pipeline(tmp_path / "state.json")
+        pipe.add(_copy_stage("first", src, mid, calls))
+        pipe.add(_copy_stage("second", mid, out, calls, deps=["first"]))
+        return pipe
+
+    build().run()
+    assert calls == ["first", "second"]
+
+    # Nothing changed → both stages skipped
+    report = build().run()
+    assert calls == ["first", "second"]
+    assert explain(report) == ["first: up to date, skipped", "second: up to date, skipped"]
+
+    # Changed input → stage re-runs and says why
+    src.write_text("ttgg")
+    report = dict((name, reasons) for name, _, reasons in build().run())
+    assert report["first"] == [f"input changed: {src}"]
+    assert out.read_text() == "TTGG"
+
+
+def test_pipeline_runs_independent_stages_concurrently(tmp_path: Path):
+    barrier = threading.Barrier(2, timeout=5)
+    pipe = Pipeline(tmp_path / "state.json")
+    pipe.add(Stage("left", barrier.wait))
+    pipe.add(Stage("right", barrier.wait))
+
+    # Would time out (BrokenBarrierError) if the stages ran one after another
+    report = pipe.run()
+    assert sorted(name for name, ran, _ in report if ran) == ["left", "right"]
+
+
+def test_identifier_run_is_incremental(tmp_path: Path):
+    fasta_path = tmp_path / "dog_sequences.fa"
+    mystery_path = tmp_path / "mystery.fa"
+    fasta_path.write_text(">id1\nAAAA\n>id2\nCCCC\n")
+    mystery_path.write_text(">mystery\nAAAA\n")
+
+    map_path = tmp_path / "map.csv"
+    map_path.write_text("accession_id,breed\n")
+    identifier = DogBreedIdentifier(fasta_path, mystery_path, tmp_path / "results", map_file=map_path)
+    best, report = identifier.run()
+    assert best == ("id1", 100.0)
+    assert all(ran for _, ran, _ in report)
+
+    # Only the mystery changed → rename and tree are skipped
+    mystery_path.write_text(">mystery\nCCCC\n")
+    best, report = identifier.run()
+    assert best == ("id2", 100.0)
+    assert {name: ran for name, ran, _ in report} == {"rename": False, "identify": True, "tree": False}
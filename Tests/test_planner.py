@@ -0,0 +1,58 @@
+import logging
+import random
+import pytest
+from dogbreed.planner import (BANDED, FULL, HAMMING, QueryPlanner, banded_identity, compare_planned,
+                              full_identity, hamming_identity)
+
+
+def _lcs(a: str, b: str) -> int:
+    prev = [0] * (len(b) + 1)
+    for ca in a:
+        cur = [0]
+        for j, cb in enumerate(b, start=1):
+            cur.append(prev[j - 1] + 1 if ca == cb else max(prev[j], cur[j - 1]))
+        prev = cur
+    return prev[-1]
+
+
+@pytest.fixture
+def base():
+    rng = random.Random(21)
+    return "".join(rng.choice("ACGT") for _ in range(400))
+
+
+def test_banded_identity_matches_exact_lcs_inside_band(base):
+    other = base[:100] + base[103:250] + "GATTACA" + base[250:]
+    exact = _lcs(base, other) / max(len(base), len(other)) * 100.0
+    assert banded_identity(base, other, band=20) == pytest.approx(exact)
+    assert banded_identity(base, other, band=1) <= exact  # narrow band is a lower bound
+    assert hamming_identity("ACGT", "ACGA") == 75.0
+
+
+def test_planner_dispatch_and_audit(base, caplog):
+    rng = random.Random(1)
+    snp = base[:200] + ("A" if base[200] != "A" else "C") + base[201:]
+    indel = base[:150] + base[160:]
+    unrelated = "".join(rng.choice("ACGT") for _ in range(300))
+    planner = QueryPlanner()
+
+    assert planner.plan(base, snp).engine == HAMMING
+    banded = planner.plan(base, indel)
+    assert banded.engine == BANDED and banded.band >= 10
+    assert planner.plan(base, unrelated).engine == FULL
+
+    audit = []
+    with caplog.at_level(logging.INFO, logger="dogbreed.planner"):
+        ranked = compare_planned(base, [("Snp", snp), ("Indel", indel), ("Far", unrelated)], audit=audit)
+    assert [r[0] for r in ranked] == ["Snp", "Indel", "Far"]
+    assert [(rid, p.engine) for rid, p in audit] == [("Snp", HAMMING), ("Indel", BANDED), ("Far", FULL)]
+    assert sum("planner:" in r.message for r in caplog.records) == 3
+
+
+def test_engines_share_one_objective(base):
+    other = base[:100] + base[103:250] + "GATTACA" + base[250:]
+    exact = _lcs(base, other) / max(len(base), len(other)) * 100.0
+    assert full_identity(base, other) == pytest.approx(exact)
+    assert banded_identity(base, other, band=20) == pytest.approx(full_identity(base, other))
+    snp = base[:200] + ("A" if base[200] != "A" else "C") + base[201:]
+    assert hamming_identity(base, snp) <= full_identity(base, snp)
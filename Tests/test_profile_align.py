@@ -0,0 +1,69 @@
+from pathlib import Path
+from Bio import AlignIO
+from dogbreed.generate_phylogenetic_tree import generate_tree
+from dogbreed.profile_align import ColumnProfile, add_to_alignment, align_to_profile, load_profile, profile_path
+
+
+def _alignment(path: Path) -> Path:
+    path.write_text(
+        ">Lab Labrador\nACGTAC-GTACGT\n"
+        ">Poodle\nACGTACTGTACGT\n"
+        ">Husky\nACGAAC-GTACGT\n"
+    )
+    return path
+
+
+def test_profile_frequencies_and_cache(tmp_path: Path):
+    aln = _alignment(tmp_path / "aligned.fa")
+    profile = load_profile(aln)
+    assert len(profile) == 13 and profile.n_seqs == 3
+    assert profile.freqs[0, 0] == 1.0            # column 0 is all A
+    assert abs(profile.gap[6] - 2 / 3) < 1e-12   # column 6 is gapped in two rows
+    assert profile_path(aln).exists()
+
+    cached = load_profile(aln)
+    assert cached.source_sha256 == profile.source_sha256
+
+    aln.write_text(">A\nAC\n>B\nAG\n")  # content change invalidates the cache
+    assert len(load_profile(aln)) == 2
+
+
+def test_align_to_profile_gaps_and_insertions(tmp_path: Path):
+    profile = ColumnProfile.from_alignment(_alignment(tmp_path / "aligned.fa"))
+
+    row, inserted = align_to_profile("ACGTACGTACGT", profile)
+    assert row == "ACGTAC-GTACGT" and not inserted
+
+    row, inserted = align_to_profile("ACGTACGGGGGTACGT", profile)
+    assert len(row) == len(profile)
+    assert sum(len(v) for v in inserted.values()) == 16 - sum(c != "-" for c in row)
+
+
+def test_add_to_alignment_extends_every_row(tmp_path: Path):
+    aln = _alignment(tmp_path / "aligned.fa")
+    out = add_to_alignment(aln, [("Mystery", "ACGTACGGGGGTACGT"), ("Twin", "ACGTACGTACGT")],
+                           tmp_path / "extended.fa")
+
+    _, inserted = align_to_profile("ACGTACGGGGGTACGT", load_profile(aln))
+    extended = AlignIO.read(out, "fasta")
+    assert len(extended) == 5
+    assert extended.get_alignment_length() == 13 + sum(len(v) for v in inserted.values()) > 13
+    assert str(extended[-2].seq).replace("-", "") == "ACGTACGGGGGTACGT"
+    assert str(extended[0].seq).replace("-", "") == "ACGTACGTACGT"
+    assert extended[0].description == "Lab Labrador"
+
+    written = generate_tree(out, tmp_path / "tree")
+    assert Path(written[0]).exists()
+
+
+def test_truncated_cache_is_rebuilt_and_empty_records_skipped(tmp_path: Path):
+    aln = _alignment(tmp_path / "aligned.fa")
+    load_profile(aln)
+    cache = profile_path(aln)
+    cache.write_bytes(cache.read_bytes()[:40])  # a partial write from an older, non-atomic run
+    assert len(load_profile(aln)) == 13
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []  # no temp files left
+
+    out = add_to_alignment(aln, [("Blank", ""), ("Twin", "ACGTACGTACGT")], tmp_path / "extended.fa")
+    extended = AlignIO.read(out, "fasta")
+    assert [rec.id for rec in extended] == ["Lab", "Poodle", "Husky", "Twin"]
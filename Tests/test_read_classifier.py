@@ -0,0 +1,69 @@
+from pathlib import Path
+import gzip
+import random
+import pytest
+from dogbreed.read_classifier import CladeResolver, KmerIndex, classify_reads
+from dogbreed.sequence_utils import reverse_complement
+
+
+def _random_seq(rng: random.Random, n: int) -> str:
+    return "".join(rng.choice("ACGT") for _ in range(n))
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(7)
+    shared = _random_seq(rng, 60)
+    return [
+        ("Labrador", _random_seq(rng, 200) + shared),
+        ("Poodle", _random_seq(rng, 200) + shared),
+        ("Beagle", _random_seq(rng, 200)),
+    ]
+
+
+def _write_fastq(path: Path, reads, gz: bool = False) -> Path:
+    text = "".join(f"@r{i}\n{seq}\n+\n{'I' * len(seq)}\n" for i, seq in enumerate(reads))
+    if gz:
+        with gzip.open(path, "wt") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+    return path
+
+
+def test_classify_reads_counts_and_abundance(tmp_path: Path, panel):
+    lab, poodle, _ = (seq for _, seq in panel)
+    reads = [lab[10:60]] * 3 + [reverse_complement(poodle[20:70])] + ["N" * 50, ""]
+    fastq = _write_fastq(tmp_path / "reads.fq.gz", reads, gz=True)
+
+    summary = classify_reads(fastq, panel, k=15)
+    assert summary["total"] == 6
+    assert summary["unclassified"] == 2
+    assert summary["counts"] == {"Labrador": 3, "Poodle": 1}
+    assert summary["abundance"]["Labrador"] == 0.75
+
+
+def test_ambiguous_reads_resolve_to_common_clade(tmp_path: Path, panel):
+    tree = tmp_path / "tree.nwk"
+    tree.write_text("((Labrador:0.1,Poodle:0.1):0.2,Beagle:0.3);")
+    shared_read = panel[0][1][-55:]  # present in both Labrador and Poodle
+    fastq = _write_fastq(tmp_path / "reads.fq", [shared_read])
+
+    summary = classify_reads(fastq, panel, tree=tree, k=15)
+    assert summary["counts"] == {"(Labrador,Poodle)": 1}
+
+
+def test_classify_reads_with_worker_processes(tmp_path: Path, panel):
+    reads = [seq[i:i + 50] for _, seq in panel for i in range(0, 150, 25)]
+    fastq = _write_fastq(tmp_path / "reads.fq", reads)
+    index = KmerIndex(panel, k=15)
+
+    serial = classify_reads(fastq, index)
+    parallel = classify_reads(fastq, index, processes=2, chunk_size=4)
+    assert parallel == serial
+    assert parallel["total"] == len(reads)
+
+
+def test_clade_resolver_without_tree():
+    assert CladeResolver().resolve({"Poodle"}) == "Poodle"
+    assert CladeResolver().resolve({"Poodle", "Boxer"}) == "(Boxer,Poodle)"
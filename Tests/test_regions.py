@@ -0,0 +1,53 @@
+import random
+import pytest
+from dogbreed.regions import RegionExtractor, compare_regions, find_reference
+
+
+@pytest.fixture
+def genomes():
+    rng = random.Random(5)
+    ref = "".join(rng.choice("ACGT") for _ in range(400))
+    # Same region, shifted by a 30 bp insertion upstream and a different tail
+    shifted = ref[:50] + "G" * 30 + ref[50:350] + "T" * 20
+    return ref, shifted
+
+
+def test_region_located_by_anchors_despite_shift(genomes):
+    ref, shifted = genomes
+    extractor = RegionExtractor(ref, regions={"cr": (100, 300)}, k=11, window=40)
+
+    assert extractor.locate(ref, "cr") == (100, 300)
+    assert extractor.locate(shifted, "cr") == (130, 330)
+    assert extractor.extract(shifted, "cr") == ref[100:300]
+
+
+def test_region_falls_back_to_coordinates_without_anchors(genomes):
+    ref, _ = genomes
+    extractor = RegionExtractor(ref, regions={"cr": (100, 300)}, k=11)
+    assert extractor.locate("A" * 500, "cr") == (100, 300)
+    assert extractor.locate("A" * 50, "cr") == (0, 50)  # too short: use what is there
+
+
+def test_compare_regions_reports_region_and_genome_identity(genomes):
+    ref, shifted = genomes
+    masked = ref[:100] + "N" * 200 + ref[300:]
+    extractor = RegionExtractor(ref, regions={"cr": (100, 300)}, k=11, window=40)
+
+    rows = compare_regions(ref, [("Shifted", shifted), ("Masked", masked)], region="cr",
+                           whole_genome=True, extractor=extractor)
+    assert rows[0][:2] == ("Shifted", 100.0)
+    assert rows[1][0] == "Masked" and rows[1][1] < 100.0
+    assert all(len(row) == 3 for row in rows)
+
+
+def test_anchors_come_from_the_designated_reference(genomes):
+    ref, shifted = genomes
+    partial = ref[150:]  # listed first, but not the reference
+    records = [("Partial", partial), ("NC_002008.4", ref), ("Shifted", shifted)]
+
+    rows = dict(compare_regions(ref, records, region="HVR1", reference_id="NC_002008"))
+    assert rows["NC_002008.4"] == 100.0
+    assert find_reference(records) == ref
+
+    with pytest.raises(ValueError, match="NC_002008"):
+        compare_regions(ref, [("Partial", partial)])
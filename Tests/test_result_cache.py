@@ -0,0 +1,44 @@
+from pathlib import Path
+from dogbreed import dog_breed_identifier as ident_mod
+from dogbreed.dog_breed_identifier import DogBreedIdentifier
+from dogbreed.result_cache import ResultCache, query_key, reference_version
+
+
+def test_lru_eviction_and_version_invalidation():
+    v1 = reference_version("fasta1", "map1", {"orient": False})
+    v2 = reference_version("fasta2", "map1", {"orient": False})
+    with ResultCache(max_entries=2) as cache:
+        cache.put("a", v1, [("Lab", 99.5)])
+        cache.put("b", v1, [("Poodle", 98.0)])
+        assert cache.get("a", v1) == [("Lab", 99.5)]  # "a" is now most recent
+        cache.put("c", v1, [("Husky", 97.0)])
+        assert cache.get("b", v1) is None and len(cache) == 2
+
+        assert cache.get("a", v2) is None
+        cache.put("d", v2, [("Pug", 90.0)])
+        assert len(cache) == 1  # old-version entries dropped
+
+    assert query_key("acgu") == query_key("ACGT")
+
+
+def test_identify_reuses_cached_ranking(tmp_path: Path, monkeypatch):
+    fasta = tmp_path / "dog_sequences.fa"
+    mystery = tmp_path / "mystery.fa"
+    fasta.write_text(">id1\nAAAA\n>id2\nCCCC\n")
+    mystery.write_text(">mystery\nAAAA\n")
+
+    calls = []
+    real = ident_mod.compare_sequences
+    monkeypatch.setattr(ident_mod, "compare_sequences", lambda *a, **kw: calls.append(1) or real(*a, **kw))
+
+    empty_map = tmp_path / "map.csv"
+    empty_map.write_text("accession_id,breed\n")
+    identifier = DogBreedIdentifier(fasta, mystery, tmp_path / "out", map_file=empty_map)
+    assert identifier.identify() == [("id1", 100.0)]
+    assert identifier.identify() == [("id1", 100.0)]
+    assert len(calls) == 1
+
+    # New reference content → new version → recomputed
+    fasta.write_text(">id3\nAAAA\n>id2\nCCCC\n")
+    assert identifier.identify() == [("id3", 100.0)]
+    assert len(calls) == 2
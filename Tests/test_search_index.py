@@ -0,0 +1,64 @@
+import random
+from pathlib import Path
+import pytest
+from dogbreed.search_index import SearchIndex
+from dogbreed.update_breeds import update_breed_mapping_file
+
+
+def _seq(rng: random.Random, n: int = 200) -> str:
+    return "".join(rng.choice("ACGT") for _ in range(n))
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(9)
+    return {f"ACC{i}": _seq(rng) for i in range(6)}, rng
+
+
+def test_add_remove_relabel_without_rebuild(panel):
+    refs, rng = panel
+    index = SearchIndex.build(refs, labels={"ACC0": "Lab"}, k=11, merge_ratio=10.0)
+    assert index.candidates(refs["ACC0"][20:120])[0][0] == "ACC0"
+
+    new = _seq(rng)
+    index.add("NEW1", new, label="Husky")
+    assert index.search(new[:150], top_n=1) == [("NEW1", "Husky", 100.0)]
+
+    index.remove("ACC0")
+    assert "ACC0" not in index
+    assert all(acc != "ACC0" for acc, _ in index.candidates(refs["ACC0"]))
+
+    index.add("ACC1", refs["ACC2"])  # replacing tombstones the old document
+    assert {acc for acc, _ in index.candidates(refs["ACC1"])} == set()
+
+    index.relabel("NEW1", "Siberian Husky")
+    assert index.search(new, top_n=1)[0][1] == "Siberian Husky"
+
+
+def test_background_merge_and_persistence(panel, tmp_path: Path):
+    refs, rng = panel
+    index = SearchIndex.build(refs, k=11, merge_ratio=0.3)
+    extra = {f"X{i}": _seq(rng) for i in range(3)}
+    for acc, seq in extra.items():
+        index.add(acc, seq)
+    index.remove("ACC3")
+    index.wait_for_merge()
+    index.merge()
+    assert not index._append and not index._tombstones
+
+    index.add("LATE", refs["ACC3"])
+    loaded = SearchIndex.load(index.save(tmp_path / "index.npz"))
+    assert len(loaded) == len(index) == 9
+    assert loaded.candidates(extra["X1"])[0][0] == "X1"
+    assert loaded.candidates(refs["ACC3"])[0][0] == "LATE"
+
+
+def test_mapping_update_relabels_index(panel, tmp_path: Path):
+    refs, _ = panel
+    csv_path = tmp_path / "breed_mapping.csv"
+    csv_path.write_text("accession_id,breed\nACC0,Lab\n")
+    index = SearchIndex.build(refs, labels={"ACC0": "Lab"}, k=11)
+
+    update_breed_mapping_file(csv_path, {"ACC0": "Labrador Retriever", "ACC1": "Poodle"}, index=index)
+    assert index.labels["ACC0"] == "Labrador Retriever"
+    assert index.search(refs["ACC1"], top_n=1)[0][:2] == ("ACC1", "Poodle")
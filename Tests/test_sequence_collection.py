@@ -0,0 +1,72 @@
+from pathlib import Path
+import pytest
+from dogbreed.compare_sequences import compare_sequences
+from dogbreed.sequence_collection import SequenceCollection
+from dogbreed.utils import find_best_match, load_fasta
+
+
+def test_collection_indexing_and_lookup(tmp_fasta: Path):
+    coll = SequenceCollection.from_fasta(tmp_fasta, upper=True)
+    assert len(coll) == 2
+    assert coll[0].id == "id1"
+    assert coll[-1].seq == "ACGTACGTAGCT"
+    assert "id2" in coll and "nope" not in coll
+    assert coll["id2"] == "ACGTACGTAGCT"
+    assert coll.get("nope") is None
+    with pytest.raises(IndexError):
+        coll[2]
+
+
+def test_collection_slices_share_buffer():
+    coll = SequenceCollection.from_records([("a", "AAAA"), ("b", "CC"), ("c", "GGG")])
+    tail = coll[1:]
+    assert [v.id for v in tail] == ["b", "c"]
+    assert tail[1].seq == "GGG"
+    assert tail._buffer is coll._buffer
+    assert list(coll.lengths) == [4, 2, 3]
+
+
+def test_loaders_and_matchers_accept_collection(tmp_path: Path):
+    fa = tmp_path / "dogs.fa"
+    fa.write_text(">A\nACGTACGT\n>B\nTTTTTTTT\n", encoding="utf-8")
+
+    refs = load_fasta(fa)
+    assert isinstance(refs, SequenceCollection)
+    assert find_best_match("ACGTACGT", refs)[0][0] == "A"
+    assert compare_sequences("ACGTACGT", refs)[0] == ("A", 100.0)
+
+
+def test_empty_collection():
+    coll = SequenceCollection.from_records([])
+    assert len(coll) == 0
+    assert list(coll.items()) == []
+
+
+def test_duplicate_ids_are_last_wins_like_a_dict(tmp_path: Path):
+    fa = tmp_path / "dups.fa"
+    fa.write_text(">a\nCCCCCCCC\n>b\nTTTTTTTT\n>a\nACGTACGT\n", encoding="utf-8")
+
+    refs = load_fasta(fa)
+    assert refs.keys() == ["a", "b"]
+    assert list(refs.values()) == ["ACGTACGT", "TTTTTTTT"]
+    assert dict(refs.items()) == {"a": "ACGTACGT", "b": "TTTTTTTT"}
+    assert refs.nbytes == 16
+
+    ranked = find_best_match("ACGTACGT", refs)
+    assert [acc for acc, _ in ranked] == ["a", "b"]
+    assert ranked[0] == ("a", 100.0)
+
+
+def test_main_load_fasta_keeps_seqrecords(tmp_path: Path):
+    from Main.utils import find_best_match as main_best_match, load_fasta as main_load_fasta, load_fasta_collection
+
+    fa = tmp_path / "dogs.fa"
+    fa.write_text(">A Labrador\nacgtacgt\n>B\nTTTTTTTT\n", encoding="utf-8")
+
+    records = main_load_fasta(fa)
+    assert isinstance(records, list) and records[0].description == "A Labrador"
+    assert str(records[0].seq) == "ACGTACGT"
+
+    coll = load_fasta_collection(fa)
+    assert isinstance(coll, SequenceCollection)
+    assert main_best_match("ACGTACGT", coll)[0][0].id == "A"
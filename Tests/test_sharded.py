@@ -0,0 +1,77 @@
+import random
+import socket
+import time
+from pathlib import Path
+import pytest
+from dogbreed.compare_sequences import compare_sequences
+from dogbreed.sharded import ShardServer, ShardedSearch, partition
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(12)
+    return [(f"ref{i}", "".join(rng.choice("ACGT") for _ in range(60))) for i in range(9)]
+
+
+def test_scatter_gather_matches_single_node(panel, tmp_path: Path):
+    query = panel[4][1][:50]
+    shards = partition(panel, 3)
+    addresses = [("127.0.0.1", 0), ("127.0.0.1", 0), str(tmp_path / "shard.sock")]
+    servers = [ShardServer(part, addr, name=f"s{i}").start() for i, (part, addr) in enumerate(zip(shards, addresses))]
+    try:
+        with ShardedSearch([s.address for s in servers], timeout=5) as coordinator:
+            health = coordinator.health()
+            assert all(h["ok"] for h in health.values())
+            assert sorted(h["size"] for h in health.values()) == [3, 3, 3]
+
+            result = coordinator.search(query, top_k=3)
+            assert result["shards"] == 3 and not result["missing"]
+            single = compare_sequences(query, panel)
+            assert [pid for _, pid in result["hits"]] == [pid for _, pid in single[:3]]
+            assert all(dict(single)[rid] == pid for rid, pid in result["hits"])  # exact merge, ties aside
+    finally:
+        for s in servers:
+            s.close()
+
+
+def test_unreachable_shard_policy(panel):
+    with socket.socket() as probe:  # a port nobody listens on
+        probe.bind(("127.0.0.1", 0))
+        dead = probe.getsockname()
+    with ShardServer(panel[:3]) as live:
+        strict = ShardedSearch([live.address, dead], timeout=1, retries=0)
+        assert strict.health()[str(dead)]["ok"] is False
+        with pytest.raises(RuntimeError):
+            strict.search(panel[0][1])
+
+        lenient = ShardedSearch([live.address, dead], timeout=1, retries=0, require_all=False)
+        result = lenient.search(panel[0][1], top_k=2)
+        assert result["shards"] == 1 and str(dead) in result["missing"]
+        assert result["hits"][0] == ("ref0", 100.0)
+        strict.close(); lenient.close()
+
+
+class _SlowShard(ShardServer):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.searches = 0
+
+    def dispatch(self, request):
+        if request.get("op") == "search":
+            self.searches += 1
+            time.sleep(0.5)
+        return super().dispatch(request)
+
+
+def test_timed_out_shard_fails_without_resend(panel):
+    with ShardServer(panel[:3]) as live, _SlowShard(panel[3:]) as slow:
+        coordinator = ShardedSearch([live.address, slow.address], timeout=0.1, retries=2, require_all=False)
+        result = coordinator.search(panel[0][1], top_k=2)
+        assert result["shards"] == 1 and str(slow.address) in result["missing"]
+        time.sleep(0.6)
+        assert slow.searches == 1
+        coordinator.close()
+
+
+def test_close_without_serving_returns():
+    ShardServer([("a", "ACGT")]).close()
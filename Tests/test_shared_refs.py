@@ -0,0 +1,29 @@
+from pathlib import Path
+from multiprocessing import shared_memory
+import pytest
+from dogbreed.compare_sequences import compare_sequences
+from dogbreed.shared_refs import SharedReferenceStore, compare_sequences_parallel
+
+
+def test_shared_store_round_trip_and_cleanup():
+    records = [("A", "acgt"), ("B", "TTGGCC"), ("C", "N")]
+    with SharedReferenceStore(records) as store:
+        names = store.handle[:2]
+        attached = SharedReferenceStore.attach(store.handle)
+        assert attached.ids == ["A", "B", "C"]
+        assert attached.sequence(1) == "TTGGCC"
+        assert bytes(attached.view(0)) == b"ACGT"
+        attached.close()
+
+    # Owner unlinked both segments on exit
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+def test_compare_sequences_parallel_matches_serial(tmp_path: Path):
+    fa = tmp_path / "dogs.fa"
+    fa.write_text(">A\nACGTACGT\n>B\nACGTTTGT\n>C\nTTTTTTTT\n", encoding="utf-8")
+
+    parallel = compare_sequences_parallel("ACGTACGT", str(fa), processes=2, chunk_size=1)
+    assert parallel == compare_sequences("ACGTACGT", str(fa))
@@ -0,0 +1,61 @@
+from pathlib import Path
+import random
+import pytest
+from dogbreed.snp_index import SnpIndex, anchor_seeds, identify_by_snps, project_to_anchor
+
+
+def _mutate(seq: str, positions, base_for) -> str:
+    s = list(seq)
+    for p in positions:
+        s[p] = base_for(s[p])
+    return "".join(s)
+
+
+@pytest.fixture
+def panel():
+    rng = random.Random(3)
+    anchor = "".join(rng.choice("ACGT") for _ in range(300))
+    swap = {"A": "C", "C": "G", "G": "T", "T": "A"}.get
+    return anchor, [
+        ("Labrador", anchor),
+        ("Poodle", _mutate(anchor, [50, 120, 250], swap)),
+        ("Beagle", _mutate(anchor, [80, 200], swap)),
+    ]
+
+
+def test_snp_index_extracts_informative_sites(panel):
+    anchor, records = panel
+    index = SnpIndex.build(records, anchor)
+    assert list(index.sites) == [50, 80, 120, 200, 250]
+    assert index.alleles.shape == (3, 5)
+
+
+def test_snp_index_ranks_query_by_sites(panel, tmp_path: Path):
+    anchor, records = panel
+    index = SnpIndex.load(SnpIndex.build(records, anchor).save(tmp_path / "idx.npz"))
+
+    ranked, coverage = index.score(records[1][1])
+    assert coverage == 1.0
+    assert ranked[0] == ("Poodle", 100.0)
+
+
+def test_identify_by_snps_falls_back_on_poor_coverage(panel):
+    anchor, records = panel
+    index = SnpIndex.build(records, anchor)
+
+    fragment = records[2][1][:100]  # covers only site 50 and 80
+    ranked = identify_by_snps(fragment, index, records, min_coverage=0.8)
+    # Fallback rows come from full alignment against every reference
+    assert {rid for rid, _ in ranked} == {"Labrador", "Poodle", "Beagle"}
+
+
+def test_seeded_projection_matches_full_alignment(panel):
+    anchor, records = panel
+    # Substitutions plus a 3-base deletion and a 2-base insertion, trimmed at the start
+    query = records[1][1][10:140] + records[1][1][143:220] + "GG" + records[1][1][220:]
+    seeded = project_to_anchor(query, anchor, anchor_seeds(anchor))
+    full = project_to_anchor(query, anchor, seeds={})  # no seeds: one global DP
+
+    assert seeded.tolist() == full.tolist()
+    assert seeded[50] == ord("G") and seeded[120] == ord("A")
+    assert (seeded[:10] == ord("-")).all() and (seeded[140:143] == ord("-")).all()
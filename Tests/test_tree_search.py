@@ -0,0 +1,31 @@
+from pathlib import Path
+import random
+import pytest
+from dogbreed.tree_search import TreeSearchIndex
+
+
+@pytest.fixture
+def indexed(tmp_path: Path):
+    rng = random.Random(5)
+    seqs = {name: "".join(rng.choice("ACGT") for _ in range(150)) for name in "ABCDEFGH"}
+    tree = tmp_path / "tree.nwk"
+    tree.write_text("(((A:0.1,B:0.1):0.1,(C:0.1,D:0.1):0.1):0.1,((E:0.1,F:0.1):0.1,(G:0.1,H:0.1):0.1):0.1);")
+    return seqs, TreeSearchIndex(tree, list(seqs.items()), reps_per_clade=2, k=8)
+
+
+def test_tree_search_finds_leaf_with_fewer_alignments(indexed):
+    seqs, index = indexed
+    query = seqs["F"][:70] + "T" + seqs["F"][71:]
+
+    result = index.search(query, beam_width=1)
+    assert result["ranked"][0][0] == "F"
+    assert result["alignments"] == 1
+    assert result["saved"] == 7
+
+
+def test_tree_search_beam_width_bounds_alignments(indexed):
+    seqs, index = indexed
+    result = index.search(seqs["C"], beam_width=3)
+    assert result["ranked"][0] == ("C", 100.0)
+    assert result["alignments"] <= 3
+    assert result["exhaustive"] == 8
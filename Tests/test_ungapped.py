@@ -0,0 +1,32 @@
+import random
+import pytest
+from dogbreed.sequence_collection import SequenceCollection
+from dogbreed.ungapped import UngappedPanel, ungapped_identity
+
+
+def _loop_identity(a: str, b: str, combine) -> float:
+    denom = combine(len(a), len(b))
+    return sum(x == y for x, y in zip(a, b)) / denom if denom else 0.0
+
+
+def test_matches_python_loops_for_both_denominators():
+    rng = random.Random(2)
+    seqs = ["".join(rng.choice("ACGT") for _ in range(rng.randint(0, 40))) for _ in range(25)]
+    query = "".join(rng.choice("ACGT") for _ in range(30))
+    panel = UngappedPanel.from_sequences(seqs)
+
+    for denominator, combine in (("max", max), ("min", min)):
+        got = panel.identities(query, denominator=denominator, block_bytes=4 * 30 * 16)
+        assert got.tolist() == [_loop_identity(query, s, combine) for s in seqs]
+
+
+def test_collection_buffer_and_iupac_partial_matches():
+    refs = SequenceCollection.from_records([("A", "ACGT"), ("B", "ACGN"), ("C", "RCGT")])
+    panel = UngappedPanel.from_collection(refs)
+
+    assert panel.identities("ACGT").tolist() == [1.0, 0.75, 0.75]
+    assert panel.identities("ACGT", iupac=True).tolist() == [1.0, 0.8125, 0.875]
+    assert ungapped_identity("N", "N", iupac=True) == 0.25
+    assert ungapped_identity("", "ACGT") == 0.0
+    with pytest.raises(ValueError):
+        panel.identities("ACGT", denominator="mean")